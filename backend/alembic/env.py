@@ -24,7 +24,12 @@ from app.models import (  # noqa: F401, E402
     problem,
     allergy,
     medical_record,
+    blob,
     document,
+    document_text,
+    document_signature,
+    extraction_job,
+    extraction_cache,
     audit_log,
     emergency_share,
 )
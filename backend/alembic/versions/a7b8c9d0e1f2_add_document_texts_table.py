@@ -0,0 +1,44 @@
+"""add document_texts table
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_texts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("document_id", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=True),
+        sa.Column("page_count", sa.Integer(), nullable=True),
+        sa.Column("text_method", sa.String(length=20), nullable=True),
+        sa.Column("parser_version", sa.String(length=50), nullable=True),
+        sa.Column("detected_format", sa.String(length=50), nullable=True),
+        sa.Column("timings", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_document_texts_id"), "document_texts", ["id"], unique=False)
+    op.create_index(op.f("ix_document_texts_document_id"), "document_texts", ["document_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_document_texts_document_id"), table_name="document_texts")
+    op.drop_index(op.f("ix_document_texts_id"), table_name="document_texts")
+    op.drop_table("document_texts")
@@ -0,0 +1,46 @@
+"""add documents.batch_id and extraction_jobs.owner_id
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("documents", sa.Column("batch_id", sa.String(length=36), nullable=True))
+    op.create_index(op.f("ix_documents_batch_id"), "documents", ["batch_id"], unique=False)
+
+    op.add_column("extraction_jobs", sa.Column("owner_id", sa.Integer(), nullable=True))
+    op.create_index(op.f("ix_extraction_jobs_owner_id"), "extraction_jobs", ["owner_id"], unique=False)
+    op.create_foreign_key(
+        "fk_extraction_jobs_owner_id",
+        "extraction_jobs", "users",
+        ["owner_id"], ["id"],
+        ondelete="SET NULL",
+    )
+    # Existing jobs belong to their document's pet owner
+    op.execute(
+        "UPDATE extraction_jobs SET owner_id = "
+        "(SELECT pets.owner_id FROM documents JOIN pets ON pets.id = documents.pet_id "
+        "WHERE documents.id = extraction_jobs.document_id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_extraction_jobs_owner_id", "extraction_jobs", type_="foreignkey")
+    op.drop_index(op.f("ix_extraction_jobs_owner_id"), table_name="extraction_jobs")
+    op.drop_column("extraction_jobs", "owner_id")
+    op.drop_index(op.f("ix_documents_batch_id"), table_name="documents")
+    op.drop_column("documents", "batch_id")
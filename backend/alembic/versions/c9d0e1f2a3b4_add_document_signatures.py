@@ -0,0 +1,75 @@
+"""add document signatures and documents.duplicate_of_id
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_signatures",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("document_id", sa.Integer(), nullable=False),
+        sa.Column("pet_id", sa.Integer(), nullable=False),
+        sa.Column("signature", sa.JSON(), nullable=False),
+        sa.Column("shingle_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["pet_id"], ["pets.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_document_signatures_id"), "document_signatures", ["id"], unique=False)
+    op.create_index(op.f("ix_document_signatures_document_id"), "document_signatures", ["document_id"], unique=True)
+    op.create_index(op.f("ix_document_signatures_pet_id"), "document_signatures", ["pet_id"], unique=False)
+
+    op.create_table(
+        "document_signature_buckets",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("document_id", sa.Integer(), nullable=False),
+        sa.Column("pet_id", sa.Integer(), nullable=False),
+        sa.Column("bucket", sa.String(length=24), nullable=False),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["pet_id"], ["pets.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_document_signature_buckets_document_id"), "document_signature_buckets", ["document_id"], unique=False
+    )
+    op.create_index(
+        "ix_document_signature_buckets_pet_bucket", "document_signature_buckets", ["pet_id", "bucket"], unique=False
+    )
+
+    op.add_column("documents", sa.Column("duplicate_of_id", sa.Integer(), nullable=True))
+    op.create_index(op.f("ix_documents_duplicate_of_id"), "documents", ["duplicate_of_id"], unique=False)
+    op.create_foreign_key(
+        "fk_documents_duplicate_of_id",
+        "documents", "documents",
+        ["duplicate_of_id"], ["id"],
+        ondelete="SET NULL",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_documents_duplicate_of_id", "documents", type_="foreignkey")
+    op.drop_index(op.f("ix_documents_duplicate_of_id"), table_name="documents")
+    op.drop_column("documents", "duplicate_of_id")
+    op.drop_index("ix_document_signature_buckets_pet_bucket", table_name="document_signature_buckets")
+    op.drop_index(op.f("ix_document_signature_buckets_document_id"), table_name="document_signature_buckets")
+    op.drop_table("document_signature_buckets")
+    op.drop_index(op.f("ix_document_signatures_pet_id"), table_name="document_signatures")
+    op.drop_index(op.f("ix_document_signatures_document_id"), table_name="document_signatures")
+    op.drop_index(op.f("ix_document_signatures_id"), table_name="document_signatures")
+    op.drop_table("document_signatures")
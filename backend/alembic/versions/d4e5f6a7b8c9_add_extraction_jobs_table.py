@@ -0,0 +1,52 @@
+"""add extraction_jobs table
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, None] = "c3d4e5f6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+job_status = sa.Enum("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="jobstatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "extraction_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("document_id", sa.Integer(), nullable=False),
+        sa.Column("status", job_status, nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="3"),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_extraction_jobs_id"), "extraction_jobs", ["id"], unique=False)
+    op.create_index(op.f("ix_extraction_jobs_document_id"), "extraction_jobs", ["document_id"], unique=False)
+    op.create_index(op.f("ix_extraction_jobs_status"), "extraction_jobs", ["status"], unique=False)
+    op.create_index(op.f("ix_extraction_jobs_available_at"), "extraction_jobs", ["available_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_extraction_jobs_available_at"), table_name="extraction_jobs")
+    op.drop_index(op.f("ix_extraction_jobs_status"), table_name="extraction_jobs")
+    op.drop_index(op.f("ix_extraction_jobs_document_id"), table_name="extraction_jobs")
+    op.drop_index(op.f("ix_extraction_jobs_id"), table_name="extraction_jobs")
+    op.drop_table("extraction_jobs")
+    job_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,27 @@
+"""add document_texts.used_llm
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, None] = "d0e1f2a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NULL for existing rows: document_text.used_llm falls back to their timings
+    op.add_column("document_texts", sa.Column("used_llm", sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("document_texts", "used_llm")
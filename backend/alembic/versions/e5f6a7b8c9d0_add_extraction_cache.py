@@ -0,0 +1,46 @@
+"""add extraction_cache table and documents.content_hash
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("documents", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.create_index(op.f("ix_documents_content_hash"), "documents", ["content_hash"], unique=False)
+
+    op.create_table(
+        "extraction_cache",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("parser_version", sa.String(length=50), nullable=False),
+        sa.Column("extracted_data", sa.JSON(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_hit_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("content_hash", "parser_version", name="uq_extraction_cache_hash_version"),
+    )
+    op.create_index(op.f("ix_extraction_cache_id"), "extraction_cache", ["id"], unique=False)
+    op.create_index(op.f("ix_extraction_cache_content_hash"), "extraction_cache", ["content_hash"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_extraction_cache_content_hash"), table_name="extraction_cache")
+    op.drop_index(op.f("ix_extraction_cache_id"), table_name="extraction_cache")
+    op.drop_table("extraction_cache")
+    op.drop_index(op.f("ix_documents_content_hash"), table_name="documents")
+    op.drop_column("documents", "content_hash")
@@ -0,0 +1,47 @@
+"""add blobs table and documents.blob_id
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("media_type", sa.String(length=100), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_blobs_id"), "blobs", ["id"], unique=False)
+    op.create_index(op.f("ix_blobs_sha256"), "blobs", ["sha256"], unique=True)
+
+    op.add_column("documents", sa.Column("blob_id", sa.Integer(), nullable=True))
+    op.create_index(op.f("ix_documents_blob_id"), "documents", ["blob_id"], unique=False)
+    op.create_foreign_key("fk_documents_blob_id", "documents", "blobs", ["blob_id"], ["id"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_documents_blob_id", "documents", type_="foreignkey")
+    op.drop_index(op.f("ix_documents_blob_id"), table_name="documents")
+    op.drop_column("documents", "blob_id")
+    op.drop_index(op.f("ix_blobs_sha256"), table_name="blobs")
+    op.drop_index(op.f("ix_blobs_id"), table_name="blobs")
+    op.drop_table("blobs")
@@ -6,9 +6,81 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    # Authenticated principals cached per token (services/principal_cache); a TTL of 0 disables it
+    principal_cache_ttl_seconds: float = 30.0
+    principal_cache_max_entries: int = 10000
+    # bcrypt thread pool (services/auth_service); past workers + queue_max in flight the API answers 503
+    password_hash_workers: int = 4
+    password_hash_queue_max: int = 64  # 0 = unbounded
+
+    # Per-client rate limits on unauthenticated endpoints (middleware/rate_limit); 0 disables a rule
+    rate_limit_enabled: bool = True
+    rate_limit_login_per_ip: int = 30  # per minute
+    rate_limit_login_per_account: int = 10  # per minute, by email
+    rate_limit_register_per_ip: int = 10  # per hour
+    rate_limit_emergency_per_ip: int = 60  # per minute
+    rate_limit_listings_per_ip: int = 300  # per minute, common medications and clinic references
+    rate_limit_max_keys: int = 100000
     anthropic_api_key: str
     upload_dir: str = "./uploads"
 
+    # Extraction job queue
+    extraction_worker_in_process: bool = True
+    extraction_worker_concurrency: int = 2
+    extraction_job_max_attempts: int = 3
+    extraction_job_lease_seconds: int = 600
+    extraction_job_heartbeat_seconds: int = 60  # lease renewal while a job runs; keep well under the lease
+    extraction_job_retry_base_seconds: int = 30
+    extraction_job_poll_seconds: float = 2.0
+    extraction_job_sweep_seconds: int = 60
+    extraction_max_running_per_user: int = 2  # 0 = no per-user cap
+    document_batch_max_files: int = 50
+
+    # Write-behind audit log (services/audit_service); must_persist entries are always written inline
+    audit_write_behind: bool = True
+    audit_flush_ms: int = 200
+    audit_batch_size: int = 100
+    audit_queue_max: int = 10000
+
+    # Near-duplicate uploads (MinHash over the text layer); see services/near_duplicate
+    near_duplicate_enabled: bool = True
+    near_duplicate_threshold: float = 0.9
+
+    # Blank and repeated PDF pages skipped before parsing and the LLM; see services/page_triage
+    page_triage_enabled: bool = True
+    page_blank_max_ink: float = 0.0005  # fraction of dark pixels a page without text may have
+    page_duplicate_max_distance: int = 20  # dHash bits out of 256
+
+    # PDF parser process pool (0 workers = one per CPU core)
+    parser_pool_enabled: bool = True
+    parser_pool_workers: int = 0
+    parser_pool_max_tasks_per_child: int = 50
+    parser_timeout_seconds: float = 60.0  # hard limit; the worker process is killed
+    parser_budget_seconds: float = 20.0  # soft limit on the regex parse; degrades to the LLM
+
+    # Claude fallback: pages per request chunk, concurrent requests per document
+    llm_chunk_pages: int = 4
+    llm_max_concurrency: int = 4
+
+    # Shared Anthropic client (per process; 0 disables a limit)
+    anthropic_base_url: str | None = None
+    llm_requests_per_minute: int = 50
+    llm_tokens_per_minute: int = 80000
+    llm_max_connections: int = 10
+    llm_max_retries: int = 4
+    llm_retry_base_seconds: float = 2.0
+    llm_timeout_seconds: float = 120.0
+
+    # Image uploads are shrunk before Claude sees them (stored originals are untouched)
+    image_max_long_edge: int = 1568
+    image_jpeg_quality: int = 80
+    image_grayscale: bool = True
+    image_preprocess_workers: int = 2
+
+    # Document status Server-Sent Events
+    sse_keepalive_seconds: float = 15.0
+    sse_db_poll_seconds: float = 5.0
+
     model_config = {"env_file": ".env"}
 
 
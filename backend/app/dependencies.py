@@ -5,7 +5,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.user import User
+from app.services import principal_cache
 from app.services.auth_service import decode_token
+from app.services.principal_cache import Principal
 
 security = HTTPBearer()
 
@@ -13,7 +15,8 @@ security = HTTPBearer()
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
-) -> User:
+) -> Principal:
+    """The token's user, from the principal cache when possible; handlers needing more load the User row."""
     token = credentials.credentials
     try:
         payload = decode_token(token)
@@ -23,13 +26,19 @@ async def get_current_user(
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+    iat = payload.get("iat")
+    principal = principal_cache.get(int(user_id), iat)
+    if principal is not None:
+        return principal
     user = await db.get(User, int(user_id))
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(iat, principal)
+    return principal
 
 
-async def get_consented_user(user: User = Depends(get_current_user)) -> User:
+async def get_consented_user(user: Principal = Depends(get_current_user)) -> Principal:
     if not user.consent_accepted:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -38,7 +47,7 @@ async def get_consented_user(user: User = Depends(get_current_user)) -> User:
     return user
 
 
-async def get_admin_user(user: User = Depends(get_current_user)) -> User:
+async def get_admin_user(user: Principal = Depends(get_current_user)) -> Principal:
     if not user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -10,6 +10,12 @@ from fastapi.staticfiles import StaticFiles
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.config import settings
+from app.middleware.rate_limit import MemoryStore, RateLimitMiddleware, default_rules
+from app.services.audit_service import start_audit_writer, stop_audit_writer
+from app.services.auth_service import PasswordHasherBusy
+from app.services.llm_client import close_llm_client
+from app.services.parser_pool import shutdown_parser_pool
+from app.workers.extraction import start_worker_pool, stop_worker_pool
 import app.models  # noqa: F401 -- ensures all models are registered with SQLAlchemy
 
 logger = logging.getLogger("uvicorn.error")
@@ -60,7 +66,14 @@ from app.routers import (
 async def lifespan(app: FastAPI):
     Path(settings.upload_dir).mkdir(parents=True, exist_ok=True)
     Path(settings.upload_dir, "pet_images").mkdir(parents=True, exist_ok=True)
+    start_audit_writer()
+    if settings.extraction_worker_in_process:
+        await start_worker_pool()
     yield
+    await stop_worker_pool()
+    await stop_audit_writer()
+    shutdown_parser_pool()
+    await close_llm_client()
 
 
 app = FastAPI(
@@ -70,6 +83,11 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+if settings.rate_limit_enabled:
+    # Inside CORS, so 429s carry the CORS headers the frontend needs to read them
+    app.add_middleware(
+        RateLimitMiddleware, rules=default_rules(settings), store=MemoryStore(settings.rate_limit_max_keys)
+    )
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -83,6 +101,16 @@ app.add_middleware(ErrorLoggingMiddleware)
 app.mount("/uploads", StaticFiles(directory=settings.upload_dir), name="uploads")
 
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    # Counted as password_hash.rejected; a log line per rejection would flood during a storm
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many sign-in attempts in progress, try again shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error("Unhandled exception on %s %s:\n%s", request.method, request.url.path, traceback.format_exc())
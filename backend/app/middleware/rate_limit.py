@@ -0,0 +1,257 @@
+"""
+Sliding-window rate limiting for the unauthenticated endpoints.
+
+Login, registration, the public emergency view and the reference listings
+can be hit without an account. Every login attempt costs a bcrypt hash
+and an audit entry, so credential stuffing and scraping are capped before
+they reach the handlers.
+
+Each RateLimitRule matches a method and path and counts requests per
+client IP or, for login, per account (the email in the JSON body). Keys
+are "<rule>:<kind>:<identity>", so each route has its own budget. Counts
+use the sliding-window counter approximation: a key holds this window's
+and the previous window's counts, and the estimate is
+
+    previous * (time left in this window / window) + current
+
+That is O(1) time and memory per check, and within a few percent of an
+exact sliding log. Every matching rule is checked before any is counted,
+so a request rejected by one rule uses up none of the others. It gets 429
+with Retry-After (seconds until it would pass) and is counted as
+rate_limit.<rule>.rejected in app.services.metrics.
+
+A rule with count_statuses only counts requests whose response has one of
+those statuses. The per-account login rule counts failed logins (401), so
+the account's owner logging in doesn't use up its budget. Failed attempts
+against a known email still lock that account out for the window; the
+per-IP rule caps how fast any one client can do that.
+
+Counters live in a RateLimitStore. MemoryStore, the default, is per
+process, so with several API workers each enforces its own limit. A shared
+store (e.g. Redis: INCR on "<key>:<window index>" with an expiry of two
+windows, reading the previous index alongside, in one Lua script for hit)
+implements the same hit() and add() and is passed to the middleware in
+app.main.
+"""
+
+import json
+import math
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import Settings
+from app.services import metrics
+
+# Request bodies read for an account key; larger ones are only limited per IP
+MAX_ACCOUNT_BODY = 16 * 1024
+
+
+@dataclass(frozen=True)
+class Limit:
+    key: str
+    limit: int
+    window_seconds: float
+    count: bool = True  # counted by hit() when every limit passes; False leaves counting to add()
+
+
+class RateLimitStore(ABC):
+    @abstractmethod
+    async def hit(self, limits: list[Limit]) -> list[float]:
+        """
+        Check every limit against its sliding window. Returns, per limit, 0
+        if one more request fits, otherwise the seconds until it would. Only
+        if all of them fit are the ones marked `count` counted.
+        """
+
+    @abstractmethod
+    async def add(self, key: str, window_seconds: float) -> None:
+        """Count one request for `key` without checking its limit."""
+
+
+class MemoryStore(RateLimitStore):
+    """Per-process counters: key -> [window index, current count, previous count, window seconds]."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._counters: dict[str, list] = {}
+
+    async def hit(self, limits: list[Limit]) -> list[float]:
+        now = time.time()
+        counters = [self._counter(limit.key, limit.window_seconds, now) for limit in limits]
+        waits = []
+        for limit, counter in zip(limits, counters):
+            _, current, previous, window = counter
+            elapsed = now - counter[0] * window
+            if previous * (window - elapsed) / window + current + 1 <= limit.limit:
+                waits.append(0.0)
+            else:
+                # Never 0 for a rejection, which would read as allowed
+                waits.append(max(_retry_after(current, previous, limit.limit, window, elapsed), 0.001))
+        if not any(waits):
+            for limit, counter in zip(limits, counters):
+                if limit.count:
+                    counter[1] += 1
+        return waits
+
+    async def add(self, key: str, window_seconds: float) -> None:
+        self._counter(key, window_seconds, time.time())[1] += 1
+
+    def _counter(self, key: str, window_seconds: float, now: float) -> list:
+        index = int(now // window_seconds)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = [index, 0, 0, window_seconds]
+            if len(self._counters) >= self.max_keys:
+                self._evict(now)
+            self._counters[key] = counter
+        elif counter[0] != index:
+            # Roll the window: the old current becomes previous, unless more than one window passed
+            counter[2] = counter[1] if counter[0] == index - 1 else 0
+            counter[0], counter[1] = index, 0
+        return counter
+
+    def _evict(self, now: float) -> None:
+        """Drop keys idle for two of their windows (their estimate is 0), then the oldest, down to 3/4 of max_keys."""
+        stale = [key for key, (index, _, _, window) in self._counters.items() if (index + 2) * window <= now]
+        for key in stale:
+            del self._counters[key]
+        target = self.max_keys * 3 // 4
+        if len(self._counters) > target:
+            for key in list(self._counters)[:len(self._counters) - target]:
+                del self._counters[key]
+
+
+def _retry_after(current: int, previous: int, limit: int, window: float, elapsed: float) -> float:
+    """Seconds until previous * (window - t) / window + current + 1 <= limit."""
+    if current + 1 <= limit and previous:
+        # Within this window, once enough of the previous window has slid out
+        return max(window - window * (limit - 1 - current) / previous - elapsed, 0.0)
+    # Next window, where this window's count becomes the weighted one
+    wait = window - window * (limit - 1) / current if current else 0.0
+    return window - elapsed + max(wait, 0.0)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    name: str
+    method: str
+    path: re.Pattern
+    limit: int
+    window_seconds: float
+    key: str = "ip"  # or "account": the "email" field of a JSON body
+    count_statuses: frozenset[int] | None = None  # count only responses with these statuses; None counts all
+
+    def matches(self, method: str, path: str) -> bool:
+        return method == self.method and self.path.match(path) is not None
+
+
+def default_rules(settings: Settings) -> list[RateLimitRule]:
+    """The rules configured in settings; a limit of 0 leaves that rule out."""
+    public_listings = re.compile(r"^/(common-medications|vet-clinic-refs)(/(?!admin/)[^/]*)?$")
+    rules = [
+        RateLimitRule("login", "POST", re.compile(r"^/auth/login$"), settings.rate_limit_login_per_ip, 60),
+        RateLimitRule("login", "POST", re.compile(r"^/auth/login$"), settings.rate_limit_login_per_account, 60,
+                      key="account", count_statuses=frozenset({401})),
+        RateLimitRule("register", "POST", re.compile(r"^/auth/register$"), settings.rate_limit_register_per_ip, 3600),
+        RateLimitRule("emergency", "GET", re.compile(r"^/emergency/[^/]+$"), settings.rate_limit_emergency_per_ip, 60),
+        RateLimitRule("listings", "GET", public_listings, settings.rate_limit_listings_per_ip, 60),
+    ]
+    return [rule for rule in rules if rule.limit > 0]
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying `rules` with counters in `store` (a MemoryStore if none is given)."""
+
+    def __init__(self, app: ASGIApp, rules: list[RateLimitRule], store: RateLimitStore | None = None):
+        self.app = app
+        self.rules = rules
+        self.store = store or MemoryStore()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rules = [rule for rule in self.rules if rule.matches(scope["method"], scope["path"])]
+        if not rules:
+            await self.app(scope, receive, send)
+            return
+
+        account = None
+        if any(rule.key == "account" for rule in rules):
+            receive, account = await _read_account(receive)
+        client = scope.get("client")
+        identities = {"ip": client[0] if client else "unknown", "account": account}
+
+        keyed = [(rule, f"{rule.name}:{rule.key}:{identities[rule.key]}") for rule in rules
+                 if identities[rule.key] is not None]
+        waits = await self.store.hit([
+            Limit(key, rule.limit, rule.window_seconds, count=rule.count_statuses is None) for rule, key in keyed
+        ])
+        if any(waits):
+            for (rule, _), wait in zip(keyed, waits):
+                if wait:
+                    metrics.incr(f"rate_limit.{rule.name}.rejected")
+            await _too_many_requests(send, max(waits))
+            return
+
+        on_status = [(rule, key) for rule, key in keyed if rule.count_statuses is not None]
+        if not on_status:
+            await self.app(scope, receive, send)
+            return
+        status = None
+
+        async def send_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            for rule, key in on_status:
+                if status in rule.count_statuses:
+                    await self.store.add(key, rule.window_seconds)
+
+
+async def _read_account(receive: Receive) -> tuple[Receive, str | None]:
+    """Buffer the request body for its "email" field; returns a receive that replays it."""
+    messages: list[Message] = []
+    size = 0
+    while True:
+        message = await receive()
+        messages.append(message)
+        size += len(message.get("body", b""))
+        if message["type"] != "http.request" or not message.get("more_body") or size > MAX_ACCOUNT_BODY:
+            break
+
+    async def replay() -> Message:
+        return messages.pop(0) if messages else await receive()
+
+    account = None
+    if size <= MAX_ACCOUNT_BODY:
+        try:
+            email = json.loads(b"".join(m.get("body", b"") for m in messages)).get("email")
+        except (ValueError, AttributeError):
+            email = None
+        if isinstance(email, str) and email.strip():
+            account = email.strip().lower()
+    return replay, account
+
+
+async def _too_many_requests(send: Send, retry_after: float) -> None:
+    body = b'{"detail":"Too many requests"}'
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(math.ceil(retry_after), 1)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
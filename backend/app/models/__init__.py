@@ -6,7 +6,12 @@ from app.models.vaccine import Vaccine
 from app.models.problem import Problem
 from app.models.allergy import Allergy
 from app.models.medical_record import MedicalRecord
+from app.models.blob import Blob
 from app.models.document import Document
+from app.models.document_text import DocumentText
+from app.models.document_signature import DocumentSignature, DocumentSignatureBucket
+from app.models.extraction_job import ExtractionJob
+from app.models.extraction_cache import ExtractionCache
 from app.models.audit_log import AuditLog
 from app.models.emergency_share import EmergencyShare
 from app.models.lab import Lab
@@ -19,6 +24,6 @@ from app.models.activity_note import ActivityNote
 
 __all__ = [
     "User", "Pet", "Medication", "Vaccine", "Problem",
-    "Allergy", "MedicalRecord", "Document", "AuditLog", "EmergencyShare", "Lab",
+    "Allergy", "MedicalRecord", "Blob", "Document", "DocumentText", "DocumentSignature", "DocumentSignatureBucket", "ExtractionJob", "ExtractionCache", "AuditLog", "EmergencyShare", "Lab",
     "Insurance", "CommonMedicationRef", "Appointment", "Vital", "VetProvider", "ActivityNote",
 ]
@@ -1,10 +1,11 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Integer, JSON, String
+from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Integer, JSON, String, event, inspect, update
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.models.blob import Blob
 
 
 class ExtractionStatus(str, enum.Enum):
@@ -21,10 +22,48 @@ class Document(Base):
     pet_id: Mapped[int] = mapped_column(Integer, ForeignKey("pets.id"), nullable=False, index=True)
     filename: Mapped[str] = mapped_column(String(500), nullable=False)
     file_path: Mapped[str] = mapped_column(String(1000), nullable=False)
+    blob_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("blobs.id"), index=True)  # NULL for pre-blob uploads
+    content_hash: Mapped[str | None] = mapped_column(String(64), index=True)  # SHA-256 hex of file bytes
     upload_date: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    batch_id: Mapped[str | None] = mapped_column(String(36), index=True)  # set for POST .../documents/batch uploads
+    # Earlier document of the same pet with (nearly) the same text; see services/near_duplicate
+    duplicate_of_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("documents.id", ondelete="SET NULL"), index=True
+    )
     extracted_data: Mapped[dict | None] = mapped_column(JSON)
     extraction_status: Mapped[ExtractionStatus] = mapped_column(
         SAEnum(ExtractionStatus), default=ExtractionStatus.PENDING
     )
 
     pet: Mapped["Pet"] = relationship("Pet", back_populates="documents")  # noqa: F821
+    blob: Mapped["Blob | None"] = relationship("Blob")
+
+
+# Blob reference counts change in the same flush (and transaction) as the
+# Document rows, including documents deleted through the Pet cascade.
+# Bulk query-level deletes bypass these; blob_gc --recount repairs that.
+
+def _adjust_ref_count(connection, blob_id: int | None, delta: int) -> None:
+    if blob_id is not None:
+        connection.execute(
+            update(Blob).where(Blob.id == blob_id).values(ref_count=Blob.ref_count + delta)
+        )
+
+
+@event.listens_for(Document, "after_insert")
+def _document_inserted(mapper, connection, target: Document) -> None:
+    _adjust_ref_count(connection, target.blob_id, 1)
+
+
+@event.listens_for(Document, "after_delete")
+def _document_deleted(mapper, connection, target: Document) -> None:
+    _adjust_ref_count(connection, target.blob_id, -1)
+
+
+@event.listens_for(Document, "after_update")
+def _document_updated(mapper, connection, target: Document) -> None:
+    history = inspect(target).attrs.blob_id.history
+    if history.has_changes():
+        for old in history.deleted:
+            _adjust_ref_count(connection, old, -1)
+        _adjust_ref_count(connection, target.blob_id, 1)
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class DocumentSignature(Base):
+    """
+    MinHash signature of a document's normalized text, one row per
+    document. Only PDFs with a usable text layer have one.
+    """
+    __tablename__ = "document_signatures"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    document_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), unique=True, nullable=False, index=True
+    )
+    pet_id: Mapped[int] = mapped_column(Integer, ForeignKey("pets.id", ondelete="CASCADE"), nullable=False, index=True)
+    signature: Mapped[list] = mapped_column(JSON, nullable=False)  # NUM_PERM ints
+    shingle_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class DocumentSignatureBucket(Base):
+    """
+    LSH index: one row per (document, band). Documents of the same pet that
+    share a bucket are candidate near-duplicates.
+    """
+    __tablename__ = "document_signature_buckets"
+    __table_args__ = (Index("ix_document_signature_buckets_pet_bucket", "pet_id", "bucket"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    document_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    pet_id: Mapped[int] = mapped_column(Integer, ForeignKey("pets.id", ondelete="CASCADE"), nullable=False)
+    bucket: Mapped[str] = mapped_column(String(24), nullable=False)  # "<band>:<hash of the band's rows>"
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.database import Base
+
+
+class DocumentText(Base):
+    """
+    Text layer and extraction diagnostics for a Document, one row per
+    document. Kept out of the documents table so list queries stay slim.
+    text holds the normalized pages joined by PAGE_BREAK (None for images);
+    timings are seconds per stage (read, text_extraction, parse, llm, total);
+    page_triage lists the pages skipped as blank or duplicate (PageTriage.stats).
+    used_llm is whether Claude contributed to the document's extracted_data,
+    including data copied from a cache hit or reused from a near-duplicate
+    (None for rows written before it was recorded; see document_text.used_llm).
+    """
+    __tablename__ = "document_texts"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    document_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), unique=True, nullable=False, index=True
+    )
+    text: Mapped[str | None] = mapped_column(Text)
+    page_count: Mapped[int | None] = mapped_column(Integer)
+    text_method: Mapped[str | None] = mapped_column(String(20))  # "pypdf" or "pdfplumber"
+    parser_version: Mapped[str | None] = mapped_column(String(50))
+    detected_format: Mapped[str | None] = mapped_column(String(50))
+    timings: Mapped[dict | None] = mapped_column(JSON)
+    page_triage: Mapped[dict | None] = mapped_column(JSON)
+    used_llm: Mapped[bool | None] = mapped_column(Boolean)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    document: Mapped["Document"] = relationship("Document")  # noqa: F821
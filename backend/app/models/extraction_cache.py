@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, JSON, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ExtractionCache(Base):
+    """Extraction results keyed by file content hash, so identical uploads skip re-extraction."""
+    __tablename__ = "extraction_cache"
+    __table_args__ = (UniqueConstraint("content_hash", "parser_version", name="uq_extraction_cache_hash_version"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)  # SHA-256 hex
+    parser_version: Mapped[str] = mapped_column(String(50), nullable=False)
+    extracted_data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_hit_at: Mapped[datetime | None] = mapped_column(DateTime)
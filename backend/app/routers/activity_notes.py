@@ -5,13 +5,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.activity_note import ActivityNote
 from app.models.pet import Pet
-from app.models.user import User
 from app.routers.pets import get_pet_for_owner
 from app.schemas.activity_note import ActivityNoteCreate, ActivityNoteResponse, ActivityNoteUpdate
-from app.services.audit_service import create_audit_log
+from app.services import unit_of_work
 
 router = APIRouter(prefix="/pets/{pet_id}/notes", tags=["activity-notes"])
 
@@ -44,7 +43,7 @@ async def create_note(
     data: ActivityNoteCreate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     note = ActivityNote(
@@ -54,10 +53,7 @@ async def create_note(
         title=data.title,
         body=data.body,
     )
-    db.add(note)
-    await db.commit()
-    await db.refresh(note)
-    await create_audit_log(db, user_id=user.id, action="CREATE_NOTE", resource_type="ActivityNote", resource_id=note.id, ip_address=request.client.host if request.client else None)
+    await unit_of_work.create(db, note, user_id=user.id, action="CREATE_NOTE", ip_address=request.client.host if request.client else None)
     return note
 
 
@@ -68,20 +64,18 @@ async def update_note(
     updates: ActivityNoteUpdate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(ActivityNote).where(ActivityNote.id == note_id, ActivityNote.pet_id == pet_id))
-    note = result.scalar_one_or_none()
+    values = updates.model_dump(exclude_unset=True)
+    if "note_date" in values:
+        values["note_date"] = _to_dt(values["note_date"])
+    note = await unit_of_work.update(
+        db, ActivityNote, values, ActivityNote.id == note_id, ActivityNote.pet_id == pet_id,
+        user_id=user.id, action="UPDATE_NOTE", ip_address=request.client.host if request.client else None,
+    )
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
-    for field, value in updates.model_dump(exclude_unset=True).items():
-        if field == "note_date":
-            value = _to_dt(value)
-        setattr(note, field, value)
-    await db.commit()
-    await db.refresh(note)
-    await create_audit_log(db, user_id=user.id, action="UPDATE_NOTE", resource_type="ActivityNote", resource_id=note.id, ip_address=request.client.host if request.client else None)
     return note
 
 
@@ -91,7 +85,7 @@ async def delete_note(
     note_id: int,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(ActivityNote).where(ActivityNote.id == note_id, ActivityNote.pet_id == pet_id))
@@ -10,15 +10,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.database import get_db
-from app.dependencies import get_admin_user
+from app.dependencies import Principal, get_admin_user
+from app.models.document_text import DocumentText
 from app.models.medication import Medication
 from app.models.pet import Pet
 from app.models.user import User
 from app.schemas.medication import MedicationCreate, MedicationResponse, MedicationUpdate
 from app.schemas.pet import PetCreate, PetResponse, PetUpdate
 from app.schemas.user import AdminUserUpdate, UserCreate, UserResponse
-from app.services.audit_service import create_audit_log
-from app.services.auth_service import hash_password
+from app.services import metrics, principal_cache, unit_of_work
+from app.services.auth_service import hash_password_async
+from app.services.uploads import UnsupportedMediaType, UploadTooLarge, save_upload
 
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5 MB
@@ -40,7 +42,7 @@ def _to_dt(d) -> datetime | None:
 
 @router.get("/users", response_model=list[UserResponse])
 async def list_users(
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(User).order_by(User.id))
@@ -50,7 +52,7 @@ async def list_users(
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     user = await db.get(User, user_id)
@@ -63,7 +65,7 @@ async def get_user(
 async def create_user(
     user_data: UserCreate,
     request: Request,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     existing = await db.execute(select(User).where(User.email == user_data.email))
@@ -72,15 +74,11 @@ async def create_user(
 
     user = User(
         email=user_data.email,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await hash_password_async(user_data.password),
         phone=user_data.phone,
     )
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-    await create_audit_log(
-        db, user_id=admin.id, action="ADMIN_CREATE_USER",
-        resource_type="User", resource_id=user.id,
+    await unit_of_work.create(
+        db, user, user_id=admin.id, action="ADMIN_CREATE_USER",
         ip_address=request.client.host if request.client else None,
     )
     return UserResponse.model_validate(user)
@@ -91,26 +89,21 @@ async def update_user(
     user_id: int,
     updates: AdminUserUpdate,
     request: Request,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    user = await db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
     data = updates.model_dump(exclude_none=True)
     if "password" in data:
-        user.hashed_password = hash_password(data.pop("password"))
-    for field, value in data.items():
-        setattr(user, field, value)
+        data["hashed_password"] = await hash_password_async(data.pop("password"))
 
-    await db.commit()
-    await db.refresh(user)
-    await create_audit_log(
-        db, user_id=admin.id, action="ADMIN_UPDATE_USER",
-        resource_type="User", resource_id=user.id,
+    user = await unit_of_work.update(
+        db, User, data, User.id == user_id,
+        user_id=admin.id, action="ADMIN_UPDATE_USER",
         ip_address=request.client.host if request.client else None,
     )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    principal_cache.invalidate(user_id)
     return UserResponse.model_validate(user)
 
 
@@ -118,7 +111,7 @@ async def update_user(
 async def delete_user(
     user_id: int,
     request: Request,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     if user_id == admin.id:
@@ -126,13 +119,11 @@ async def delete_user(
     user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    await db.delete(user)
-    await db.commit()
-    await create_audit_log(
-        db, user_id=admin.id, action="ADMIN_DELETE_USER",
-        resource_type="User", resource_id=user_id,
+    await unit_of_work.delete(
+        db, user, user_id=admin.id, action="ADMIN_DELETE_USER",
         ip_address=request.client.host if request.client else None,
     )
+    principal_cache.invalidate(user_id)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -141,7 +132,7 @@ async def delete_user(
 
 @router.get("/pets", response_model=list[PetResponse])
 async def list_all_pets(
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Pet).order_by(Pet.id))
@@ -151,7 +142,7 @@ async def list_all_pets(
 @router.get("/pets/{pet_id}", response_model=PetResponse)
 async def get_pet(
     pet_id: int,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     pet = await db.get(Pet, pet_id)
@@ -165,7 +156,7 @@ async def create_pet(
     pet_data: PetCreate,
     owner_id: int,
     request: Request,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     owner = await db.get(User, owner_id)
@@ -184,12 +175,8 @@ async def create_pet(
         insurance=pet_data.insurance,
         weight_log=[],
     )
-    db.add(pet)
-    await db.commit()
-    await db.refresh(pet)
-    await create_audit_log(
-        db, user_id=admin.id, action="ADMIN_CREATE_PET",
-        resource_type="Pet", resource_id=pet.id,
+    await unit_of_work.create(
+        db, pet, user_id=admin.id, action="ADMIN_CREATE_PET",
         ip_address=request.client.host if request.client else None,
     )
     return PetResponse.model_validate(pet)
@@ -200,24 +187,19 @@ async def update_pet(
     pet_id: int,
     updates: PetUpdate,
     request: Request,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    pet = await db.get(Pet, pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
-
-    for field, value in updates.model_dump(exclude_none=True).items():
-        if field == "dob" and value is not None:
-            value = datetime.combine(value, datetime.min.time())
-        setattr(pet, field, value)
-    await db.commit()
-    await db.refresh(pet)
-    await create_audit_log(
-        db, user_id=admin.id, action="ADMIN_UPDATE_PET",
-        resource_type="Pet", resource_id=pet.id,
+    values = updates.model_dump(exclude_none=True)
+    if "dob" in values:
+        values["dob"] = datetime.combine(values["dob"], datetime.min.time())
+    pet = await unit_of_work.update(
+        db, Pet, values, Pet.id == pet_id,
+        user_id=admin.id, action="ADMIN_UPDATE_PET",
         ip_address=request.client.host if request.client else None,
     )
+    if not pet:
+        raise HTTPException(status_code=404, detail="Pet not found")
     return PetResponse.model_validate(pet)
 
 
@@ -225,17 +207,14 @@ async def update_pet(
 async def delete_pet(
     pet_id: int,
     request: Request,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     pet = await db.get(Pet, pet_id)
     if not pet:
         raise HTTPException(status_code=404, detail="Pet not found")
-    await db.delete(pet)
-    await db.commit()
-    await create_audit_log(
-        db, user_id=admin.id, action="ADMIN_DELETE_PET",
-        resource_type="Pet", resource_id=pet_id,
+    await unit_of_work.delete(
+        db, pet, user_id=admin.id, action="ADMIN_DELETE_PET",
         ip_address=request.client.host if request.client else None,
     )
 
@@ -245,7 +224,7 @@ async def admin_upload_pet_image(
     pet_id: int,
     request: Request,
     file: UploadFile = File(...),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     pet = await db.get(Pet, pet_id)
@@ -253,28 +232,23 @@ async def admin_upload_pet_image(
         raise HTTPException(status_code=404, detail="Pet not found")
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(status_code=400, detail="Invalid image type. Allowed: JPEG, PNG, WebP, GIF")
-    content = await file.read()
-    if len(content) > MAX_IMAGE_SIZE:
+    try:
+        saved = await save_upload(
+            file, Path(settings.upload_dir) / "pet_images", uuid.uuid4().hex, MAX_IMAGE_SIZE, ALLOWED_IMAGE_TYPES
+        )
+    except UploadTooLarge:
         raise HTTPException(status_code=400, detail="Image too large. Max 5 MB")
-
-    image_dir = Path(settings.upload_dir) / "pet_images"
-    image_dir.mkdir(parents=True, exist_ok=True)
+    except UnsupportedMediaType:
+        raise HTTPException(status_code=400, detail="Invalid image type. Allowed: JPEG, PNG, WebP, GIF")
 
     if pet.image_url:
         old_path = Path(settings.upload_dir) / pet.image_url.lstrip("/uploads/")
         if old_path.exists():
             old_path.unlink()
 
-    ext = file.filename.rsplit(".", 1)[-1] if file.filename and "." in file.filename else "jpg"
-    filename = f"{uuid.uuid4().hex}.{ext}"
-    (image_dir / filename).write_bytes(content)
-
-    pet.image_url = f"/uploads/pet_images/{filename}"
-    await db.commit()
-    await db.refresh(pet)
-    await create_audit_log(
-        db, user_id=admin.id, action="ADMIN_UPLOAD_PET_IMAGE",
-        resource_type="Pet", resource_id=pet.id,
+    pet = await unit_of_work.update(
+        db, Pet, {"image_url": f"/uploads/pet_images/{saved.path.name}"}, Pet.id == pet_id,
+        user_id=admin.id, action="ADMIN_UPLOAD_PET_IMAGE",
         ip_address=request.client.host if request.client else None,
     )
     return PetResponse.model_validate(pet)
@@ -284,7 +258,7 @@ async def admin_upload_pet_image(
 async def admin_delete_pet_image(
     pet_id: int,
     request: Request,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     pet = await db.get(Pet, pet_id)
@@ -296,7 +270,6 @@ async def admin_delete_pet_image(
             old_path.unlink()
     pet.image_url = None
     await db.commit()
-    await db.refresh(pet)
     return PetResponse.model_validate(pet)
 
 
@@ -306,7 +279,7 @@ async def admin_delete_pet_image(
 
 @router.get("/medications", response_model=list[MedicationResponse])
 async def list_all_medications(
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Medication).order_by(Medication.id))
@@ -316,7 +289,7 @@ async def list_all_medications(
 @router.get("/medications/{med_id}", response_model=MedicationResponse)
 async def get_medication(
     med_id: int,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     med = await db.get(Medication, med_id)
@@ -330,7 +303,7 @@ async def create_medication(
     med_data: MedicationCreate,
     pet_id: int,
     request: Request,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     pet = await db.get(Pet, pet_id)
@@ -351,12 +324,8 @@ async def create_medication(
         document_id=med_data.document_id,
         refill_reminder_date=_to_dt(med_data.refill_reminder_date),
     )
-    db.add(med)
-    await db.commit()
-    await db.refresh(med)
-    await create_audit_log(
-        db, user_id=admin.id, action="ADMIN_CREATE_MEDICATION",
-        resource_type="Medication", resource_id=med.id,
+    await unit_of_work.create(
+        db, med, user_id=admin.id, action="ADMIN_CREATE_MEDICATION",
         ip_address=request.client.host if request.client else None,
     )
     return MedicationResponse.model_validate(med)
@@ -367,24 +336,20 @@ async def update_medication(
     med_id: int,
     updates: MedicationUpdate,
     request: Request,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    med = await db.get(Medication, med_id)
-    if not med:
-        raise HTTPException(status_code=404, detail="Medication not found")
-
-    for field, value in updates.model_dump(exclude_none=True).items():
-        if field in ("start_date", "stop_date", "refill_reminder_date"):
-            value = _to_dt(value)
-        setattr(med, field, value)
-    await db.commit()
-    await db.refresh(med)
-    await create_audit_log(
-        db, user_id=admin.id, action="ADMIN_UPDATE_MEDICATION",
-        resource_type="Medication", resource_id=med.id,
+    values = updates.model_dump(exclude_none=True)
+    for field in ("start_date", "stop_date", "refill_reminder_date"):
+        if field in values:
+            values[field] = _to_dt(values[field])
+    med = await unit_of_work.update(
+        db, Medication, values, Medication.id == med_id,
+        user_id=admin.id, action="ADMIN_UPDATE_MEDICATION",
         ip_address=request.client.host if request.client else None,
     )
+    if not med:
+        raise HTTPException(status_code=404, detail="Medication not found")
     return MedicationResponse.model_validate(med)
 
 
@@ -392,17 +357,14 @@ async def update_medication(
 async def delete_medication(
     med_id: int,
     request: Request,
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     med = await db.get(Medication, med_id)
     if not med:
         raise HTTPException(status_code=404, detail="Medication not found")
-    await db.delete(med)
-    await db.commit()
-    await create_audit_log(
-        db, user_id=admin.id, action="ADMIN_DELETE_MEDICATION",
-        resource_type="Medication", resource_id=med_id,
+    await unit_of_work.delete(
+        db, med, user_id=admin.id, action="ADMIN_DELETE_MEDICATION",
         ip_address=request.client.host if request.client else None,
     )
 
@@ -413,10 +375,56 @@ async def delete_medication(
 
 @router.get("/stats")
 async def admin_stats(
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     users_count = (await db.execute(select(func.count(User.id)))).scalar() or 0
     pets_count = (await db.execute(select(func.count(Pet.id)))).scalar() or 0
     meds_count = (await db.execute(select(func.count(Medication.id)))).scalar() or 0
     return {"users": users_count, "pets": pets_count, "medications": meds_count}
+
+
+@router.get("/metrics")
+async def admin_metrics(admin: Principal = Depends(get_admin_user)):
+    """In-process counters for this API worker (reset on restart)."""
+    return {
+        "counters": metrics.snapshot(),
+        "extraction_cache_hit_rate": metrics.ratio("extraction_cache.hits", "extraction_cache.misses"),
+        "principal_cache_hit_rate": metrics.ratio("principal_cache.hits", "principal_cache.misses"),
+    }
+
+
+@router.get("/extraction-timings")
+async def admin_extraction_timings(
+    limit: int = 500,
+    admin: Principal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Per-stage extraction time (seconds) over the most recent documents, overall and per clinic format."""
+    rows = (await db.execute(
+        select(DocumentText.detected_format, DocumentText.timings)
+        .where(DocumentText.timings.is_not(None))
+        .order_by(DocumentText.updated_at.desc())
+        .limit(min(limit, 5000))
+    )).all()
+
+    def summarize(samples: list[dict]) -> dict:
+        summary = {"documents": len(samples)}
+        for stage in ("read", "text_extraction", "near_duplicate", "triage", "parse", "llm", "total"):
+            values = sorted(t[stage] for t in samples if isinstance(t.get(stage), (int, float)))
+            if values:
+                summary[stage] = {
+                    "count": len(values),
+                    "mean": round(sum(values) / len(values), 4),
+                    "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                }
+        return summary
+
+    by_format: dict[str, list[dict]] = {}
+    for fmt, timings in rows:
+        by_format.setdefault(fmt or "none", []).append(timings)
+    return {
+        "overall": summarize([timings for _, timings in rows]),
+        "cached": sum(1 for _, timings in rows if timings.get("cached")),
+        "by_format": {fmt: summarize(samples) for fmt, samples in sorted(by_format.items())},
+    }
@@ -5,13 +5,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.allergy import Allergy, AllergyType
 from app.models.pet import Pet
-from app.models.user import User
 from app.routers.pets import get_pet_for_owner
 from app.schemas.allergy import AllergyCreate, AllergyResponse, AllergyUpdate
-from app.services.audit_service import create_audit_log
+from app.services import unit_of_work
 
 router = APIRouter(prefix="/pets/{pet_id}/allergies", tags=["allergies"])
 
@@ -44,7 +43,7 @@ async def create_allergy(
     data: AllergyCreate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     allergy = Allergy(
@@ -57,10 +56,7 @@ async def create_allergy(
         vet_verified=data.vet_verified,
         document_id=data.document_id,
     )
-    db.add(allergy)
-    await db.commit()
-    await db.refresh(allergy)
-    await create_audit_log(db, user_id=user.id, action="CREATE_ALLERGY", resource_type="Allergy", resource_id=allergy.id, ip_address=request.client.host if request.client else None)
+    await unit_of_work.create(db, allergy, user_id=user.id, action="CREATE_ALLERGY", ip_address=request.client.host if request.client else None)
     return AllergyResponse.model_validate(allergy)
 
 
@@ -71,20 +67,18 @@ async def update_allergy(
     updates: AllergyUpdate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Allergy).where(Allergy.id == allergy_id, Allergy.pet_id == pet_id))
-    allergy = result.scalar_one_or_none()
+    values = updates.model_dump(exclude_none=True)
+    if "date_noticed" in values:
+        values["date_noticed"] = _to_dt(values["date_noticed"])
+    allergy = await unit_of_work.update(
+        db, Allergy, values, Allergy.id == allergy_id, Allergy.pet_id == pet_id,
+        user_id=user.id, action="UPDATE_ALLERGY", ip_address=request.client.host if request.client else None,
+    )
     if allergy is None:
         raise HTTPException(status_code=404, detail="Allergy not found")
-    for field, value in updates.model_dump(exclude_none=True).items():
-        if field == "date_noticed":
-            value = _to_dt(value)
-        setattr(allergy, field, value)
-    await db.commit()
-    await db.refresh(allergy)
-    await create_audit_log(db, user_id=user.id, action="UPDATE_ALLERGY", resource_type="Allergy", resource_id=allergy.id, ip_address=request.client.host if request.client else None)
     return AllergyResponse.model_validate(allergy)
 
 
@@ -94,13 +88,11 @@ async def delete_allergy(
     allergy_id: int,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Allergy).where(Allergy.id == allergy_id, Allergy.pet_id == pet_id))
     allergy = result.scalar_one_or_none()
     if allergy is None:
         raise HTTPException(status_code=404, detail="Allergy not found")
-    await db.delete(allergy)
-    await db.commit()
-    await create_audit_log(db, user_id=user.id, action="DELETE_ALLERGY", resource_type="Allergy", resource_id=allergy_id, ip_address=request.client.host if request.client else None)
+    await unit_of_work.delete(db, allergy, user_id=user.id, action="DELETE_ALLERGY", ip_address=request.client.host if request.client else None)
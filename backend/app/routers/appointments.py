@@ -5,14 +5,13 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.appointment import Appointment
 from app.models.pet import Pet
-from app.models.user import User
 from app.models.vet_provider import VetProvider
 from app.routers.pets import get_pet_for_owner
 from app.schemas.appointment import AppointmentCreate, AppointmentResponse, AppointmentUpdate
-from app.services.audit_service import create_audit_log
+from app.services import unit_of_work
 
 router = APIRouter(prefix="/pets/{pet_id}/appointments", tags=["appointments"])
 
@@ -58,7 +57,7 @@ async def create_appointment(
     data: AppointmentCreate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     provider = await _resolve_vet_provider(db, data.vet_provider_id, user.id)
@@ -76,10 +75,7 @@ async def create_appointment(
         notes=data.notes,
         status=data.status,
     )
-    db.add(appt)
-    await db.commit()
-    await db.refresh(appt)
-    await create_audit_log(db, user_id=user.id, action="CREATE_APPOINTMENT", resource_type="Appointment", resource_id=appt.id, ip_address=request.client.host if request.client else None)
+    await unit_of_work.create(db, appt, user_id=user.id, action="CREATE_APPOINTMENT", ip_address=request.client.host if request.client else None)
     return appt
 
 
@@ -90,33 +86,26 @@ async def update_appointment(
     updates: AppointmentUpdate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Appointment).where(Appointment.id == appt_id, Appointment.pet_id == pet_id))
-    appt = result.scalar_one_or_none()
-    if not appt:
-        raise HTTPException(status_code=404, detail="Appointment not found")
-
     update_data = updates.model_dump(exclude_unset=True)
 
     # If vet_provider_id is being changed, resolve provider and auto-fill clinic/vet
     if "vet_provider_id" in update_data:
         provider = await _resolve_vet_provider(db, update_data["vet_provider_id"], user.id)
-        appt.vet_provider_id = update_data.pop("vet_provider_id")
         if provider:
-            if "clinic" not in update_data:
-                appt.clinic = provider.clinic_name
-            if "veterinarian" not in update_data:
-                appt.veterinarian = provider.veterinarian_name
-
-    for field, value in update_data.items():
-        if field == "appointment_date":
-            value = _to_dt(value)
-        setattr(appt, field, value)
-    await db.commit()
-    await db.refresh(appt)
-    await create_audit_log(db, user_id=user.id, action="UPDATE_APPOINTMENT", resource_type="Appointment", resource_id=appt.id, ip_address=request.client.host if request.client else None)
+            update_data.setdefault("clinic", provider.clinic_name)
+            update_data.setdefault("veterinarian", provider.veterinarian_name)
+
+    if "appointment_date" in update_data:
+        update_data["appointment_date"] = _to_dt(update_data["appointment_date"])
+    appt = await unit_of_work.update(
+        db, Appointment, update_data, Appointment.id == appt_id, Appointment.pet_id == pet_id,
+        user_id=user.id, action="UPDATE_APPOINTMENT", ip_address=request.client.host if request.client else None,
+    )
+    if not appt:
+        raise HTTPException(status_code=404, detail="Appointment not found")
     return appt
 
 
@@ -126,7 +115,7 @@ async def delete_appointment(
     appt_id: int,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Appointment).where(Appointment.id == appt_id, Appointment.pet_id == pet_id))
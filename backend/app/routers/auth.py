@@ -5,15 +5,24 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import Principal, get_current_user
 from app.models.user import User
 from app.schemas.user import LoginRequest, TokenResponse, UserCreate, UserResponse
-from app.services.audit_service import create_audit_log, create_audit_log_independent
-from app.services.auth_service import create_access_token, hash_password, verify_password
+from app.services import principal_cache
+from app.services.audit_service import add_audit_log, create_audit_log, create_audit_log_independent
+from app.services.auth_service import create_access_token, hash_password_async, verify_password_async
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+async def _load_user(db: AsyncSession, principal: Principal) -> User:
+    """The full row behind a (possibly cached) principal."""
+    user = await db.get(User, principal.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return user
+
+
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
@@ -26,7 +35,7 @@ async def register(
 
     user = User(
         email=user_data.email,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await hash_password_async(user_data.password),
         phone=user_data.phone,
         first_name=user_data.first_name,
         last_name=user_data.last_name,
@@ -65,7 +74,7 @@ async def login(
     result = await db.execute(select(User).where(User.email == login_data.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
         await create_audit_log_independent(
             user_id=None,
             action="LOGIN_FAILED",
@@ -89,18 +98,18 @@ async def login(
 @router.post("/consent", response_model=UserResponse)
 async def accept_consent(
     request: Request,
-    user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
+    user = await _load_user(db, principal)
     if user.consent_accepted:
+        # Perhaps accepted through another process; this one's cached principals may predate it
+        principal_cache.invalidate(user.id)
         return UserResponse.model_validate(user)
 
     user.consent_accepted = True
     user.consent_date = datetime.utcnow()
-    await db.commit()
-    await db.refresh(user)
-
-    await create_audit_log(
+    add_audit_log(
         db,
         user_id=user.id,
         action="CONSENT_ACCEPTED",
@@ -108,9 +117,11 @@ async def accept_consent(
         resource_id=user.id,
         ip_address=request.client.host if request.client else None,
     )
+    await db.commit()
+    principal_cache.invalidate(user.id)
     return UserResponse.model_validate(user)
 
 
 @router.get("/me", response_model=UserResponse)
-async def me(user: User = Depends(get_current_user)):
-    return UserResponse.model_validate(user)
+async def me(principal: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    return UserResponse.model_validate(await _load_user(db, principal))
@@ -3,9 +3,8 @@ from sqlalchemy import cast, select, func, String
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_admin_user
+from app.dependencies import Principal, get_admin_user
 from app.models.common_medication_ref import CommonMedicationRef
-from app.models.user import User
 from app.schemas.common_medication import (
     CommonMedicationCreate,
     CommonMedicationOut,
@@ -84,7 +83,7 @@ async def get_drug_classes(db: AsyncSession = Depends(get_db)):
 @router.get("/admin/all", response_model=list[CommonMedicationOut])
 async def admin_list_all(
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     """Admin: list ALL common medications (including inactive)."""
     result = await db.execute(
@@ -97,7 +96,7 @@ async def admin_list_all(
 async def create_common_medication(
     payload: CommonMedicationCreate,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     """Admin: create a new common medication entry."""
     # Normalise species to lowercase
@@ -114,7 +113,7 @@ async def update_common_medication(
     med_id: int,
     payload: CommonMedicationUpdate,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     """Admin: update a common medication entry."""
     result = await db.execute(
@@ -140,7 +139,7 @@ async def update_common_medication(
 async def delete_common_medication(
     med_id: int,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     """Admin: permanently delete a common medication entry."""
     result = await db.execute(
@@ -7,11 +7,10 @@ from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.appointment import Appointment
 from app.models.medication import Medication
 from app.models.pet import Pet
-from app.models.user import User
 from app.models.vaccine import Vaccine
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
@@ -19,7 +18,7 @@ router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @router.get("/summary")
 async def dashboard_summary(
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     now = datetime.utcnow()
@@ -4,10 +4,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.medication import Medication
 from app.models.pet import Pet
-from app.models.user import User
 from app.routers.pets import get_pet_for_owner
 from app.services.audit_service import create_audit_log
 from app.services.ddi_service import check_drug_interactions
@@ -37,7 +36,7 @@ async def check_interactions(
     body: DDIRequest,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     if body.drug_names:
@@ -72,7 +71,7 @@ async def check_interactions(
 @router.post("/medications/check-interactions-all-pets", response_model=DDIResponse)
 async def check_interactions_all_pets(
     request: Request,
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Check drug interactions across ALL of a user's pets' active medications."""
@@ -1,25 +1,37 @@
+import asyncio
+import json
 import uuid
-from pathlib import Path
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.database import get_db
-from app.dependencies import get_consented_user
+from app.database import AsyncSessionLocal, get_db
+from app.dependencies import Principal, get_consented_user
 from app.models.document import Document, ExtractionStatus
 from app.models.pet import Pet
-from app.models.user import User
 from app.routers.pets import get_pet_for_owner
-from app.schemas.document import DocumentResponse
-from app.services.audit_service import create_audit_log
-from app.services.extraction_service import run_extraction
+from app.schemas.document import (
+    DocumentBatchProgress,
+    DocumentBatchResponse,
+    DocumentResponse,
+    RejectedUpload,
+)
+from app.services import document_events, metrics
+from app.services.audit_service import add_audit_log, create_audit_log
+from app.services.job_queue import enqueue_extraction
+from app.services.blob_store import blob_path, store_upload
+from app.services.uploads import UnsupportedMediaType, UploadTooLarge
+from app.workers.extraction import notify_workers
 
 router = APIRouter(tags=["documents"])
 
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 ALLOWED_TYPES = {"application/pdf", "image/jpeg", "image/png"}
+ACTIVE_STATUSES = (ExtractionStatus.PENDING, ExtractionStatus.PROCESSING)
+TERMINAL_STATUSES = (ExtractionStatus.COMPLETED, ExtractionStatus.FAILED)
 
 
 @router.post(
@@ -29,38 +41,39 @@ ALLOWED_TYPES = {"application/pdf", "image/jpeg", "image/png"}
 )
 async def upload_document(
     pet_id: int,
-    background_tasks: BackgroundTasks,
     request: Request,
     file: UploadFile = File(...),
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     if file.content_type not in ALLOWED_TYPES:
         raise HTTPException(status_code=400, detail="Only PDF, JPG, PNG accepted")
 
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
+    # Stream into the content-addressed store; identical files share one blob
+    try:
+        blob = await store_upload(db, file, MAX_FILE_SIZE, ALLOWED_TYPES)
+    except UploadTooLarge:
         raise HTTPException(status_code=413, detail="File too large. Maximum 10 MB.")
-
-    # Save with UUID prefix to avoid filename conflicts
-    safe_name = f"{uuid.uuid4()}_{file.filename}"
-    file_dir = Path(settings.upload_dir) / str(pet_id)
-    file_dir.mkdir(parents=True, exist_ok=True)
-    file_path = file_dir / safe_name
-    file_path.write_bytes(content)
+    except UnsupportedMediaType:
+        raise HTTPException(status_code=400, detail="Only PDF, JPG, PNG accepted")
 
     doc = Document(
         pet_id=pet_id,
         filename=file.filename,
-        file_path=str(file_path),
+        file_path=str(blob_path(blob.sha256, blob.media_type)),
+        content_hash=blob.sha256,
+        blob_id=blob.id,
         extraction_status=ExtractionStatus.PENDING,
     )
     db.add(doc)
+    await db.flush()
+    # Job row commits with the document, so a crash can't lose the extraction
+    enqueue_extraction(db, doc.id, user.id)
     await db.commit()
     await db.refresh(doc)
-
-    background_tasks.add_task(run_extraction, doc.id)
+    notify_workers()
+    document_events.publish(pet_id, doc.id, ExtractionStatus.PENDING)
 
     await create_audit_log(
         db,
@@ -73,6 +86,204 @@ async def upload_document(
     return DocumentResponse.model_validate(doc)
 
 
+@router.post(
+    "/pets/{pet_id}/documents/batch",
+    response_model=DocumentBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_document_batch(
+    pet_id: int,
+    request: Request,
+    files: list[UploadFile] = File(...),
+    pet: Pet = Depends(get_pet_for_owner),
+    user: Principal = Depends(get_consented_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Upload many documents in one request. Each file is streamed into the
+    blob store; files that are too large or not PDF/JPG/PNG are reported in
+    `rejected` rather than failing the batch. All accepted documents and
+    their extraction jobs are committed together with one audit entry.
+    """
+    if len(files) > settings.document_batch_max_files:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Maximum {settings.document_batch_max_files} per batch.",
+        )
+
+    batch_id = str(uuid.uuid4())
+    docs: list[Document] = []
+    rejected: list[RejectedUpload] = []
+    for file in files:
+        if file.content_type not in ALLOWED_TYPES:
+            rejected.append(RejectedUpload(filename=file.filename, detail="Only PDF, JPG, PNG accepted"))
+            continue
+        try:
+            blob = await store_upload(db, file, MAX_FILE_SIZE, ALLOWED_TYPES)
+        except UploadTooLarge:
+            rejected.append(RejectedUpload(filename=file.filename, detail="File too large. Maximum 10 MB."))
+            continue
+        except UnsupportedMediaType:
+            rejected.append(RejectedUpload(filename=file.filename, detail="Only PDF, JPG, PNG accepted"))
+            continue
+        docs.append(
+            Document(
+                pet_id=pet_id,
+                filename=file.filename,
+                file_path=str(blob_path(blob.sha256, blob.media_type)),
+                content_hash=blob.sha256,
+                blob_id=blob.id,
+                batch_id=batch_id,
+                extraction_status=ExtractionStatus.PENDING,
+            )
+        )
+
+    if not docs:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "No files accepted", "rejected": [r.model_dump() for r in rejected]},
+        )
+
+    db.add_all(docs)
+    await db.flush()
+    for doc in docs:
+        enqueue_extraction(db, doc.id, user.id)
+    add_audit_log(
+        db,
+        user_id=user.id,
+        action="UPLOAD_DOCUMENT_BATCH",
+        resource_type="Pet",
+        resource_id=pet_id,
+        ip_address=request.client.host if request.client else None,
+    )
+    await db.commit()
+    metrics.incr("document_batches")
+    metrics.incr("document_batch_files", len(docs))
+
+    notify_workers()
+    for doc in docs:
+        document_events.publish(pet_id, doc.id, ExtractionStatus.PENDING)
+    return DocumentBatchResponse(
+        batch_id=batch_id,
+        documents=[DocumentResponse.model_validate(doc) for doc in docs],
+        rejected=rejected,
+    )
+
+
+@router.get("/pets/{pet_id}/documents/batch/{batch_id}", response_model=DocumentBatchProgress)
+async def get_document_batch(
+    pet_id: int,
+    batch_id: str,
+    pet: Pet = Depends(get_pet_for_owner),
+    db: AsyncSession = Depends(get_db),
+):
+    """Aggregate extraction progress for a batch upload."""
+    result = await db.execute(
+        select(Document.id, Document.filename, Document.extraction_status)
+        .where(Document.pet_id == pet_id, Document.batch_id == batch_id)
+        .order_by(Document.id)
+    )
+    rows = result.all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    counts = {s: 0 for s in ExtractionStatus}
+    for row in rows:
+        counts[row.extraction_status] += 1
+    return DocumentBatchProgress(
+        batch_id=batch_id,
+        total=len(rows),
+        pending=counts[ExtractionStatus.PENDING],
+        processing=counts[ExtractionStatus.PROCESSING],
+        completed=counts[ExtractionStatus.COMPLETED],
+        failed=counts[ExtractionStatus.FAILED],
+        done=not (counts[ExtractionStatus.PENDING] or counts[ExtractionStatus.PROCESSING]),
+        documents=[
+            {"id": row.id, "filename": row.filename, "extraction_status": row.extraction_status} for row in rows
+        ],
+    )
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _document_statuses(pet_id: int, ids: list[int] | None = None) -> dict[int, ExtractionStatus]:
+    query = select(Document.id, Document.extraction_status).where(Document.pet_id == pet_id)
+    if ids is not None:
+        query = query.where(Document.id.in_(ids))
+    async with AsyncSessionLocal() as db:
+        return {doc_id: doc_status for doc_id, doc_status in (await db.execute(query)).all()}
+
+
+async def _document_result(doc_id: int) -> dict | None:
+    async with AsyncSessionLocal() as db:
+        doc = await db.get(Document, doc_id)
+        return DocumentResponse.model_validate(doc).model_dump(mode="json") if doc else None
+
+
+async def _document_event_stream(pet_id: int):
+    """
+    snapshot (every document's status, from the DB) on connect, then
+    status events (document_id, status, stage) as they are published, and
+    a result event with the full document once it completes or fails.
+    In-flight documents are re-checked in the DB every sse_db_poll_seconds
+    to pick up extraction done by standalone workers.
+    """
+    loop = asyncio.get_running_loop()
+    metrics.incr("sse_connections")
+    async with document_events.subscribe(pet_id) as queue:
+        # Subscribe before reading the snapshot so nothing in between is missed
+        statuses = await _document_statuses(pet_id)
+        yield _sse("snapshot", [{"document_id": i, "status": s.value} for i, s in statuses.items()])
+        last_sent = next_poll = loop.time()
+        next_poll += settings.sse_db_poll_seconds
+
+        while True:
+            now = loop.time()
+            timeout = max(0.0, min(last_sent + settings.sse_keepalive_seconds, next_poll) - now)
+            events = []
+            try:
+                events.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                pass
+
+            if loop.time() >= next_poll:
+                next_poll = loop.time() + settings.sse_db_poll_seconds
+                active = [i for i, s in statuses.items() if s in ACTIVE_STATUSES]
+                if active:
+                    for doc_id, doc_status in (await _document_statuses(pet_id, active)).items():
+                        if doc_status != statuses[doc_id]:
+                            events.append({"document_id": doc_id, "status": doc_status.value, "stage": doc_status.value})
+
+            for event in events:
+                doc_status = ExtractionStatus(event["status"])
+                statuses[event["document_id"]] = doc_status
+                yield _sse("status", event)
+                if doc_status in TERMINAL_STATUSES:
+                    result = await _document_result(event["document_id"])
+                    if result is not None:
+                        yield _sse("result", result)
+                last_sent = loop.time()
+
+            if loop.time() - last_sent >= settings.sse_keepalive_seconds:
+                yield ": keepalive\n\n"
+                last_sent = loop.time()
+
+
+@router.get("/pets/{pet_id}/documents/events")
+async def document_events_stream(
+    pet_id: int,
+    pet: Pet = Depends(get_pet_for_owner),
+):
+    """Server-Sent Events for this pet's document extraction progress; replaces polling."""
+    return StreamingResponse(
+        _document_event_stream(pet_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/pets/{pet_id}/documents", response_model=list[DocumentResponse])
 async def list_documents(
     pet_id: int,
@@ -86,7 +297,7 @@ async def list_documents(
 @router.get("/documents/{doc_id}", response_model=DocumentResponse)
 async def get_document(
     doc_id: int,
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     doc = await db.get(Document, doc_id)
@@ -7,13 +7,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.allergy import Allergy
 from app.models.emergency_share import EmergencyShare
 from app.models.medication import Medication
 from app.models.pet import Pet
 from app.models.problem import Problem
-from app.models.user import User
 from app.routers.pets import get_pet_for_owner
 from app.services.audit_service import create_audit_log, create_audit_log_independent
 from app.services.qr_service import generate_qr_code
@@ -54,7 +53,7 @@ async def create_share_link(
     body: ShareRequest,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     if body.expires_hours < 1 or body.expires_hours > 168:
@@ -84,6 +83,7 @@ async def create_share_link(
         resource_type="EmergencyShare",
         resource_id=share.id,
         ip_address=request.client.host if request.client else None,
+        must_persist=True,
     )
 
     return ShareResponse(
@@ -125,7 +125,7 @@ async def revoke_share(
     share_id: int,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(
@@ -136,7 +136,7 @@ async def revoke_share(
         raise HTTPException(status_code=404, detail="Share not found")
     share.is_active = False
     await db.commit()
-    await create_audit_log(db, user_id=user.id, action="REVOKE_EMERGENCY_SHARE", resource_type="EmergencyShare", resource_id=share_id, ip_address=request.client.host if request.client else None)
+    await create_audit_log(db, user_id=user.id, action="REVOKE_EMERGENCY_SHARE", resource_type="EmergencyShare", resource_id=share_id, ip_address=request.client.host if request.client else None, must_persist=True)
     return {"revoked": True}
 
 
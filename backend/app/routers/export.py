@@ -9,14 +9,13 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.allergy import Allergy
 from app.models.appointment import Appointment
 from app.models.lab import Lab
 from app.models.medication import Medication
 from app.models.pet import Pet
 from app.models.problem import Problem
-from app.models.user import User
 from app.models.vaccine import Vaccine
 from app.models.vital import Vital
 from app.routers.pets import get_pet_for_owner
@@ -36,7 +35,7 @@ def _fmt(dt) -> str:
 async def export_pet_pdf(
     pet_id: int,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Gather all data
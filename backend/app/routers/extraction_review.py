@@ -1,16 +1,16 @@
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.allergy import Allergy, AllergyType
 from app.models.document import Document
 from app.models.medication import Medication
 from app.models.pet import Pet
 from app.models.problem import Problem
-from app.models.user import User
 from app.models.vaccine import Vaccine
 from app.models.vital import Vital
 from app.routers.pets import get_pet_for_owner
@@ -19,8 +19,8 @@ from app.schemas.extraction_review import (
     ExtractionReviewSubmit,
     FieldDecision,
 )
-from app.services.allergy_service import check_medication_against_allergies
-from app.services.audit_service import create_audit_log
+from app.services.allergy_service import load_drug_allergies, match_drug_allergies
+from app.services.audit_service import add_audit_log
 
 router = APIRouter(tags=["extraction-review"])
 
@@ -33,6 +33,10 @@ def _to_dt(d) -> datetime | None:
     return datetime.combine(d, datetime.min.time())
 
 
+def _approved(items: list) -> list:
+    return [item for item in items if item.decision != FieldDecision.REJECTED]
+
+
 @router.post(
     "/pets/{pet_id}/documents/{doc_id}/confirm",
     response_model=ConfirmResponse,
@@ -44,7 +48,7 @@ async def confirm_extraction(
     review: ExtractionReviewSubmit,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Verify document belongs to this pet
@@ -52,106 +56,97 @@ async def confirm_extraction(
     if doc is None or doc.pet_id != pet_id:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    allergy_warnings: list[dict] = []
-    meds_saved = vax_saved = allergy_saved = prob_saved = 0
-
-    # Save approved/edited medications
-    for item in review.medications:
-        if item.decision == FieldDecision.REJECTED:
-            continue
-        med = Medication(
-            pet_id=pet_id,
-            drug_name=item.drug_name,
-            strength=item.strength,
-            directions=item.directions,
-            indication=item.indication,
-            start_date=_to_dt(item.start_date),
-            stop_date=_to_dt(item.stop_date),
-            prescriber=item.prescriber,
-            pharmacy=item.pharmacy,
-            is_active=True,
-            document_id=doc_id,
-        )
-        db.add(med)
-        await db.flush()
-        meds_saved += 1
-        # Check allergy
-        matches = await check_medication_against_allergies(db, pet_id, item.drug_name)
-        for m in matches:
-            allergy_warnings.append({
-                "drug_name": item.drug_name,
-                "allergy_substance": m.substance_name,
-                "severity": m.severity,
-            })
-
-    # Save approved/edited vaccines
-    for item in review.vaccines:
-        if item.decision == FieldDecision.REJECTED:
-            continue
-        vaccine = Vaccine(
-            pet_id=pet_id,
-            name=item.name,
-            date_given=_to_dt(item.date_given),
-            clinic=item.clinic,
-            lot_number=item.lot_number,
-            next_due_date=_to_dt(item.next_due_date),
-            document_id=doc_id,
-        )
-        db.add(vaccine)
-        vax_saved += 1
-
-    # Save approved/edited allergies
-    for item in review.allergies:
-        if item.decision == FieldDecision.REJECTED:
-            continue
+    # Build every row in memory, then one multi-row INSERT per table
+    medications = [
+        {
+            "pet_id": pet_id,
+            "drug_name": item.drug_name,
+            "strength": item.strength,
+            "directions": item.directions,
+            "indication": item.indication,
+            "start_date": _to_dt(item.start_date),
+            "stop_date": _to_dt(item.stop_date),
+            "prescriber": item.prescriber,
+            "pharmacy": item.pharmacy,
+            "is_active": True,
+            "document_id": doc_id,
+        }
+        for item in _approved(review.medications)
+    ]
+    vaccines = [
+        {
+            "pet_id": pet_id,
+            "name": item.name,
+            "date_given": _to_dt(item.date_given),
+            "clinic": item.clinic,
+            "lot_number": item.lot_number,
+            "next_due_date": _to_dt(item.next_due_date),
+            "document_id": doc_id,
+        }
+        for item in _approved(review.vaccines)
+    ]
+    allergies = []
+    for item in _approved(review.allergies):
         try:
             allergy_type = AllergyType(item.allergy_type)
         except ValueError:
             allergy_type = AllergyType.DRUG
-        allergy = Allergy(
-            pet_id=pet_id,
-            allergy_type=allergy_type,
-            substance_name=item.substance_name,
-            reaction_desc=item.reaction_desc,
-            severity=item.severity,
-            document_id=doc_id,
-        )
-        db.add(allergy)
-        allergy_saved += 1
-
-    # Save approved/edited problems
-    for item in review.problems:
-        if item.decision == FieldDecision.REJECTED:
-            continue
-        problem = Problem(
-            pet_id=pet_id,
-            condition_name=item.condition_name,
-            onset_date=_to_dt(item.onset_date),
-            is_active=item.is_active,
-            notes=item.notes,
-        )
-        db.add(problem)
-        prob_saved += 1
+        allergies.append({
+            "pet_id": pet_id,
+            "allergy_type": allergy_type,
+            "substance_name": item.substance_name,
+            "reaction_desc": item.reaction_desc,
+            "severity": item.severity,
+            "document_id": doc_id,
+        })
+    problems = [
+        {
+            "pet_id": pet_id,
+            "condition_name": item.condition_name,
+            "onset_date": _to_dt(item.onset_date),
+            "is_active": item.is_active,
+            "notes": item.notes,
+        }
+        for item in _approved(review.problems)
+    ]
+    vitals = [
+        {
+            "pet_id": pet_id,
+            "recorded_date": _to_dt(item.recorded_date) or datetime.utcnow(),
+            "weight_kg": item.weight_kg,
+            "weight_lbs": item.weight_lbs,
+            "temperature_f": item.temperature_f,
+            "heart_rate_bpm": item.heart_rate_bpm,
+            "respiratory_rate": item.respiratory_rate,
+            "notes": item.notes,
+        }
+        for item in _approved(review.vitals)
+    ]
 
-    # Save approved/edited vitals
-    for item in review.vitals:
-        if item.decision == FieldDecision.REJECTED:
-            continue
-        vital = Vital(
-            pet_id=pet_id,
-            recorded_date=_to_dt(item.recorded_date) or datetime.utcnow(),
-            weight_kg=item.weight_kg,
-            weight_lbs=item.weight_lbs,
-            temperature_f=item.temperature_f,
-            heart_rate_bpm=item.heart_rate_bpm,
-            respiratory_rate=item.respiratory_rate,
-            notes=item.notes,
-        )
-        db.add(vital)
-        vitals_saved += 1
+    # One query for the pet's drug allergies; drug allergies confirmed in this
+    # same review count too, whatever order the sections were submitted in
+    allergy_warnings: list[dict] = []
+    if medications:
+        known = await load_drug_allergies(db, pet_id)
+        known += [Allergy(**row) for row in allergies if row["allergy_type"] == AllergyType.DRUG]
+        for med in medications:
+            for m in match_drug_allergies(known, med["drug_name"]):
+                allergy_warnings.append({
+                    "drug_name": med["drug_name"],
+                    "allergy_substance": m.substance_name,
+                    "severity": m.severity,
+                })
 
-    await db.commit()
-    await create_audit_log(
+    for model, rows in (
+        (Medication, medications),
+        (Vaccine, vaccines),
+        (Allergy, allergies),
+        (Problem, problems),
+        (Vital, vitals),
+    ):
+        if rows:
+            await db.execute(insert(model), rows)
+    add_audit_log(
         db,
         user_id=user.id,
         action="CONFIRM_EXTRACTION",
@@ -159,12 +154,13 @@ async def confirm_extraction(
         resource_id=doc_id,
         ip_address=request.client.host if request.client else None,
     )
+    await db.commit()
 
     return ConfirmResponse(
-        medications_saved=meds_saved,
-        vaccines_saved=vax_saved,
-        allergies_saved=allergy_saved,
-        problems_saved=prob_saved,
-        vitals_saved=vitals_saved,
+        medications_saved=len(medications),
+        vaccines_saved=len(vaccines),
+        allergies_saved=len(allergies),
+        problems_saved=len(problems),
+        vitals_saved=len(vitals),
         allergy_warnings=allergy_warnings,
     )
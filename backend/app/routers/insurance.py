@@ -5,10 +5,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.insurance import Insurance
 from app.models.pet import Pet
-from app.models.user import User
 from app.routers.pets import get_pet_for_owner
 from app.schemas.insurance import (
     COVERAGE_TYPE_LABELS,
@@ -53,7 +52,7 @@ async def upsert_insurance(
     data: InsuranceCreate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Create or update the insurance record for a pet."""
@@ -97,6 +96,13 @@ async def upsert_insurance(
     await db.commit()
     await db.refresh(record)
 
-    await create_audit_log(db, user.id, action, request.client.host if request.client else "unknown")
+    await create_audit_log(
+        db,
+        user_id=user.id,
+        action=action,
+        resource_type="Insurance",
+        resource_id=record.id,
+        ip_address=request.client.host if request.client else None,
+    )
 
     return record
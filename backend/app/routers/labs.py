@@ -5,10 +5,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.lab import Lab
 from app.models.pet import Pet
-from app.models.user import User
 from app.routers.pets import get_pet_for_owner
 from app.schemas.lab import (
     LAB_TEMPLATES,
@@ -17,7 +16,7 @@ from app.schemas.lab import (
     LabTemplatesResponse,
     LabUpdate,
 )
-from app.services.audit_service import create_audit_log
+from app.services import unit_of_work
 
 router = APIRouter(prefix="/pets/{pet_id}/labs", tags=["labs"])
 
@@ -56,7 +55,7 @@ async def create_lab(
     data: LabCreate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     lab = Lab(
@@ -69,12 +68,8 @@ async def create_lab(
         notes=data.notes,
         document_id=data.document_id,
     )
-    db.add(lab)
-    await db.commit()
-    await db.refresh(lab)
-    await create_audit_log(
-        db, user_id=user.id, action="CREATE_LAB",
-        resource_type="Lab", resource_id=lab.id,
+    await unit_of_work.create(
+        db, lab, user_id=user.id, action="CREATE_LAB",
         ip_address=request.client.host if request.client else None,
     )
     return LabResponse.model_validate(lab)
@@ -101,29 +96,21 @@ async def update_lab(
     updates: LabUpdate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Lab).where(Lab.id == lab_id, Lab.pet_id == pet_id))
-    lab = result.scalar_one_or_none()
-    if lab is None:
-        raise HTTPException(status_code=404, detail="Lab not found")
-
     data = updates.model_dump(exclude_none=True)
     if "lab_type" in data:
         data["lab_type"] = data["lab_type"].value if hasattr(data["lab_type"], "value") else data["lab_type"]
     if "lab_date" in data:
         data["lab_date"] = _to_dt(data["lab_date"])
-    for field, value in data.items():
-        setattr(lab, field, value)
-
-    await db.commit()
-    await db.refresh(lab)
-    await create_audit_log(
-        db, user_id=user.id, action="UPDATE_LAB",
-        resource_type="Lab", resource_id=lab.id,
+    lab = await unit_of_work.update(
+        db, Lab, data, Lab.id == lab_id, Lab.pet_id == pet_id,
+        user_id=user.id, action="UPDATE_LAB",
         ip_address=request.client.host if request.client else None,
     )
+    if lab is None:
+        raise HTTPException(status_code=404, detail="Lab not found")
     return LabResponse.model_validate(lab)
 
 
@@ -133,17 +120,14 @@ async def delete_lab(
     lab_id: int,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Lab).where(Lab.id == lab_id, Lab.pet_id == pet_id))
     lab = result.scalar_one_or_none()
     if lab is None:
         raise HTTPException(status_code=404, detail="Lab not found")
-    await db.delete(lab)
-    await db.commit()
-    await create_audit_log(
-        db, user_id=user.id, action="DELETE_LAB",
-        resource_type="Lab", resource_id=lab_id,
+    await unit_of_work.delete(
+        db, lab, user_id=user.id, action="DELETE_LAB",
         ip_address=request.client.host if request.client else None,
     )
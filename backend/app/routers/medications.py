@@ -5,10 +5,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.medication import Medication
 from app.models.pet import Pet
-from app.models.user import User
 from app.routers.pets import get_pet_for_owner
 from app.schemas.medication import (
     AllergyBrief,
@@ -19,8 +18,8 @@ from app.schemas.medication import (
     MedicationResponse,
     MedicationUpdate,
 )
+from app.services import unit_of_work
 from app.services.allergy_service import check_medication_against_allergies
-from app.services.audit_service import create_audit_log
 
 router = APIRouter(prefix="/pets/{pet_id}/medications", tags=["medications"])
 
@@ -66,7 +65,7 @@ async def create_medication(
     med_data: MedicationCreate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     allergy_matches = await check_medication_against_allergies(db, pet_id, med_data.drug_name)
@@ -85,15 +84,8 @@ async def create_medication(
         document_id=med_data.document_id,
         refill_reminder_date=_to_dt(med_data.refill_reminder_date),
     )
-    db.add(med)
-    await db.commit()
-    await db.refresh(med)
-    await create_audit_log(
-        db,
-        user_id=user.id,
-        action="CREATE_MEDICATION",
-        resource_type="Medication",
-        resource_id=med.id,
+    await unit_of_work.create(
+        db, med, user_id=user.id, action="CREATE_MEDICATION",
         ip_address=request.client.host if request.client else None,
     )
     return MedicationCreateResponse(
@@ -125,30 +117,20 @@ async def update_medication(
     updates: MedicationUpdate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Medication).where(Medication.id == med_id, Medication.pet_id == pet_id)
+    values = updates.model_dump(exclude_none=True)
+    for field in ("start_date", "stop_date", "refill_reminder_date"):
+        if field in values:
+            values[field] = _to_dt(values[field])
+    med = await unit_of_work.update(
+        db, Medication, values, Medication.id == med_id, Medication.pet_id == pet_id,
+        user_id=user.id, action="UPDATE_MEDICATION",
+        ip_address=request.client.host if request.client else None,
     )
-    med = result.scalar_one_or_none()
     if med is None:
         raise HTTPException(status_code=404, detail="Medication not found")
-
-    for field, value in updates.model_dump(exclude_none=True).items():
-        if field in ("start_date", "stop_date", "refill_reminder_date"):
-            value = _to_dt(value)
-        setattr(med, field, value)
-    await db.commit()
-    await db.refresh(med)
-    await create_audit_log(
-        db,
-        user_id=user.id,
-        action="UPDATE_MEDICATION",
-        resource_type="Medication",
-        resource_id=med.id,
-        ip_address=request.client.host if request.client else None,
-    )
     return MedicationResponse.model_validate(med)
 
 
@@ -158,7 +140,7 @@ async def delete_medication(
     med_id: int,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(
@@ -167,13 +149,7 @@ async def delete_medication(
     med = result.scalar_one_or_none()
     if med is None:
         raise HTTPException(status_code=404, detail="Medication not found")
-    await db.delete(med)
-    await db.commit()
-    await create_audit_log(
-        db,
-        user_id=user.id,
-        action="DELETE_MEDICATION",
-        resource_type="Medication",
-        resource_id=med_id,
+    await unit_of_work.delete(
+        db, med, user_id=user.id, action="DELETE_MEDICATION",
         ip_address=request.client.host if request.client else None,
     )
@@ -8,11 +8,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.pet import Pet
-from app.models.user import User
 from app.schemas.pet import PetCreate, PetResponse, PetUpdate, WeightLogAdd
-from app.services.audit_service import create_audit_log
+from app.services import unit_of_work
+from app.services.uploads import UnsupportedMediaType, UploadTooLarge, save_upload
 
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5 MB
@@ -22,7 +22,7 @@ router = APIRouter(prefix="/pets", tags=["pets"])
 
 async def get_pet_for_owner(
     pet_id: int,
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ) -> Pet:
     result = await db.execute(
@@ -36,7 +36,7 @@ async def get_pet_for_owner(
 
 @router.get("", response_model=list[PetResponse])
 async def list_pets(
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Pet).where(Pet.owner_id == user.id))
@@ -47,7 +47,7 @@ async def list_pets(
 async def create_pet(
     pet_data: PetCreate,
     request: Request,
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     dob_dt = datetime.combine(pet_data.dob, datetime.min.time()) if pet_data.dob else None
@@ -62,15 +62,8 @@ async def create_pet(
         insurance=pet_data.insurance,
         weight_log=[],
     )
-    db.add(pet)
-    await db.commit()
-    await db.refresh(pet)
-    await create_audit_log(
-        db,
-        user_id=user.id,
-        action="CREATE_PET",
-        resource_type="Pet",
-        resource_id=pet.id,
+    await unit_of_work.create(
+        db, pet, user_id=user.id, action="CREATE_PET",
         ip_address=request.client.host if request.client else None,
     )
     return PetResponse.model_validate(pet)
@@ -86,21 +79,15 @@ async def update_pet(
     updates: PetUpdate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
-    for field, value in updates.model_dump(exclude_none=True).items():
-        if field == "dob" and value is not None:
-            value = datetime.combine(value, datetime.min.time())
-        setattr(pet, field, value)
-    await db.commit()
-    await db.refresh(pet)
-    await create_audit_log(
-        db,
-        user_id=user.id,
-        action="UPDATE_PET",
-        resource_type="Pet",
-        resource_id=pet.id,
+    values = updates.model_dump(exclude_none=True)
+    if "dob" in values:
+        values["dob"] = datetime.combine(values["dob"], datetime.min.time())
+    pet = await unit_of_work.update(
+        db, Pet, values, Pet.id == pet.id,
+        user_id=user.id, action="UPDATE_PET",
         ip_address=request.client.host if request.client else None,
     )
     return PetResponse.model_validate(pet)
@@ -110,18 +97,11 @@ async def update_pet(
 async def delete_pet(
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
-    pet_id = pet.id
-    await db.delete(pet)
-    await db.commit()
-    await create_audit_log(
-        db,
-        user_id=user.id,
-        action="DELETE_PET",
-        resource_type="Pet",
-        resource_id=pet_id,
+    await unit_of_work.delete(
+        db, pet, user_id=user.id, action="DELETE_PET",
         ip_address=request.client.host if request.client else None,
     )
 
@@ -131,7 +111,7 @@ async def add_weight_entry(
     weight: WeightLogAdd,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     from sqlalchemy import update as sa_update
@@ -151,7 +131,7 @@ async def upload_pet_image(
     request: Request,
     file: UploadFile = File(...),
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     if file.content_type not in ALLOWED_IMAGE_TYPES:
@@ -159,16 +139,21 @@ async def upload_pet_image(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid image type. Allowed: JPEG, PNG, WebP, GIF",
         )
-    content = await file.read()
-    if len(content) > MAX_IMAGE_SIZE:
+    # Save the new image before removing the old one, so a rejected upload keeps it
+    try:
+        saved = await save_upload(
+            file, Path(settings.upload_dir) / "pet_images", uuid.uuid4().hex, MAX_IMAGE_SIZE, ALLOWED_IMAGE_TYPES
+        )
+    except UploadTooLarge:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Image too large. Max 5 MB",
         )
-
-    # Create pet_images directory
-    image_dir = Path(settings.upload_dir) / "pet_images"
-    image_dir.mkdir(parents=True, exist_ok=True)
+    except UnsupportedMediaType:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid image type. Allowed: JPEG, PNG, WebP, GIF",
+        )
 
     # Delete old image if exists
     if pet.image_url:
@@ -176,22 +161,9 @@ async def upload_pet_image(
         if old_path.exists():
             old_path.unlink()
 
-    # Save new image with unique name
-    ext = file.filename.rsplit(".", 1)[-1] if file.filename and "." in file.filename else "jpg"
-    filename = f"{uuid.uuid4().hex}.{ext}"
-    filepath = image_dir / filename
-    filepath.write_bytes(content)
-
-    pet.image_url = f"/uploads/pet_images/{filename}"
-    await db.commit()
-    await db.refresh(pet)
-
-    await create_audit_log(
-        db,
-        user_id=user.id,
-        action="UPLOAD_PET_IMAGE",
-        resource_type="Pet",
-        resource_id=pet.id,
+    pet = await unit_of_work.update(
+        db, Pet, {"image_url": f"/uploads/pet_images/{saved.path.name}"}, Pet.id == pet.id,
+        user_id=user.id, action="UPLOAD_PET_IMAGE",
         ip_address=request.client.host if request.client else None,
     )
     return PetResponse.model_validate(pet)
@@ -201,7 +173,7 @@ async def upload_pet_image(
 async def delete_pet_image(
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     if pet.image_url:
@@ -210,5 +182,4 @@ async def delete_pet_image(
             old_path.unlink()
     pet.image_url = None
     await db.commit()
-    await db.refresh(pet)
     return PetResponse.model_validate(pet)
@@ -5,13 +5,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.pet import Pet
 from app.models.problem import Problem
-from app.models.user import User
 from app.routers.pets import get_pet_for_owner
 from app.schemas.problem import ProblemCreate, ProblemResponse, ProblemUpdate
-from app.services.audit_service import create_audit_log
+from app.services import unit_of_work
 
 router = APIRouter(prefix="/pets/{pet_id}/problems", tags=["problems"])
 
@@ -44,7 +43,7 @@ async def create_problem(
     data: ProblemCreate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     problem = Problem(
@@ -54,10 +53,7 @@ async def create_problem(
         onset_date=_to_dt(data.onset_date),
         notes=data.notes,
     )
-    db.add(problem)
-    await db.commit()
-    await db.refresh(problem)
-    await create_audit_log(db, user_id=user.id, action="CREATE_PROBLEM", resource_type="Problem", resource_id=problem.id, ip_address=request.client.host if request.client else None)
+    await unit_of_work.create(db, problem, user_id=user.id, action="CREATE_PROBLEM", ip_address=request.client.host if request.client else None)
     return ProblemResponse.model_validate(problem)
 
 
@@ -68,20 +64,18 @@ async def update_problem(
     updates: ProblemUpdate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Problem).where(Problem.id == problem_id, Problem.pet_id == pet_id))
-    problem = result.scalar_one_or_none()
+    values = updates.model_dump(exclude_none=True)
+    if "onset_date" in values:
+        values["onset_date"] = _to_dt(values["onset_date"])
+    problem = await unit_of_work.update(
+        db, Problem, values, Problem.id == problem_id, Problem.pet_id == pet_id,
+        user_id=user.id, action="UPDATE_PROBLEM", ip_address=request.client.host if request.client else None,
+    )
     if problem is None:
         raise HTTPException(status_code=404, detail="Problem not found")
-    for field, value in updates.model_dump(exclude_none=True).items():
-        if field == "onset_date":
-            value = _to_dt(value)
-        setattr(problem, field, value)
-    await db.commit()
-    await db.refresh(problem)
-    await create_audit_log(db, user_id=user.id, action="UPDATE_PROBLEM", resource_type="Problem", resource_id=problem.id, ip_address=request.client.host if request.client else None)
     return ProblemResponse.model_validate(problem)
 
 
@@ -91,13 +85,11 @@ async def delete_problem(
     problem_id: int,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Problem).where(Problem.id == problem_id, Problem.pet_id == pet_id))
     problem = result.scalar_one_or_none()
     if problem is None:
         raise HTTPException(status_code=404, detail="Problem not found")
-    await db.delete(problem)
-    await db.commit()
-    await create_audit_log(db, user_id=user.id, action="DELETE_PROBLEM", resource_type="Problem", resource_id=problem_id, ip_address=request.client.host if request.client else None)
+    await unit_of_work.delete(db, problem, user_id=user.id, action="DELETE_PROBLEM", ip_address=request.client.host if request.client else None)
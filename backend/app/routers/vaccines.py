@@ -5,13 +5,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.pet import Pet
-from app.models.user import User
 from app.models.vaccine import Vaccine
 from app.routers.pets import get_pet_for_owner
 from app.schemas.vaccine import VaccineCreate, VaccineResponse, VaccineUpdate
-from app.services.audit_service import create_audit_log
+from app.services import unit_of_work
 
 router = APIRouter(prefix="/pets/{pet_id}/vaccines", tags=["vaccines"])
 
@@ -40,7 +39,7 @@ async def create_vaccine(
     data: VaccineCreate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     vaccine = Vaccine(
@@ -52,10 +51,7 @@ async def create_vaccine(
         next_due_date=_to_dt(data.next_due_date),
         document_id=data.document_id,
     )
-    db.add(vaccine)
-    await db.commit()
-    await db.refresh(vaccine)
-    await create_audit_log(db, user_id=user.id, action="CREATE_VACCINE", resource_type="Vaccine", resource_id=vaccine.id, ip_address=request.client.host if request.client else None)
+    await unit_of_work.create(db, vaccine, user_id=user.id, action="CREATE_VACCINE", ip_address=request.client.host if request.client else None)
     return VaccineResponse.model_validate(vaccine)
 
 
@@ -66,20 +62,19 @@ async def update_vaccine(
     updates: VaccineUpdate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Vaccine).where(Vaccine.id == vaccine_id, Vaccine.pet_id == pet_id))
-    vaccine = result.scalar_one_or_none()
+    values = updates.model_dump(exclude_none=True)
+    for field in ("date_given", "next_due_date"):
+        if field in values:
+            values[field] = _to_dt(values[field])
+    vaccine = await unit_of_work.update(
+        db, Vaccine, values, Vaccine.id == vaccine_id, Vaccine.pet_id == pet_id,
+        user_id=user.id, action="UPDATE_VACCINE", ip_address=request.client.host if request.client else None,
+    )
     if vaccine is None:
         raise HTTPException(status_code=404, detail="Vaccine not found")
-    for field, value in updates.model_dump(exclude_none=True).items():
-        if field in ("date_given", "next_due_date"):
-            value = _to_dt(value)
-        setattr(vaccine, field, value)
-    await db.commit()
-    await db.refresh(vaccine)
-    await create_audit_log(db, user_id=user.id, action="UPDATE_VACCINE", resource_type="Vaccine", resource_id=vaccine.id, ip_address=request.client.host if request.client else None)
     return VaccineResponse.model_validate(vaccine)
 
 
@@ -89,13 +84,11 @@ async def delete_vaccine(
     vaccine_id: int,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Vaccine).where(Vaccine.id == vaccine_id, Vaccine.pet_id == pet_id))
     vaccine = result.scalar_one_or_none()
     if vaccine is None:
         raise HTTPException(status_code=404, detail="Vaccine not found")
-    await db.delete(vaccine)
-    await db.commit()
-    await create_audit_log(db, user_id=user.id, action="DELETE_VACCINE", resource_type="Vaccine", resource_id=vaccine_id, ip_address=request.client.host if request.client else None)
+    await unit_of_work.delete(db, vaccine, user_id=user.id, action="DELETE_VACCINE", ip_address=request.client.host if request.client else None)
@@ -3,9 +3,8 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_admin_user
+from app.dependencies import Principal, get_admin_user
 from app.models.vet_clinic_ref import VetClinicRef
-from app.models.user import User
 from app.schemas.vet_clinic_ref import VetClinicRefCreate, VetClinicRefOut, VetClinicRefUpdate
 
 router = APIRouter(prefix="/vet-clinic-refs", tags=["vet-clinic-refs"])
@@ -99,7 +98,7 @@ async def get_specialties(db: AsyncSession = Depends(get_db)):
 @router.get("/admin/all", response_model=list[VetClinicRefOut])
 async def admin_list_all(
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     """Admin: list ALL vet clinic refs (including inactive)."""
     result = await db.execute(
@@ -112,7 +111,7 @@ async def admin_list_all(
 async def create_vet_clinic_ref(
     payload: VetClinicRefCreate,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     """Admin: create a new vet clinic reference entry."""
     clinic = VetClinicRef(**payload.model_dump())
@@ -127,7 +126,7 @@ async def update_vet_clinic_ref(
     clinic_id: int,
     payload: VetClinicRefUpdate,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     """Admin: update a vet clinic reference entry."""
     result = await db.execute(
@@ -149,7 +148,7 @@ async def update_vet_clinic_ref(
 async def delete_vet_clinic_ref(
     clinic_id: int,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: Principal = Depends(get_admin_user),
 ):
     """Admin: permanently delete a vet clinic reference entry."""
     result = await db.execute(
@@ -5,13 +5,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_consented_user
+from app.dependencies import Principal, get_consented_user
 from app.models.pet import Pet
-from app.models.user import User
 from app.models.vital import Vital
 from app.routers.pets import get_pet_for_owner
 from app.schemas.vital import VitalCreate, VitalResponse, VitalUpdate
-from app.services.audit_service import create_audit_log
+from app.services import unit_of_work
 
 router = APIRouter(prefix="/pets/{pet_id}/vitals", tags=["vitals"])
 
@@ -44,7 +43,7 @@ async def create_vital(
     data: VitalCreate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Auto-convert between kg and lbs
@@ -65,10 +64,7 @@ async def create_vital(
         respiratory_rate=data.respiratory_rate,
         notes=data.notes,
     )
-    db.add(vital)
-    await db.commit()
-    await db.refresh(vital)
-    await create_audit_log(db, user_id=user.id, action="CREATE_VITAL", resource_type="Vital", resource_id=vital.id, ip_address=request.client.host if request.client else None)
+    await unit_of_work.create(db, vital, user_id=user.id, action="CREATE_VITAL", ip_address=request.client.host if request.client else None)
     return vital
 
 
@@ -79,13 +75,9 @@ async def update_vital(
     updates: VitalUpdate,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Vital).where(Vital.id == vital_id, Vital.pet_id == pet_id))
-    vital = result.scalar_one_or_none()
-    if not vital:
-        raise HTTPException(status_code=404, detail="Vital record not found")
     update_data = updates.model_dump(exclude_unset=True)
     if "recorded_date" in update_data:
         update_data["recorded_date"] = _to_dt(update_data["recorded_date"])
@@ -94,11 +86,12 @@ async def update_vital(
         update_data["weight_lbs"] = round(update_data["weight_kg"] * 2.20462, 2)
     elif "weight_lbs" in update_data and update_data["weight_lbs"] and "weight_kg" not in update_data:
         update_data["weight_kg"] = round(update_data["weight_lbs"] / 2.20462, 2)
-    for field, value in update_data.items():
-        setattr(vital, field, value)
-    await db.commit()
-    await db.refresh(vital)
-    await create_audit_log(db, user_id=user.id, action="UPDATE_VITAL", resource_type="Vital", resource_id=vital.id, ip_address=request.client.host if request.client else None)
+    vital = await unit_of_work.update(
+        db, Vital, update_data, Vital.id == vital_id, Vital.pet_id == pet_id,
+        user_id=user.id, action="UPDATE_VITAL", ip_address=request.client.host if request.client else None,
+    )
+    if not vital:
+        raise HTTPException(status_code=404, detail="Vital record not found")
     return vital
 
 
@@ -108,7 +101,7 @@ async def delete_vital(
     vital_id: int,
     request: Request,
     pet: Pet = Depends(get_pet_for_owner),
-    user: User = Depends(get_consented_user),
+    user: Principal = Depends(get_consented_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Vital).where(Vital.id == vital_id, Vital.pet_id == pet_id))
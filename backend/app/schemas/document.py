@@ -12,5 +12,37 @@ class DocumentResponse(BaseModel):
     upload_date: datetime
     extraction_status: ExtractionStatus
     extracted_data: dict | None
+    batch_id: str | None = None
+    duplicate_of_id: int | None = None
 
     model_config = {"from_attributes": True}
+
+
+class RejectedUpload(BaseModel):
+    filename: str | None
+    detail: str
+
+
+class DocumentBatchResponse(BaseModel):
+    batch_id: str
+    documents: list[DocumentResponse]
+    rejected: list[RejectedUpload]
+
+
+class BatchDocumentStatus(BaseModel):
+    id: int
+    filename: str
+    extraction_status: ExtractionStatus
+
+    model_config = {"from_attributes": True}
+
+
+class DocumentBatchProgress(BaseModel):
+    batch_id: str
+    total: int
+    pending: int
+    processing: int
+    completed: int
+    failed: int
+    done: bool
+    documents: list[BatchDocumentStatus]
@@ -20,3 +20,17 @@ async def check_medication_against_allergies(
         )
     )
     return result.scalars().all()
+
+
+async def load_drug_allergies(db: AsyncSession, pet_id: int) -> list[Allergy]:
+    """All of the pet's drug allergies, for matching many drug names in memory with match_drug_allergies."""
+    result = await db.execute(
+        select(Allergy).where(Allergy.pet_id == pet_id, Allergy.allergy_type == AllergyType.DRUG)
+    )
+    return list(result.scalars().all())
+
+
+def match_drug_allergies(allergies: list[Allergy], drug_name: str) -> list[Allergy]:
+    """In-memory equivalent of check_medication_against_allergies over preloaded allergies."""
+    needle = drug_name.lower()
+    return [a for a in allergies if needle in a.substance_name.lower()]
@@ -1,12 +1,55 @@
+"""
+Audit trail writes.
+
+add_audit_log stages a row in the caller's transaction, so it commits (or
+rolls back) with the change it records; the CRUD routers get this through
+app.services.unit_of_work. Actions recorded after their change has
+committed go through create_audit_log, which by default hands
+the row to a write-behind AuditWriter: rows queue in memory and a
+background task inserts them as one multi-row INSERT every
+audit_flush_ms or audit_batch_size rows, whichever comes first. The
+request doesn't pay for a second commit, and a burst of failed logins
+costs one transaction per batch instead of one session each.
+
+must_persist=True keeps the old behaviour (insert and commit before
+returning) for security events whose entry must not be lost in a crash:
+emergency share grants and revocations. The writer drains its queue on
+shutdown; without a running writer (tools, scripts, audit_write_behind=false)
+every entry is written synchronously.
+"""
+
+import asyncio
+import logging
 from datetime import datetime
 
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import AsyncSessionLocal
 from app.models.audit_log import AuditLog
+from app.services import metrics
 
+logger = logging.getLogger("uvicorn.error")
 
-async def create_audit_log(
+# Attempts at inserting one batch before its rows are logged and dropped
+WRITE_ATTEMPTS = 3
+
+
+def _audit_row(
+    user_id: int | None, action: str, resource_type: str, resource_id: int | None, ip_address: str | None
+) -> dict:
+    return {
+        "user_id": user_id,
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "ip_address": ip_address,
+        "timestamp": datetime.utcnow(),
+    }
+
+
+def add_audit_log(
     db: AsyncSession,
     *,
     user_id: int | None,
@@ -15,19 +58,115 @@ async def create_audit_log(
     resource_id: int | None = None,
     ip_address: str | None = None,
 ) -> AuditLog:
-    log = AuditLog(
-        user_id=user_id,
-        action=action,
-        resource_type=resource_type,
-        resource_id=resource_id,
-        ip_address=ip_address,
-        timestamp=datetime.utcnow(),
-    )
+    """Stage an audit row in the caller's transaction; it commits (or rolls back) with the change it records."""
+    log = AuditLog(**_audit_row(user_id, action, resource_type, resource_id, ip_address))
     db.add(log)
-    await db.commit()
     return log
 
 
+class AuditWriter:
+    """Queue of audit rows (column dicts) and the task that bulk-inserts them."""
+
+    def __init__(self, flush_seconds: float, batch_size: int, max_queue: int):
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        # None is the shutdown sentinel; a full queue makes submit() wait (backpressure, not loss)
+        self._queue: asyncio.Queue[dict | None] = asyncio.Queue(max_queue)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="audit-writer")
+
+    async def submit(self, row: dict) -> None:
+        await self._queue.put(row)
+        metrics.incr("audit_entries_queued")
+
+    async def stop(self) -> None:
+        """Write everything queued so far, then end the task."""
+        await self._queue.put(None)
+        if self._task is not None:
+            await self._task
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            row = await self._queue.get()
+            if row is None:
+                return
+            batch = [row]
+            # Collect until the batch is full or the first row has waited flush_seconds
+            deadline = loop.time() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    closing = True
+                    break
+                batch.append(row)
+            await self._write(batch)
+
+    async def _write(self, batch: list[dict]) -> None:
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(insert(AuditLog), batch)
+                    await session.commit()
+                metrics.incr("audit_batches_written")
+                metrics.incr("audit_rows_written", len(batch))
+                return
+            except Exception:
+                logger.warning("Audit batch of %d rows failed (attempt %d)", len(batch), attempt + 1, exc_info=True)
+                await asyncio.sleep(0.5 * 2 ** attempt)
+        # Last resort: the server log is the only copy left
+        metrics.incr("audit_rows_dropped", len(batch))
+        logger.error("Dropped %d audit rows after %d attempts: %s", len(batch), WRITE_ATTEMPTS, batch)
+
+
+_writer: AuditWriter | None = None
+
+
+def start_audit_writer() -> None:
+    """Start this process's write-behind audit writer (app startup), unless audit_write_behind is off."""
+    global _writer
+    if settings.audit_write_behind and _writer is None:
+        _writer = AuditWriter(settings.audit_flush_ms / 1000, settings.audit_batch_size, settings.audit_queue_max)
+        _writer.start()
+
+
+async def stop_audit_writer() -> None:
+    """Drain the queue (app shutdown); entries after this are written synchronously."""
+    global _writer
+    writer, _writer = _writer, None
+    if writer is not None:
+        await writer.stop()
+
+
+async def create_audit_log(
+    db: AsyncSession,
+    *,
+    user_id: int | None,
+    action: str,
+    resource_type: str = "",
+    resource_id: int | None = None,
+    ip_address: str | None = None,
+    must_persist: bool = False,
+) -> None:
+    """
+    Record an action whose change the caller has already committed. Queued
+    for the write-behind writer unless must_persist, in which case the row
+    is added to `db` and committed before returning.
+    """
+    row = _audit_row(user_id, action, resource_type, resource_id, ip_address)
+    if _writer is None or must_persist:
+        db.add(AuditLog(**row))
+        await db.commit()
+        return
+    await _writer.submit(row)
+
+
 async def create_audit_log_independent(
     *,
     user_id: int | None,
@@ -35,19 +174,16 @@ async def create_audit_log_independent(
     resource_type: str = "",
     resource_id: int | None = None,
     ip_address: str | None = None,
+    must_persist: bool = False,
 ) -> None:
     """
-    Write an audit log using its own DB session.
+    Write an audit log outside the request's DB session.
     Use this for failed-attempt logging so rollbacks don't erase the audit trail.
     """
+    row = _audit_row(user_id, action, resource_type, resource_id, ip_address)
+    if _writer is not None and not must_persist:
+        await _writer.submit(row)
+        return
     async with AsyncSessionLocal() as session:
-        log = AuditLog(
-            user_id=user_id,
-            action=action,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            ip_address=ip_address,
-            timestamp=datetime.utcnow(),
-        )
-        session.add(log)
+        session.add(AuditLog(**row))
         await session.commit()
@@ -1,12 +1,41 @@
+"""
+Password hashing and access tokens.
+
+A bcrypt hash or verify takes ~100-300 ms of CPU. Called inline from an
+async handler it stalls every other request on the worker, so handlers
+use hash_password_async / verify_password_async. These run on a small
+dedicated thread pool (bcrypt releases the GIL while hashing), so a login
+burst can't starve the default executor. At most
+password_hash_workers + password_hash_queue_max calls may be running or
+waiting; past that PasswordHasherBusy is raised and the API answers 503,
+rather than letting queued logins wait for minutes.
+
+Metrics: password_hash.calls, password_hash.in_flight (running or queued
+right now), password_hash.queue_wait_ms (total time spent waiting for a
+thread) and password_hash.rejected. The sync functions remain for tools
+and scripts.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.config import settings
+from app.services import metrics
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_executor: ThreadPoolExecutor | None = None
+_in_flight = 0
+
+
+class PasswordHasherBusy(Exception):
+    """Too many password hashes are already running or queued."""
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -16,10 +45,49 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="bcrypt")
+    return _executor
+
+
+async def _run_in_pool(fn, *args):
+    global _in_flight
+    limit = settings.password_hash_workers + settings.password_hash_queue_max
+    if settings.password_hash_queue_max and _in_flight >= limit:
+        metrics.incr("password_hash.rejected")
+        raise PasswordHasherBusy(f"{_in_flight} password hashes in flight")
+    submitted = time.perf_counter()
+
+    def timed():
+        metrics.incr("password_hash.queue_wait_ms", int((time.perf_counter() - submitted) * 1000))
+        return fn(*args)
+
+    _in_flight += 1
+    metrics.incr("password_hash.calls")
+    metrics.incr("password_hash.in_flight")
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), timed)
+    finally:
+        _in_flight -= 1
+        metrics.incr("password_hash.in_flight", -1)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await _run_in_pool(verify_password, plain, hashed)
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    to_encode.update({"exp": expire})
+    now = datetime.utcnow()
+    expire = now + timedelta(minutes=settings.access_token_expire_minutes)
+    # iat keys the principal cache (services/principal_cache)
+    to_encode.update({"exp": expire, "iat": now})
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
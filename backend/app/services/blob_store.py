@@ -0,0 +1,70 @@
+"""
+Content-addressed storage for uploaded documents.
+
+Each distinct file is stored once, at
+upload_dir/blobs/<ab>/<cd>/<sha256><ext>, where ab and cd are the first
+two byte pairs of the hash. Sharding keeps directories small, and the
+extension follows the sniffed media type, so readers that go by suffix
+keep working. Documents reference a Blob row. Its ref_count is
+maintained by mapper events on Document (see app.models.document). Files
+are never deleted on the request path; app.tools.blob_gc removes blobs
+that nothing references any more.
+"""
+
+from pathlib import Path
+
+import aiofiles.os
+from fastapi import UploadFile
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.blob import Blob
+from app.services import metrics
+from app.services.uploads import EXTENSIONS, discard, receive_upload
+
+
+def blob_root() -> Path:
+    return Path(settings.upload_dir) / "blobs"
+
+
+def blob_path(sha256: str, media_type: str) -> Path:
+    return blob_root() / sha256[:2] / sha256[2:4] / f"{sha256}{EXTENSIONS[media_type]}"
+
+
+async def get_or_create_blob(db: AsyncSession, sha256: str, size: int, media_type: str) -> Blob:
+    """The Blob row for `sha256`, inserted if new; losing an insert race to a concurrent upload is fine."""
+    blob = (await db.execute(select(Blob).where(Blob.sha256 == sha256))).scalar_one_or_none()
+    if blob is not None:
+        return blob
+    try:
+        async with db.begin_nested():
+            blob = Blob(sha256=sha256, size=size, media_type=media_type)
+            db.add(blob)
+    except IntegrityError:
+        blob = (await db.execute(select(Blob).where(Blob.sha256 == sha256))).scalar_one()
+    return blob
+
+
+async def store_upload(db: AsyncSession, file: UploadFile, max_size: int, allowed_types: set[str]) -> Blob:
+    """
+    Stream `file` into the blob store and return its Blob row (flushed,
+    not committed). Raises the same errors as receive_upload.
+    """
+    saved = await receive_upload(file, blob_root() / "tmp", max_size, allowed_types)
+    dest = blob_path(saved.sha256, saved.media_type)
+    try:
+        existed = await aiofiles.os.path.exists(dest)
+        await aiofiles.os.makedirs(dest.parent, exist_ok=True)
+        # Rename even over an existing copy (same bytes): it restores the
+        # file if blob_gc removed it a moment ago, at no extra disk cost
+        await aiofiles.os.replace(saved.path, dest)
+    except BaseException:
+        await discard(saved.path)
+        raise
+
+    if existed:
+        metrics.incr("blob_store_dedup_hits")
+        metrics.incr("blob_store_bytes_deduped", saved.size)
+    return await get_or_create_blob(db, saved.sha256, saved.size, saved.media_type)
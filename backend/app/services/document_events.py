@@ -0,0 +1,53 @@
+"""
+In-process pub/sub for document extraction progress.
+
+run_extraction and the job queue publish status/stage changes here after
+committing them; GET /pets/{pet_id}/documents/events subscribes per pet
+and streams them to the browser as Server-Sent Events. Events are small
+({document_id, status, stage}); the endpoint loads the document itself
+once a terminal status arrives.
+
+Only publishers in the same process are seen. Extraction running in a
+standalone worker reaches subscribers through the endpoint's periodic DB
+check instead, and every (re)connect starts from a DB snapshot, so a
+dropped event is never lost for good.
+"""
+
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.models.document import ExtractionStatus
+from app.services import metrics
+
+QUEUE_SIZE = 100
+
+_subscribers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+
+
+def publish(pet_id: int, document_id: int, status: ExtractionStatus, stage: str | None = None) -> None:
+    """Must be called from the event loop thread; never blocks."""
+    event = {"document_id": document_id, "status": status.value, "stage": stage or status.value}
+    for queue in list(_subscribers.get(pet_id, ())):
+        if queue.full():
+            # Slow client: drop the oldest; its next snapshot reconciles
+            queue.get_nowait()
+        queue.put_nowait(event)
+    metrics.incr("document_events_published")
+
+
+@asynccontextmanager
+async def subscribe(pet_id: int) -> AsyncIterator[asyncio.Queue]:
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    _subscribers[pet_id].add(queue)
+    try:
+        yield queue
+    finally:
+        _subscribers[pet_id].discard(queue)
+        if not _subscribers[pet_id]:
+            del _subscribers[pet_id]
+
+
+def subscriber_count() -> int:
+    return sum(len(queues) for queues in _subscribers.values())
@@ -0,0 +1,117 @@
+"""
+Stored text layers and per-stage timings for extracted documents.
+
+run_extraction records one DocumentText per document: the normalized
+pages, how they were read, which clinic format matched, and where the time
+went, plus the pages page triage skipped. Later parser versions can
+re-parse from this text without reopening the PDF (see
+pdf_parser.TextLayer.from_stored). A document served from the
+extraction cache copies the text of an earlier document with the same
+content hash. used_llm travels with the extracted data, so a re-parse
+can tell which documents hold Claude output it can't reproduce.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.document import Document
+from app.models.document_text import DocumentText
+from app.services.page_triage import PageTriage
+from app.services.pdf_parser import PARSER_VERSION, ParseResult
+
+# Parser breakdown keys that belong to text extraction rather than parsing
+TEXT_EXTRACTION_STAGES = ("extract_text",)
+
+
+def stage_timings(parsed: ParseResult) -> dict[str, float]:
+    """Split a parse's function-level timings into the text_extraction and parse stages."""
+    text_extraction = sum(parsed.timings.get(stage, 0.0) for stage in TEXT_EXTRACTION_STAGES)
+    parse = sum(v for k, v in parsed.timings.items() if k not in TEXT_EXTRACTION_STAGES)
+    return {"text_extraction": text_extraction, "parse": parse}
+
+
+def used_llm(record: DocumentText | None) -> bool:
+    """
+    Whether Claude contributed to the document's extracted_data. Rows
+    written before this was recorded fall back to their timings; cache hits
+    and near-duplicate reuses among them count as Claude output, since
+    where their data came from is unknown.
+    """
+    if record is None:
+        return False
+    if record.used_llm is not None:
+        return record.used_llm
+    timings = record.timings or {}
+    return any(key in timings for key in ("llm", "cached", "duplicate_of"))
+
+
+async def document_used_llm(db: AsyncSession, document_id: int) -> bool:
+    record = (await db.execute(
+        select(DocumentText).where(DocumentText.document_id == document_id)
+    )).scalar_one_or_none()
+    return used_llm(record)
+
+
+async def _get_or_add(db: AsyncSession, document_id: int) -> DocumentText:
+    record = (await db.execute(
+        select(DocumentText).where(DocumentText.document_id == document_id)
+    )).scalar_one_or_none()
+    if record is None:
+        record = DocumentText(document_id=document_id)
+        db.add(record)
+    return record
+
+
+async def save_document_text(
+    db: AsyncSession,
+    document_id: int,
+    parsed: ParseResult | None,
+    timings: dict[str, float],
+    triage: PageTriage | None = None,
+    llm: bool = False,
+) -> DocumentText:
+    """
+    Create or replace the document's record (not committed). parsed is None
+    for images; llm is whether Claude contributed to the extracted data.
+    """
+    record = await _get_or_add(db, document_id)
+    layer = parsed.text_layer if parsed else None
+    record.text = layer.to_stored() if layer else None
+    record.page_count = layer.page_count if layer else None
+    record.text_method = layer.method if layer else None
+    record.parser_version = PARSER_VERSION if parsed else None
+    record.detected_format = parsed.detected_format if parsed else None
+    record.timings = {k: round(v, 4) for k, v in timings.items()}
+    if parsed and parsed.timings:
+        record.timings["parser"] = {k: round(v, 4) for k, v in parsed.timings.items()}
+    if parsed and parsed.patterns:
+        record.timings["patterns"] = parsed.patterns
+    record.page_triage = triage.stats() if triage else None
+    record.used_llm = llm
+    return record
+
+
+async def copy_document_text(
+    db: AsyncSession, document_id: int, content_hash: str, timings: dict[str, float]
+) -> DocumentText:
+    """For a cache hit: reuse the text of another document with the same bytes, with this run's timings."""
+    source = (await db.execute(
+        select(DocumentText)
+        .join(Document, Document.id == DocumentText.document_id)
+        .where(Document.content_hash == content_hash, Document.id != document_id)
+        .order_by(DocumentText.updated_at.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+    record = await _get_or_add(db, document_id)
+    if source is not None:
+        record.text = source.text
+        record.page_count = source.page_count
+        record.text_method = source.text_method
+        record.parser_version = source.parser_version
+        record.detected_format = source.detected_format
+        record.page_triage = source.page_triage
+    # Without a source the cached data's origin is unknown; don't let a re-parse replace it
+    record.used_llm = used_llm(source) if source is not None else True
+    record.timings = {k: round(v, 4) for k, v in timings.items()} | {"cached": True}
+    return record
+
@@ -0,0 +1,62 @@
+"""
+Content-hash extraction cache.
+
+Identical files (the same discharge PDF uploaded twice, or for two pets)
+reuse the stored extraction instead of going through the parser and the
+Claude fallback again. Entries are keyed by (SHA-256, PARSER_VERSION), so a
+parser upgrade naturally invalidates older results.
+"""
+
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.extraction_cache import ExtractionCache
+from app.services import metrics
+from app.services.pdf_parser import PARSER_VERSION
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file on disk, read in chunks (for documents uploaded before hashing)."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+async def get_cached_extraction(db: AsyncSession, content_hash: str) -> dict | None:
+    result = await db.execute(
+        select(ExtractionCache).where(
+            ExtractionCache.content_hash == content_hash,
+            ExtractionCache.parser_version == PARSER_VERSION,
+        )
+    )
+    entry = result.scalar_one_or_none()
+    if entry is None:
+        metrics.incr("extraction_cache.misses")
+        return None
+
+    metrics.incr("extraction_cache.hits")
+    entry.hit_count += 1
+    entry.last_hit_at = datetime.utcnow()
+    return entry.extracted_data
+
+
+async def store_extraction(db: AsyncSession, content_hash: str, extracted_data: dict) -> None:
+    """Insert a cache entry; losing a race with a concurrent identical upload is fine."""
+    try:
+        async with db.begin_nested():
+            db.add(ExtractionCache(
+                content_hash=content_hash,
+                parser_version=PARSER_VERSION,
+                extracted_data=extracted_data,
+            ))
+    except IntegrityError:
+        pass
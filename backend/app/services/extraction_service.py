@@ -1,13 +1,45 @@
+import asyncio
 import base64
+import io
 import json
+import logging
 import re
+import time
 from pathlib import Path
 
-import anthropic
+from pypdf import PdfReader, PdfWriter
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.database import AsyncSessionLocal
 from app.models.document import Document, ExtractionStatus
+from app.services import document_events, metrics
+from app.services.document_text import copy_document_text, document_used_llm, save_document_text, stage_timings
+from app.services.extraction_cache import get_cached_extraction, hash_file, store_extraction
+from app.services.image_preprocess import prepare_image_for_llm
+from app.services.job_queue import LeaseLost, hold_lease
+from app.services.llm_client import get_llm_client
+from app.services.near_duplicate import (
+    SignedText,
+    find_exact_duplicate,
+    find_near_duplicate,
+    index_signature,
+    read_and_sign,
+    reusable_extraction,
+)
+from app.services.page_triage import PageTriage, triage_pages
+from app.services.parser_pool import run_parser
+from app.services.pdf_parser import MAX_PAGES, has_useful_data, parse_text_layer
+
+logger = logging.getLogger("uvicorn.error")
+
+CLAUDE_MODEL = "claude-sonnet-4-5-20250929"
+MAX_OUTPUT_TOKENS = 4096
+# Rough input-token costs used to pre-charge the rate limiter; corrected from usage afterwards
+PDF_PAGE_TOKENS = 2500
+IMAGE_PIXELS_PER_TOKEN = 750
+# Sonnet ignores cache breakpoints on prefixes shorter than this
+MIN_CACHEABLE_TOKENS = 1024
 
 EXTRACTION_PROMPT = """
 You are a veterinary medical record parser. Extract all medical information from this document.
@@ -83,6 +115,7 @@ Rules:
 - Include BCS, mucous membrane color, CRT, and attitude in the vitals notes field
 - Return ONLY the JSON object, no other text or markdown
 """
+PROMPT_TOKENS = len(EXTRACTION_PROMPT) // 4
 
 MEDIA_TYPE_MAP = {
     ".pdf": "application/pdf",
@@ -92,6 +125,16 @@ MEDIA_TYPE_MAP = {
 }
 
 
+# Record lists in extracted_data and the key two entries must share to count as duplicates
+DEDUPE_KEYS = {
+    "medications": lambda m: ((m.get("drug_name") or "").lower(), (m.get("strength") or "").lower()),
+    "vaccines": lambda v: ((v.get("name") or "").lower(), v.get("date_given")),
+    "allergies": lambda a: (a.get("substance_name") or "").lower(),
+    "problems": lambda p: (p.get("condition_name") or "").lower(),
+    "vitals": lambda v: (v.get("recorded_date"), v.get("weight_kg"), v.get("temperature_f"), v.get("heart_rate_bpm")),
+}
+
+
 def _parse_claude_json(raw: str) -> dict:
     """Strip markdown code fences if present, then parse JSON."""
     raw = raw.strip()
@@ -101,95 +144,323 @@ def _parse_claude_json(raw: str) -> dict:
     return json.loads(raw.strip())
 
 
-async def run_extraction(doc_id: int) -> None:
-    """Background task: read document, extract data. Uses local PDF parser first, falls back to Claude."""
+def merge_extractions(results: list[dict]) -> dict:
+    """
+    Combine several extracted_data dicts (local parse, per-chunk Claude
+    results) into one. Duplicate records keep the higher-confidence copy;
+    pet_info takes the first non-null value per field.
+    """
+    merged: dict = {key: [] for key in DEDUPE_KEYS}
+    seen: dict[str, dict] = {key: {} for key in DEDUPE_KEYS}
+    pet_info: dict = {}
+    for result in results:
+        for key, dedupe_key in DEDUPE_KEYS.items():
+            for item in result.get(key) or []:
+                if not isinstance(item, dict):
+                    continue
+                k = dedupe_key(item)
+                if k not in seen[key]:
+                    seen[key][k] = len(merged[key])
+                    merged[key].append(item)
+                elif (item.get("confidence") or 0) > (merged[key][seen[key][k]].get("confidence") or 0):
+                    merged[key][seen[key][k]] = item
+        for field, value in (result.get("pet_info") or {}).items():
+            if pet_info.get(field) is None:
+                pet_info[field] = value
+    merged["pet_info"] = pet_info
+    return merged
+
+
+def records_match(parsed: dict, reused: dict) -> bool:
+    """
+    Whether every record a local parse found is also in `reused`, compared by
+    DEDUPE_KEYS. `reused` may hold more (Claude's reading of pages the parser
+    couldn't read), but a record of its own, such as another visit's date, is
+    a mismatch.
+    """
+    for key, dedupe_key in DEDUPE_KEYS.items():
+        known = {dedupe_key(item) for item in reused.get(key) or [] if isinstance(item, dict)}
+        if any(dedupe_key(item) not in known for item in parsed.get(key) or [] if isinstance(item, dict)):
+            return False
+    return True
+
+
+def _chunk_pages(pages: list[int], size: int) -> list[list[int]]:
+    """Group page numbers into runs of consecutive pages, each at most `size` long."""
+    chunks: list[list[int]] = []
+    for page in pages:
+        if chunks and page == chunks[-1][-1] + 1 and len(chunks[-1]) < size:
+            chunks[-1].append(page)
+        else:
+            chunks.append([page])
+    return chunks
+
+
+def _split_pdf(file_path: Path, pages: list[int] | None, chunk_pages: int) -> list[tuple[bytes, int]]:
+    """
+    Build one small PDF per page-range chunk, as (pdf bytes, page count).
+    pages=None means every page (up to MAX_PAGES). A PDF pypdf can't read
+    is sent whole, as before.
+    """
+    try:
+        reader = PdfReader(str(file_path))
+        if pages is None:
+            pages = list(range(min(len(reader.pages), MAX_PAGES)))
+        chunks = []
+        for chunk in _chunk_pages(pages, chunk_pages):
+            writer = PdfWriter()
+            for i in chunk:
+                writer.add_page(reader.pages[i])
+            buf = io.BytesIO()
+            writer.write(buf)
+            chunks.append((buf.getvalue(), len(chunk)))
+        return chunks
+    except Exception:
+        logger.warning("Could not split %s into page chunks; sending the whole file", file_path)
+        return [(file_path.read_bytes(), chunk_pages)]
+
+
+def _content_block(data: bytes, media_type: str) -> dict:
+    source = {
+        "type": "base64",
+        "media_type": media_type,
+        "data": base64.standard_b64encode(data).decode("utf-8"),
+    }
+    if media_type == "application/pdf":
+        return {"type": "document", "source": source}
+    return {"type": "image", "source": source}
+
+
+async def _claude_extract(content_block: dict, input_tokens: int) -> dict:
+    # The static prompt goes first, in the system block. It is the only prefix
+    # shared between requests, and at ~650 tokens too short to be cached, so
+    # the breakpoint is only set once it would take effect.
+    system: dict = {"type": "text", "text": EXTRACTION_PROMPT}
+    if PROMPT_TOKENS >= MIN_CACHEABLE_TOKENS:
+        system["cache_control"] = {"type": "ephemeral"}
+    message = await get_llm_client().create_message(
+        estimated_tokens=input_tokens + PROMPT_TOKENS + MAX_OUTPUT_TOKENS,
+        model=CLAUDE_MODEL,
+        max_tokens=MAX_OUTPUT_TOKENS,
+        system=[system],
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    content_block,
+                    {"type": "text", "text": "Extract the medical information from this document."},
+                ],
+            }
+        ],
+    )
+    return _parse_claude_json(message.content[0].text)
+
+
+def llm_available() -> bool:
+    return bool(settings.anthropic_api_key) and not settings.anthropic_api_key.startswith("sk-ant-place")
+
+
+async def extract_with_claude(file_path: Path, pages: list[int] | None = None) -> dict:
+    """
+    Claude extraction for an image, or for the given 0-based PDF pages
+    (None = whole document). PDF pages are sent as chunks of
+    llm_chunk_pages, at most llm_max_concurrency at a time, and the chunk
+    results are merged; one failed chunk fails the whole call.
+    """
+    media_type = MEDIA_TYPE_MAP.get(file_path.suffix.lower(), "image/jpeg")
+    if media_type != "application/pdf":
+        image = await prepare_image_for_llm(file_path, media_type)
+        tokens = max(image.width * image.height // IMAGE_PIXELS_PER_TOKEN, 1)
+        return await _claude_extract(_content_block(image.data, image.media_type), tokens)
+
+    chunks = await asyncio.to_thread(_split_pdf, file_path, pages, settings.llm_chunk_pages)
+    semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+
+    async def extract_chunk(chunk: bytes, page_count: int) -> dict:
+        async with semaphore:
+            return await _claude_extract(_content_block(chunk, "application/pdf"), page_count * PDF_PAGE_TOKENS)
+
+    tasks = [asyncio.create_task(extract_chunk(chunk, n)) for chunk, n in chunks]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return merge_extractions(results)
+
+
+async def _check_lease(db: AsyncSession, job_id: int | None, worker_id: str | None) -> None:
+    """Before committing a result: keep the job's lease in this transaction, or raise LeaseLost."""
+    if job_id is not None and not await hold_lease(db, job_id, worker_id):
+        await db.rollback()
+        raise LeaseLost(f"Extraction job {job_id} was reclaimed from worker {worker_id}")
+
+
+async def run_extraction(doc_id: int, job_id: int | None = None, worker_id: str | None = None) -> None:
+    """
+    Extraction job body: read document, extract data. Uses local PDF parser first, falls back to Claude.
+    Errors are recorded on the document and re-raised so the job queue can retry. Given the job
+    and worker, the result is only committed while the job is still leased to that worker;
+    otherwise LeaseLost is raised and nothing is written.
+    """
     async with AsyncSessionLocal() as db:
         doc = await db.get(Document, doc_id)
         if not doc:
             return
 
+        pet_id = doc.pet_id
+        started = time.perf_counter()
+        timings: dict[str, float] = {}
         try:
             doc.extraction_status = ExtractionStatus.PROCESSING
             await db.commit()
+            document_events.publish(pet_id, doc_id, ExtractionStatus.PROCESSING)
 
             file_path = Path(doc.file_path)
             if not file_path.exists():
                 raise FileNotFoundError(f"File not found: {file_path}")
 
-            suffix = file_path.suffix.lower()
+            # Identical file already extracted with this parser version? Reuse it.
+            if not doc.content_hash:
+                doc.content_hash = await asyncio.to_thread(hash_file, file_path)
+            cached = await get_cached_extraction(db, doc.content_hash)
+            timings["read"] = time.perf_counter() - started
+            if cached is not None:
+                # The same bytes uploaded again for this pet: flag it for review like a near-duplicate
+                doc.duplicate_of_id = await find_exact_duplicate(db, pet_id, doc_id, doc.content_hash)
+                doc.extracted_data = cached
+                doc.extraction_status = ExtractionStatus.COMPLETED
+                timings["total"] = time.perf_counter() - started
+                await copy_document_text(db, doc_id, doc.content_hash, timings)
+                await _check_lease(db, job_id, worker_id)
+                await db.commit()
+                document_events.publish(pet_id, doc_id, ExtractionStatus.COMPLETED, stage="cached")
+                return
+
             extracted = None
+            parsed = None
+            triage: PageTriage | None = None
+            reused = None
+            used_llm = False
 
-            # Try local PDF parser first (works without API key)
-            if suffix == ".pdf":
+            # Try local PDF parser first (works without API key); runs in the parser
+            # process pool, and a timeout falls through to Claude like any parse failure
+            if file_path.suffix.lower() == ".pdf":
+                document_events.publish(pet_id, doc_id, ExtractionStatus.PROCESSING, stage="parsing")
+                signed: SignedText | None = None
                 try:
-                    from app.services.pdf_parser import extract_visit_data
-                    extracted = extract_visit_data(str(file_path))
-                    if extracted and not extracted.get("error"):
-                        # Check if we actually found useful data
-                        has_data = any([
-                            extracted.get("medications"),
-                            extracted.get("vaccines"),
-                            extracted.get("vitals"),
-                            extracted.get("problems"),
-                            extracted.get("allergies"),
-                        ])
-                        if not has_data:
-                            extracted = None  # Fall through to Claude
+                    signed = await run_parser(read_and_sign, str(file_path))
                 except Exception:
-                    extracted = None  # Fall through to Claude
-
-            # Fall back to Claude API if local parser didn't produce results
-            if extracted is None and settings.anthropic_api_key and not settings.anthropic_api_key.startswith("sk-ant-place"):
-                file_bytes = file_path.read_bytes()
-                b64_content = base64.standard_b64encode(file_bytes).decode("utf-8")
-                media_type = MEDIA_TYPE_MAP.get(suffix, "image/jpeg")
-
-                if media_type == "application/pdf":
-                    content_block = {
-                        "type": "document",
-                        "source": {
-                            "type": "base64",
-                            "media_type": "application/pdf",
-                            "data": b64_content,
-                        },
-                    }
-                else:
-                    content_block = {
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": media_type,
-                            "data": b64_content,
-                        },
-                    }
-
-                client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-                message = await client.messages.create(
-                    model="claude-sonnet-4-5-20250929",
-                    max_tokens=4096,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                content_block,
-                                {"type": "text", "text": EXTRACTION_PROMPT},
-                            ],
-                        }
-                    ],
-                )
-
-                raw_response = message.content[0].text
-                extracted = _parse_claude_json(raw_response)
+                    pass  # Fall through to Claude
+
+                # Another export of a visit this pet already has? Flag it for review. Shared
+                # boilerplate can make different visits look alike, so its extraction is only
+                # reused (in place of Claude) once this document's own parse agrees with it
+                if signed is not None and signed.signature is not None and settings.near_duplicate_enabled:
+                    dedupe_started = time.perf_counter()
+                    match = await find_near_duplicate(db, pet_id, doc_id, signed.signature)
+                    await index_signature(db, pet_id, doc_id, signed.signature, signed.shingle_count)
+                    timings["near_duplicate"] = signed.sign_seconds + time.perf_counter() - dedupe_started
+                    if match is not None:
+                        original, score = match
+                        doc.duplicate_of_id = original.id
+                        metrics.incr("near_duplicates_flagged")
+                        logger.info(
+                            "Document %s is a near-duplicate of %s (similarity %.2f)", doc_id, original.id, score
+                        )
+                        reused = reusable_extraction(original)
+                    # Commit the signature now so duplicates extracting concurrently can see it
+                    await db.commit()
+
+                # Blank backs and repeated pages go to neither the parser nor Claude
+                if signed is not None and settings.page_triage_enabled:
+                    try:
+                        triage = await run_parser(
+                            triage_pages,
+                            str(file_path),
+                            signed.layer.pages,
+                            settings.page_blank_max_ink,
+                            settings.page_duplicate_max_distance,
+                        )
+                        timings["triage"] = triage.seconds
+                        metrics.incr("pages_skipped_blank", len(triage.blank))
+                        metrics.incr("pages_skipped_duplicate", len(triage.duplicates))
+                    except Exception:
+                        logger.warning("Page triage failed for document %s; keeping every page", doc_id, exc_info=True)
+
+                if signed is not None:
+                    try:
+                        parsed = await run_parser(
+                            parse_text_layer,
+                            signed.layer,
+                            signed.timings,
+                            settings.parser_budget_seconds,
+                            triage.skipped if triage else (),
+                        )
+                        timings.update(stage_timings(parsed))
+                        if parsed.budget_exceeded:
+                            metrics.incr("parser_budget_exceeded")
+                            logger.warning("Parse of document %s ran out of budget; using the LLM fallback", doc_id)
+                        if has_useful_data(parsed.data):
+                            extracted = parsed.data
+                    except Exception:
+                        parsed = None  # Fall through to Claude
+
+                if reused is not None:
+                    if extracted is not None and records_match(extracted, reused):
+                        extracted = reused
+                        used_llm = await document_used_llm(db, doc.duplicate_of_id)
+                        parsed.pending_pages = []  # Already read by the original's extraction
+                        metrics.incr("near_duplicates_reused")
+                    else:
+                        metrics.incr("near_duplicates_mismatched")
+                        logger.info(
+                            "Document %s differs from its near-duplicate %s; extracting it separately",
+                            doc_id, doc.duplicate_of_id,
+                        )
+
+            # Fall back to Claude API if local parser didn't produce results. None sends the
+            # whole document; an empty list means every page was blank or a repeat.
+            llm_pages = parsed.pending_pages if parsed else (triage.kept if triage else None)
+            llm_started = time.perf_counter()
+            if extracted is None and llm_available() and llm_pages != []:
+                document_events.publish(pet_id, doc_id, ExtractionStatus.PROCESSING, stage="llm")
+                extracted = await extract_with_claude(file_path, llm_pages)
+                used_llm = True
+                timings["llm"] = time.perf_counter() - llm_started
+            # Local parse succeeded but left pages it couldn't read (scans, later visits):
+            # send only those, and keep the local result if Claude fails
+            elif extracted is not None and parsed.pending_pages and llm_available():
+                document_events.publish(pet_id, doc_id, ExtractionStatus.PROCESSING, stage="llm")
+                try:
+                    extra = await extract_with_claude(file_path, parsed.pending_pages)
+                    extracted = merge_extractions([extracted, extra])
+                    used_llm = True
+                except Exception:
+                    logger.exception("Claude extraction of pending pages failed for document %s", doc_id)
+                timings["llm"] = time.perf_counter() - llm_started
 
             if extracted and not extracted.get("error"):
                 doc.extracted_data = extracted
                 doc.extraction_status = ExtractionStatus.COMPLETED
+                await store_extraction(db, doc.content_hash, extracted)
             else:
                 doc.extraction_status = ExtractionStatus.FAILED
                 doc.extracted_data = extracted or {"error": "Could not extract data from document"}
+            timings["total"] = time.perf_counter() - started
+            await save_document_text(db, doc_id, parsed, timings, triage, used_llm)
 
+        except LeaseLost:
+            raise
         except Exception as e:
+            # No event here: the job queue decides between retry and final failure and publishes that
             doc.extraction_status = ExtractionStatus.FAILED
             doc.extracted_data = {"error": str(e)}
+            await _check_lease(db, job_id, worker_id)
+            await db.commit()
+            raise
 
+        await _check_lease(db, job_id, worker_id)
         await db.commit()
+        document_events.publish(pet_id, doc_id, doc.extraction_status)
@@ -0,0 +1,93 @@
+"""
+Shrink photographed documents before they are sent to Claude.
+
+Phone photos of paperwork are typically 4-10 MB. Claude downscales
+anything with a long edge over ~1568 px before reading it, so the extra
+pixels only cost upload time and base64 overhead. The image is
+auto-rotated from its EXIF orientation, bounded to image_max_long_edge,
+optionally converted to grayscale, and recompressed as JPEG. The stored
+upload is left untouched.
+
+Decoding and resampling run on a small dedicated thread pool (Pillow
+releases the GIL for both), so large images don't block the event loop
+or crowd out the default executor.
+"""
+
+import asyncio
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from app.config import settings
+from app.services import metrics
+
+logger = logging.getLogger("uvicorn.error")
+
+_executor: ThreadPoolExecutor | None = None
+
+
+@dataclass
+class PreparedImage:
+    data: bytes
+    media_type: str
+    width: int
+    height: int
+    original_bytes: int
+
+
+def preprocess_image(
+    data: bytes, max_long_edge: int, quality: int, grayscale: bool, media_type: str = "image/jpeg"
+) -> PreparedImage:
+    """
+    Rotate, downscale, optionally grayscale and JPEG-recompress `data`.
+    Returns the original bytes when the result would not be smaller and
+    no rotation was needed, or when Pillow can't read the image.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            needs_rotation = img.getexif().get(0x0112, 1) != 1  # EXIF Orientation
+            out = ImageOps.exif_transpose(img).convert("L" if grayscale else "RGB")
+            out.thumbnail((max_long_edge, max_long_edge), Image.Resampling.LANCZOS)
+            buf = io.BytesIO()
+            out.save(buf, "JPEG", quality=quality, optimize=True)
+            width, height = out.size
+            original_size = img.size
+    except Exception:
+        logger.warning("Could not preprocess image; sending original", exc_info=True)
+        return PreparedImage(data, media_type, 0, 0, len(data))
+
+    processed = buf.getvalue()
+    if len(processed) >= len(data) and not needs_rotation:
+        return PreparedImage(data, media_type, original_size[0], original_size[1], len(data))
+    return PreparedImage(processed, "image/jpeg", width, height, len(data))
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.image_preprocess_workers, thread_name_prefix="image-prep")
+    return _executor
+
+
+def _prepare(file_path: Path, media_type: str) -> PreparedImage:
+    return preprocess_image(
+        file_path.read_bytes(),
+        max_long_edge=settings.image_max_long_edge,
+        quality=settings.image_jpeg_quality,
+        grayscale=settings.image_grayscale,
+        media_type=media_type,
+    )
+
+
+async def prepare_image_for_llm(file_path: Path, media_type: str) -> PreparedImage:
+    """Read and preprocess an uploaded image off the event loop, recording bytes saved."""
+    loop = asyncio.get_running_loop()
+    prepared = await loop.run_in_executor(_get_executor(), _prepare, file_path, media_type)
+    metrics.incr("image_preprocess_bytes_in", prepared.original_bytes)
+    metrics.incr("image_preprocess_bytes_out", len(prepared.data))
+    metrics.incr("image_preprocess_bytes_saved", prepared.original_bytes - len(prepared.data))
+    return prepared
@@ -0,0 +1,251 @@
+"""
+DB-backed extraction job queue.
+
+Jobs are claimed under a time-limited lease so that a crashed or restarted
+worker never strands a document: once the lease runs out the recovery sweep
+puts the job back on the queue. The worker renews the lease every
+extraction_job_heartbeat_seconds while the job runs. Every later write for
+the job (renewal, completion, failure) is guarded on the job still being
+RUNNING and locked by that worker, so a worker whose job was reclaimed
+can't overwrite the new owner's work; it gets LeaseLost or False and drops
+its result. Failed attempts are retried with exponential backoff until
+max_attempts is reached.
+
+Each job carries the pet owner's id. A worker skips queued jobs whose
+owner already has extraction_max_running_per_user jobs running, so one
+owner's 50-file batch can't occupy every worker while other owners wait.
+The cap is checked at claim time without locking, so two workers racing
+can briefly exceed it by one; it is a fairness limit, not a hard quota.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.config import settings
+from app.models.document import Document, ExtractionStatus
+from app.models.extraction_job import ExtractionJob, JobStatus
+from app.models.pet import Pet
+from app.services import document_events
+
+ACTIVE_JOB_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class LeaseLost(Exception):
+    """The job was reclaimed from this worker; its result must not be written."""
+
+
+def enqueue_extraction(db: AsyncSession, document_id: int, owner_id: int | None = None) -> ExtractionJob:
+    """Add a queued job for the document. The caller commits."""
+    job = ExtractionJob(
+        document_id=document_id,
+        owner_id=owner_id,
+        status=JobStatus.QUEUED,
+        attempts=0,
+        max_attempts=settings.extraction_job_max_attempts,
+        available_at=datetime.utcnow(),
+    )
+    db.add(job)
+    return job
+
+
+async def claim_next_job(db: AsyncSession, worker_id: str) -> ExtractionJob | None:
+    """
+    Claim the oldest runnable job for this worker and commit the claim.
+    Returns None when nothing is ready.
+    """
+    now = datetime.utcnow()
+    conditions = [
+        ExtractionJob.status == JobStatus.QUEUED,
+        ExtractionJob.available_at <= now,
+    ]
+    if settings.extraction_max_running_per_user > 0:
+        running = aliased(ExtractionJob)
+        owner_running = (
+            select(func.count(running.id))
+            .where(running.status == JobStatus.RUNNING, running.owner_id == ExtractionJob.owner_id)
+            .scalar_subquery()
+        )
+        conditions.append(
+            or_(ExtractionJob.owner_id.is_(None), owner_running < settings.extraction_max_running_per_user)
+        )
+    result = await db.execute(
+        select(ExtractionJob.id)
+        .where(*conditions)
+        .order_by(ExtractionJob.available_at, ExtractionJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job_id = result.scalar_one_or_none()
+    if job_id is None:
+        await db.rollback()
+        return None
+
+    # Guard on status so two workers racing on a backend without SKIP LOCKED
+    # cannot both win the same row.
+    claimed = await db.execute(
+        update(ExtractionJob)
+        .where(ExtractionJob.id == job_id, ExtractionJob.status == JobStatus.QUEUED)
+        .values(
+            status=JobStatus.RUNNING,
+            attempts=ExtractionJob.attempts + 1,
+            locked_by=worker_id,
+            lease_expires_at=now + timedelta(seconds=settings.extraction_job_lease_seconds),
+            updated_at=now,
+        )
+    )
+    await db.commit()
+    if claimed.rowcount != 1:
+        return None
+    return await db.get(ExtractionJob, job_id, populate_existing=True)
+
+
+def _owned(job_id: int, worker_id: str) -> tuple:
+    return (
+        ExtractionJob.id == job_id,
+        ExtractionJob.status == JobStatus.RUNNING,
+        ExtractionJob.locked_by == worker_id,
+    )
+
+
+async def hold_lease(db: AsyncSession, job_id: int, worker_id: str) -> bool:
+    """
+    Extend the lease in the caller's transaction, without committing; False
+    if the job is no longer this worker's. Run it right before committing a
+    result so the ownership check and the result land together.
+    """
+    now = datetime.utcnow()
+    held = await db.execute(
+        update(ExtractionJob)
+        .where(*_owned(job_id, worker_id))
+        .values(lease_expires_at=now + timedelta(seconds=settings.extraction_job_lease_seconds), updated_at=now)
+    )
+    return held.rowcount == 1
+
+
+async def renew_lease(db: AsyncSession, job_id: int, worker_id: str) -> bool:
+    """Heartbeat: extend the lease and commit. False if the job was reclaimed."""
+    held = await hold_lease(db, job_id, worker_id)
+    await db.commit()
+    return held
+
+
+async def complete_job(db: AsyncSession, job_id: int, worker_id: str) -> bool:
+    """Mark the job SUCCEEDED; False (nothing written) if it is no longer this worker's."""
+    completed = await db.execute(
+        update(ExtractionJob)
+        .where(*_owned(job_id, worker_id))
+        .values(
+            status=JobStatus.SUCCEEDED,
+            locked_by=None,
+            lease_expires_at=None,
+            last_error=None,
+            updated_at=datetime.utcnow(),
+        )
+    )
+    await db.commit()
+    return completed.rowcount == 1
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff: base, 2*base, 4*base, ..."""
+    return timedelta(seconds=settings.extraction_job_retry_base_seconds * (2 ** max(attempts - 1, 0)))
+
+
+async def fail_job(db: AsyncSession, job_id: int, worker_id: str, error: str) -> bool:
+    """
+    Record a failed attempt; requeue with backoff or give up after
+    max_attempts. False (nothing written) if the job is no longer this worker's.
+    """
+    result = await db.execute(
+        select(ExtractionJob)
+        .where(*_owned(job_id, worker_id))
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    job = result.scalar_one_or_none()
+    if job is None:
+        await db.rollback()
+        return False
+    released = await _release_failed(db, job, error)
+    await db.commit()
+    if released:
+        document_events.publish(*released)
+    return True
+
+
+async def _release_failed(
+    db: AsyncSession, job: ExtractionJob, error: str
+) -> tuple[int, int, ExtractionStatus] | None:
+    """Requeue or finally fail the job; returns (pet_id, document_id, status) to publish after commit."""
+    now = datetime.utcnow()
+    job.locked_by = None
+    job.lease_expires_at = None
+    job.last_error = error[:4000]
+    job.updated_at = now
+
+    doc = await db.get(Document, job.document_id)
+    if job.attempts < job.max_attempts:
+        job.status = JobStatus.QUEUED
+        job.available_at = now + retry_delay(job.attempts)
+        # Document goes back to PENDING until the retry picks it up
+        await db.execute(
+            update(Document)
+            .where(Document.id == job.document_id)
+            .values(extraction_status=ExtractionStatus.PENDING)
+        )
+        status = ExtractionStatus.PENDING
+    else:
+        job.status = JobStatus.FAILED
+        if doc is not None and doc.extraction_status != ExtractionStatus.FAILED:
+            doc.extraction_status = ExtractionStatus.FAILED
+            doc.extracted_data = {"error": f"Extraction failed after {job.attempts} attempts: {job.last_error}"}
+        status = ExtractionStatus.FAILED
+    return (doc.pet_id, doc.id, status) if doc is not None else None
+
+
+async def recover_stale_jobs(db: AsyncSession) -> int:
+    """
+    Recovery sweep. Requeues RUNNING jobs whose lease expired (the worker died
+    or was restarted) and enqueues documents left PENDING/PROCESSING without
+    any active job. Returns the number of jobs recovered or created.
+    """
+    now = datetime.utcnow()
+    recovered = 0
+
+    result = await db.execute(
+        select(ExtractionJob)
+        .where(
+            ExtractionJob.status == JobStatus.RUNNING,
+            ExtractionJob.lease_expires_at < now,
+        )
+        .with_for_update(skip_locked=True)
+    )
+    released = []
+    for job in result.scalars().all():
+        released.append(await _release_failed(db, job, f"Lease expired (worker {job.locked_by})"))
+        recovered += 1
+
+    orphaned = await db.execute(
+        select(Document.id, Pet.owner_id)
+        .join(Pet, Pet.id == Document.pet_id)
+        .where(
+            Document.extraction_status.in_((ExtractionStatus.PENDING, ExtractionStatus.PROCESSING)),
+            ~select(ExtractionJob.id)
+            .where(
+                ExtractionJob.document_id == Document.id,
+                ExtractionJob.status.in_(ACTIVE_JOB_STATUSES),
+            )
+            .exists(),
+        )
+    )
+    for doc_id, owner_id in orphaned.all():
+        enqueue_extraction(db, doc_id, owner_id)
+        recovered += 1
+
+    await db.commit()
+    for event in filter(None, released):
+        document_events.publish(*event)
+    return recovered
@@ -0,0 +1,169 @@
+"""
+Process-wide Anthropic client for document extraction.
+
+One AsyncAnthropic (and its httpx connection pool) is shared by every
+extraction in the process, so TLS connections are kept alive between
+documents and chunks. Requests pass through two token buckets, one for
+requests and one for tokens per minute, so concurrent chunks stay under
+the account's rate limits instead of bouncing off 429s. The statuses the
+SDK itself would retry (408, 409, 429, 5xx including 529) and connection
+errors are retried here with backoff (honouring retry-after); the SDK's
+own retries are disabled so retries are rate limited too.
+
+The client is bound to the event loop that created it: call
+close_llm_client() on shutdown (or before starting a new loop).
+"""
+
+import asyncio
+import logging
+import random
+import time
+
+import anthropic
+import httpx
+
+from app.config import settings
+from app.services import metrics
+
+logger = logging.getLogger("uvicorn.error")
+
+RETRY_STATUSES = {408, 409, 429}
+MAX_BACKOFF_SECONDS = 60.0
+
+
+class TokenBucket:
+    """
+    Async token bucket refilling continuously at per_minute / 60 per second,
+    holding at most one minute's worth. Waiters are served in FIFO order.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # A single request larger than the bucket would wait forever; let it through once full
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) after the fact; the balance may go negative."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
+
+
+def _retryable(status: int | None) -> bool:
+    """None is a connection error or timeout."""
+    return status is None or status in RETRY_STATUSES or status >= 500
+
+
+class LLMClient:
+    def __init__(self) -> None:
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_connections,
+                keepalive_expiry=60.0,
+            ),
+            timeout=httpx.Timeout(settings.llm_timeout_seconds, connect=10.0),
+        )
+        self.client = anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            base_url=settings.anthropic_base_url or None,
+            max_retries=0,
+            http_client=self.http_client,
+        )
+        self.requests = TokenBucket(settings.llm_requests_per_minute) if settings.llm_requests_per_minute > 0 else None
+        self.tokens = TokenBucket(settings.llm_tokens_per_minute) if settings.llm_tokens_per_minute > 0 else None
+
+    async def _acquire(self, tokens: int) -> None:
+        if self.requests:
+            await self.requests.acquire(1)
+        if self.tokens:
+            await self.tokens.acquire(tokens)
+
+    def _settle(self, estimated: int, usage) -> None:
+        actual = (
+            usage.input_tokens
+            + usage.output_tokens
+            + (getattr(usage, "cache_creation_input_tokens", None) or 0)
+        )
+        if self.tokens:
+            self.tokens.adjust(actual - estimated)
+        metrics.incr("llm_input_tokens", usage.input_tokens)
+        metrics.incr("llm_output_tokens", usage.output_tokens)
+        metrics.incr("llm_cache_read_tokens", getattr(usage, "cache_read_input_tokens", None) or 0)
+        metrics.incr("llm_cache_write_tokens", getattr(usage, "cache_creation_input_tokens", None) or 0)
+
+    @staticmethod
+    def _backoff(attempt: int, error: Exception) -> float:
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_BACKOFF_SECONDS)
+            except ValueError:
+                pass
+        return min(settings.llm_retry_base_seconds * 2 ** attempt, MAX_BACKOFF_SECONDS) * random.uniform(0.5, 1.0)
+
+    async def create_message(self, *, estimated_tokens: int, **kwargs):
+        """
+        messages.create on the prompt caching beta, so callers can set
+        cache_control breakpoints, rate limited by the buckets. estimated_tokens (input + max_tokens) is
+        charged up front and corrected from the response's usage.
+        """
+        attempt = 0
+        while True:
+            await self._acquire(estimated_tokens)
+            try:
+                message = await self.client.beta.prompt_caching.messages.create(**kwargs)
+            except (anthropic.APIStatusError, anthropic.APIConnectionError) as e:
+                status = getattr(e, "status_code", None)
+                if not _retryable(status):
+                    raise
+                if attempt >= settings.llm_max_retries:
+                    metrics.incr("llm_failures")
+                    raise
+                delay = self._backoff(attempt, e)
+                metrics.incr(f"llm_retries_{status or 'connection'}")
+                logger.warning("Claude request failed (%s); retry %d in %.1fs", status or e, attempt + 1, delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            metrics.incr("llm_requests")
+            self._settle(estimated_tokens, message.usage)
+            return message
+
+    async def close(self) -> None:
+        await self.http_client.aclose()
+
+
+_client: LLMClient | None = None
+
+
+def get_llm_client() -> LLMClient:
+    global _client
+    if _client is None:
+        _client = LLMClient()
+    return _client
+
+
+async def close_llm_client() -> None:
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.close()
@@ -0,0 +1,34 @@
+"""
+In-process counters for operational metrics.
+
+Values are per process (API and standalone workers each keep their own) and
+reset on restart. Exposed to admins via GET /admin/metrics.
+"""
+
+import threading
+from collections import defaultdict
+
+_lock = threading.Lock()
+_counters: dict[str, int] = defaultdict(int)
+
+
+def incr(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] += amount
+
+
+def get(name: str) -> int:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def ratio(hits: str, misses: str) -> float | None:
+    """Hit rate for a hit/miss counter pair, or None before any lookups."""
+    with _lock:
+        h, m = _counters.get(hits, 0), _counters.get(misses, 0)
+    return round(h / (h + m), 4) if h + m else None
+
+
+def snapshot() -> dict[str, int]:
+    with _lock:
+        return dict(sorted(_counters.items()))
@@ -0,0 +1,180 @@
+"""
+Near-duplicate detection for uploaded documents (MinHash + LSH).
+
+A re-printed discharge or an emailed copy of the same visit has different
+bytes, so the content-hash cache misses it and the review step would save
+its medications and vaccines a second time. Instead, each PDF's normalized
+text is cut into word shingles and summarized as a NUM_PERM-value MinHash
+signature; the fraction of equal values estimates the Jaccard similarity
+of two documents' shingle sets. The signature uses one-permutation
+hashing: each shingle hash lands in one of NUM_PERM bins and each bin
+keeps its minimum, with empty bins filled from the next non-empty one
+(rotation densification). That is a single pass over the shingles rather
+than NUM_PERM, which matters for 50-page PDFs in pure Python.
+
+Signatures are split into BANDS bands of ROWS values, and each band is
+hashed into a bucket row scoped to the pet (DocumentSignatureBucket).
+Documents sharing any bucket are candidates; with 16 bands of 8 rows,
+pairs above ~0.85 similarity almost always share one and pairs below
+~0.5 rarely do. Candidates are confirmed against the full signature and
+near_duplicate_threshold.
+
+Scanned PDFs and images have no text layer before the LLM runs, so they
+get no signature and are never flagged here.
+"""
+
+import hashlib
+import re
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.document import Document, ExtractionStatus
+from app.models.document_signature import DocumentSignature, DocumentSignatureBucket
+from app.services.parsers.base import timed
+from app.services.pdf_parser import TextLayer, extract_text, has_useful_data
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 5
+# Fewer shingles than this (a near-empty text layer) gives no signature
+MIN_SHINGLES = 20
+
+_BIN_BITS = NUM_PERM.bit_length() - 1  # NUM_PERM is a power of two
+_EMPTY = 1 << (64 - _BIN_BITS)  # above any in-bin value
+# Offset per bin a densified value is borrowed across, so a borrowed value
+# never equals a real one in another document's same bin
+_DENSIFY_STEP = _EMPTY
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class SignedText:
+    """Parser-pool result: the PDF's text layer and its signature (None if too little text)."""
+    layer: TextLayer
+    signature: list[int] | None
+    shingle_count: int
+    timings: dict[str, float]
+    sign_seconds: float
+
+
+def shingles(text: str) -> set[int]:
+    """64-bit hashes of the text's overlapping SHINGLE_WORDS-word runs, ignoring case, punctuation and layout."""
+    words = _WORD.findall(text.lower())
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + SHINGLE_WORDS]).encode(), digest_size=8).digest(), "big")
+        for i in range(max(len(words) - SHINGLE_WORDS + 1, 0))
+    }
+
+
+def minhash(hashes: set[int]) -> list[int] | None:
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    mask = NUM_PERM - 1
+    bins = [_EMPTY] * NUM_PERM
+    for x in hashes:
+        b, v = x & mask, x >> _BIN_BITS
+        if v < bins[b]:
+            bins[b] = v
+    signature = []
+    for i in range(NUM_PERM):
+        j = i
+        while bins[j % NUM_PERM] == _EMPTY:
+            j += 1
+        signature.append(bins[j % NUM_PERM] + (j - i) * _DENSIFY_STEP)
+    return signature
+
+
+def band_buckets(signature: list[int]) -> list[str]:
+    buckets = []
+    for band in range(BANDS):
+        rows = ",".join(map(str, signature[band * ROWS:(band + 1) * ROWS]))
+        buckets.append(f"{band:02d}:{hashlib.blake2b(rows.encode(), digest_size=8).hexdigest()}")
+    return buckets
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of the two documents' shingle sets."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def read_and_sign(file_path: str) -> SignedText:
+    """
+    Parser-pool task: extract the PDF's text layer and sign it. The layer
+    is handed on to pdf_parser.parse_text_layer, so the PDF is read once.
+    """
+    timings: dict[str, float] = {}
+    layer = timed(timings, extract_text, file_path)
+    started = time.perf_counter()
+    hashes = shingles(layer.full_text)
+    signature = minhash(hashes)
+    return SignedText(layer, signature, len(hashes), timings, time.perf_counter() - started)
+
+
+async def index_signature(
+    db: AsyncSession, pet_id: int, document_id: int, signature: list[int], shingle_count: int
+) -> None:
+    """Add (or replace, on a retried job) the document's signature and buckets. The caller commits."""
+    await db.execute(delete(DocumentSignatureBucket).where(DocumentSignatureBucket.document_id == document_id))
+    await db.execute(delete(DocumentSignature).where(DocumentSignature.document_id == document_id))
+    db.add(DocumentSignature(
+        document_id=document_id, pet_id=pet_id, signature=signature, shingle_count=shingle_count
+    ))
+    await db.execute(
+        insert(DocumentSignatureBucket),
+        [{"document_id": document_id, "pet_id": pet_id, "bucket": b} for b in band_buckets(signature)],
+    )
+
+
+async def find_near_duplicate(
+    db: AsyncSession, pet_id: int, document_id: int, signature: list[int]
+) -> tuple[Document, float] | None:
+    """
+    The pet's earlier document most similar to `signature`, if at least
+    near_duplicate_threshold. Completed documents win ties, so their
+    extraction can be reused.
+    """
+    candidate_ids = (await db.execute(
+        select(DocumentSignatureBucket.document_id)
+        .where(
+            DocumentSignatureBucket.pet_id == pet_id,
+            DocumentSignatureBucket.bucket.in_(band_buckets(signature)),
+            DocumentSignatureBucket.document_id != document_id,
+        )
+        .distinct()
+    )).scalars().all()
+    if not candidate_ids:
+        return None
+
+    rows = (await db.execute(
+        select(Document, DocumentSignature.signature)
+        .join(DocumentSignature, DocumentSignature.document_id == Document.id)
+        .where(Document.id.in_(candidate_ids))
+    )).all()
+    scored = [(similarity(signature, other), doc) for doc, other in rows]
+    scored = [(score, doc) for score, doc in scored if score >= settings.near_duplicate_threshold]
+    if not scored:
+        return None
+    score, doc = max(scored, key=lambda s: (s[0], reusable_extraction(s[1]) is not None, -s[1].id))
+    return doc, score
+
+
+async def find_exact_duplicate(db: AsyncSession, pet_id: int, document_id: int, content_hash: str) -> int | None:
+    """The pet's earliest other document with the same bytes."""
+    return (await db.execute(
+        select(Document.id)
+        .where(Document.pet_id == pet_id, Document.content_hash == content_hash, Document.id != document_id)
+        .order_by(Document.id)
+        .limit(1)
+    )).scalar_one_or_none()
+
+
+def reusable_extraction(doc: Document) -> dict | None:
+    if doc.extraction_status == ExtractionStatus.COMPLETED and has_useful_data(doc.extracted_data):
+        return doc.extracted_data
+    return None
@@ -0,0 +1,130 @@
+"""
+Page triage: find the pages of a PDF that aren't worth parsing or sending to Claude.
+
+Scanned uploads often carry the blank backs of pages, a cover sheet
+repeated between visits, or the same page scanned twice. Each page read
+for the text layer is rendered in grayscale at RENDER_DPI and checked in
+order:
+
+- blank: no text layer, and at most page_blank_max_ink of the pixels
+  inside the margins (where scanner edges and punch holes show) are darker
+  than INK_LEVEL;
+- duplicate: its dHash is within page_duplicate_max_distance bits of an
+  earlier kept page's, and both have the same text layer (or none).
+
+The hash is taken over the inked region only, so two mostly empty pages
+with different content aren't matched on their shared white space. A
+re-scan that shifted or rotated the page is usually not caught; the
+defaults lean towards keeping a page.
+
+Skipped pages stay in the stored text layer under their own page
+numbers. The local parser reads them as empty and they are never sent to
+the LLM fallback. Rendering uses pdfplumber's page images (pdfium).
+"""
+
+import time
+from dataclasses import dataclass, field
+
+import pdfplumber
+from PIL import Image
+
+RENDER_DPI = 72
+# Grayscale values below this count as ink
+INK_LEVEL = 128
+# Fraction of each edge left out of the ink count
+MARGIN = 0.05
+HASH_SIZE = 16  # 16x16 = 256-bit dHash
+
+_INK_MASK = [255 if v < INK_LEVEL else 0 for v in range(256)]
+
+
+@dataclass
+class PageTriage:
+    """Which of a PDF's first `pages` pages to skip, and why. Page numbers are 0-based."""
+    pages: int
+    blank: list[int] = field(default_factory=list)
+    duplicates: dict[int, int] = field(default_factory=dict)  # page -> earlier page it repeats
+    seconds: float = 0.0
+
+    @property
+    def skipped(self) -> set[int]:
+        return set(self.blank) | self.duplicates.keys()
+
+    @property
+    def kept(self) -> list[int]:
+        skipped = self.skipped
+        return [i for i in range(self.pages) if i not in skipped]
+
+    def stats(self) -> dict:
+        """JSON form, stored as DocumentText.page_triage."""
+        return {
+            "pages": self.pages,
+            "blank": self.blank,
+            "duplicates": [[page, of] for page, of in self.duplicates.items()],
+            "seconds": round(self.seconds, 4),
+        }
+
+    @classmethod
+    def from_stats(cls, stats: dict | None) -> "PageTriage | None":
+        if not stats:
+            return None
+        return cls(
+            pages=stats.get("pages", 0),
+            blank=list(stats.get("blank") or []),
+            duplicates={page: of for page, of in stats.get("duplicates") or []},
+            seconds=stats.get("seconds", 0.0),
+        )
+
+
+def ink_coverage(image: Image.Image) -> float:
+    """Fraction of a grayscale image's pixels, margins excluded, darker than INK_LEVEL."""
+    width, height = image.size
+    dx, dy = int(width * MARGIN), int(height * MARGIN)
+    inner = image.crop((dx, dy, width - dx, height - dy))
+    pixels = inner.width * inner.height
+    return sum(inner.histogram()[:INK_LEVEL]) / pixels if pixels else 0.0
+
+
+def dhash(image: Image.Image) -> int:
+    """Difference hash of a grayscale image's inked region: HASH_SIZE rows of left/right brightness steps."""
+    box = image.point(_INK_MASK).getbbox()
+    if box:
+        image = image.crop(box)
+    small = image.resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BOX)
+    px = small.load()
+    bits = 0
+    for y in range(HASH_SIZE):
+        for x in range(HASH_SIZE):
+            bits = bits << 1 | (px[x, y] > px[x + 1, y])
+    return bits
+
+
+def triage_pages(
+    file_path: str, texts: list[str], blank_max_ink: float, duplicate_max_distance: int
+) -> PageTriage:
+    """
+    Parser-pool task: classify the PDF's first len(texts) pages, given each
+    page's text layer (TextLayer.pages).
+    """
+    started = time.perf_counter()
+    result = PageTriage(pages=len(texts))
+    kept: list[tuple[int, int, str]] = []  # (page, hash, words)
+    with pdfplumber.open(file_path) as pdf:
+        for i, page in enumerate(pdf.pages[:len(texts)]):
+            try:
+                image = page.to_image(resolution=RENDER_DPI).original.convert("L")
+            finally:
+                page.close()
+            words = " ".join(texts[i].split())
+            if not words and ink_coverage(image) <= blank_max_ink:
+                result.blank.append(i)
+                continue
+            page_hash = dhash(image)
+            for other, other_hash, other_words in kept:
+                if words == other_words and (page_hash ^ other_hash).bit_count() <= duplicate_max_distance:
+                    result.duplicates[i] = other
+                    break
+            else:
+                kept.append((i, page_hash, words))
+    result.seconds = time.perf_counter() - started
+    return result
@@ -0,0 +1,153 @@
+"""
+Process pool for CPU-bound PDF parsing.
+
+pdfplumber and the section regexes hold the GIL for hundreds of milliseconds
+per document, so parsing runs in separate processes instead of on the event
+loop. Child processes are recycled after a fixed number of tasks to cap
+pdfplumber's memory growth, and a document that overruns its time budget
+gets its worker killed and replaced.
+
+ProcessPoolExecutor can't lose a single worker: once any child dies, every
+task in flight fails with BrokenProcessPool. So a timeout replaces the
+whole pool, and the other documents it was parsing are resubmitted to the
+new one. Those collateral retries don't use up the one retry a document
+gets when the pool breaks under it for its own reasons (a crash or an OOM
+kill). Metrics: parser_pool.timeouts, parser_pool.collateral_retries and
+parser_pool.crash_retries.
+
+When the pool is disabled (PARSER_POOL_ENABLED=false, e.g. under tests)
+parsing runs in-process on a thread instead. The caller still gets
+ParseTimeoutError after the time budget, but a thread can't be killed,
+so a runaway parse keeps its CPU until it ends on its own.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable
+
+from app.config import settings
+from app.services import metrics
+
+logger = logging.getLogger("uvicorn.error")
+
+# Resubmissions after other documents' timeouts recycled the pool, before giving up
+MAX_COLLATERAL_RETRIES = 3
+
+
+class ParseTimeoutError(Exception):
+    """Raised when a document exceeds the parser time budget."""
+
+
+class ParserPool:
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_tasks_per_child: int | None = None,
+        timeout: float | None = None,
+    ):
+        self.workers = workers or settings.parser_pool_workers or os.cpu_count() or 1
+        self.max_tasks_per_child = max_tasks_per_child or settings.parser_pool_max_tasks_per_child
+        self.timeout = timeout or settings.parser_timeout_seconds
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # max_tasks_per_child needs a non-fork start method
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+        return self._executor
+
+    def _recycle(self) -> None:
+        """Kill every worker (including a hung one) and start fresh on next use."""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        for process in _worker_processes(executor):
+            process.terminate()
+        # Not cancel_futures: a cancelled future reaches its caller as CancelledError, which
+        # reads as the caller's own cancellation. Left queued, they fail with BrokenProcessPool
+        # once the pool notices its dead workers, and run() resubmits them.
+        executor.shutdown(wait=False)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: float | None = None) -> Any:
+        loop = asyncio.get_running_loop()
+        budget = timeout or self.timeout
+        collateral = crashed = 0
+        while True:
+            executor = self._get_executor()
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(executor, partial(fn, *args)), budget)
+            except asyncio.TimeoutError:
+                logger.warning("Parser exceeded %.0fs budget; recycling parser pool", budget)
+                metrics.incr("parser_pool.timeouts")
+                self._recycle()
+                raise ParseTimeoutError(f"Parsing exceeded {budget:.0f}s")
+            except BrokenProcessPool:
+                if self._executor is not executor:
+                    # Another document's timeout recycled the pool under us
+                    collateral += 1
+                    metrics.incr("parser_pool.collateral_retries")
+                    if collateral > MAX_COLLATERAL_RETRIES:
+                        raise
+                else:
+                    # A worker died on its own; this document may be the cause, so retry once
+                    crashed += 1
+                    metrics.incr("parser_pool.crash_retries")
+                    self._recycle()
+                    if crashed > 1:
+                        raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def _worker_processes(executor: ProcessPoolExecutor) -> list:
+    """
+    The executor's child processes. ProcessPoolExecutor has no public way to
+    reach them; _processes (pid -> Process) is an implementation detail.
+    Without it, shutdown alone still replaces the pool, but a hung child
+    keeps running until its parse ends.
+    """
+    if not hasattr(executor, "_processes"):
+        logger.warning("ProcessPoolExecutor._processes is gone; hung parser workers won't be killed")
+        return []
+    return list((executor._processes or {}).values())  # None once the executor shut down
+
+
+_pool: ParserPool | None = None
+
+
+def get_parser_pool() -> ParserPool:
+    global _pool
+    if _pool is None:
+        _pool = ParserPool()
+    return _pool
+
+
+def shutdown_parser_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+async def run_parser(fn: Callable[..., Any], *args: Any, timeout: float | None = None) -> Any:
+    """Run a picklable, module-level parse function off the event loop."""
+    if not settings.parser_pool_enabled:
+        budget = timeout or settings.parser_timeout_seconds
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(fn, *args), budget)
+        except asyncio.TimeoutError:
+            logger.warning("In-process parse exceeded %.0fs budget; abandoning its thread", budget)
+            raise ParseTimeoutError(f"Parsing exceeded {budget:.0f}s")
+    return await get_parser_pool().run(fn, *args, timeout=timeout)
@@ -0,0 +1,38 @@
+"""
+Clinic-specific visit summary parsers.
+
+Each document is fingerprinted once (domains, all-caps section headers,
+lowercased text) and dispatched to the best-scoring registered format, so
+only that clinic's extractors run. Each parser splits the text into
+sections once (sections.py) and its extractors read only their own block.
+Unrecognized documents fall back to the generic parser, which runs every
+known extractor.
+
+To add a clinic: create a module here exposing FORMAT = ClinicFormat(...)
+and call register(FORMAT) below.
+"""
+
+from app.services.parsers import bond_vet, generic, veg
+from app.services.parsers.base import ClinicFormat, Fingerprint
+
+_registry: list[ClinicFormat] = []
+
+
+def register(fmt: ClinicFormat) -> None:
+    _registry.append(fmt)
+
+
+def detect_format(text: str) -> ClinicFormat:
+    fp = Fingerprint.from_text(text)
+    best, best_score = generic.FORMAT, 0
+    for fmt in _registry:
+        score = fmt.score(fp)
+        if score >= fmt.min_score and score > best_score:
+            best, best_score = fmt, score
+    return best
+
+
+register(bond_vet.FORMAT)
+register(veg.FORMAT)
+
+__all__ = ["ClinicFormat", "Fingerprint", "detect_format", "register"]
@@ -0,0 +1,67 @@
+"""Format fingerprinting and the clinic format descriptor used by the parser registry."""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, TypeVar
+
+from app.services.parsers import guard
+
+T = TypeVar("T")
+
+# Label length and count are capped (DNS allows 63 chars per label); unbounded,
+# a long run of "a-a-a..." or "a.a.a..." backtracks quadratically
+DOMAIN_RE = guard.compile(r"\b[\w-]{1,63}(?:\.[\w-]{1,63}){0,8}\.(?:com|net|org|vet|us)\b", re.IGNORECASE)
+# Leading all-caps run of a line, e.g. "IMMUNIZATIONS", "PROBLEMS LIST", "HOME CARE"
+HEADER_RE = guard.compile(r"^[ \t]*([A-Z]{3,}(?:[ /&][A-Z]{2,})*)", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Cheap features computed once per document and matched against every registered format."""
+    domains: frozenset[str]
+    headers: frozenset[str]
+    lower_text: str
+
+    @classmethod
+    def from_text(cls, text: str) -> "Fingerprint":
+        return cls(
+            domains=frozenset(d.lower() for d in DOMAIN_RE.findall(text)),
+            headers=frozenset(HEADER_RE.findall(text)),
+            lower_text=text.lower(),
+        )
+
+
+@dataclass(frozen=True)
+class ClinicFormat:
+    """
+    A clinic-specific parser plugin.
+
+    domains / keywords / headers are matched against the document fingerprint;
+    parse receives the full text (and an optional timings dict, see timed())
+    and returns the extracted_data dict.
+    """
+    name: str
+    parse: Callable[..., dict]
+    domains: frozenset[str] = field(default_factory=frozenset)
+    keywords: tuple[str, ...] = ()
+    headers: frozenset[str] = field(default_factory=frozenset)
+    min_score: int = 3
+
+    def score(self, fp: Fingerprint) -> int:
+        score = 3 * len(self.domains & fp.domains)
+        if any(k in fp.lower_text for k in self.keywords):
+            score += 2
+        score += len(self.headers & fp.headers)
+        return score
+
+
+def timed(timings: dict[str, float] | None, fn: Callable[..., T], *args) -> T:
+    """Call fn(*args), adding its wall time in seconds to timings[fn.__name__] when timings is given."""
+    if timings is None:
+        return fn(*args)
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        timings[fn.__name__] = timings.get(fn.__name__, 0.0) + time.perf_counter() - start
@@ -0,0 +1,233 @@
+"""Bond Vet visit summaries (bondvet.com)."""
+
+import re
+
+from app.services.parsers import guard
+from app.services.parsers.base import ClinicFormat, timed
+from app.services.parsers.common import (
+    extract_allergies,
+    extract_pet_info,
+    extract_provider,
+    extract_visit_date,
+    extract_vitals,
+    parse_date_str,
+)
+from app.services.parsers.sections import Sections, split_sections
+
+# Section terminators, searched forward from the section heading
+_PARASITE_END_RE = guard.compile(r"\n(?:Medications/Supplements|[A-Z]{2,})")
+_SUPPLEMENTS_END_RE = guard.compile(r"\n(?:Known Allergies|Current Diet|OWNER|[A-Z]{3,}\n)")
+_IMMUNIZATIONS_END_RE = guard.compile(r"\n(?:OTHER PRODUCTS|PLAN|[A-Z]{3,}\s)")
+_PROBLEMS_END_RE = guard.compile(r"\n(?:ORDERS|IMMUNIZATIONS|PLAN)")
+# " - May 24, 2025" after a problem name. Searched from index 1 and the name
+# taken as everything before it: the same result as (.+?)\s*[-–]\s*(date),
+# whose lazy prefix backtracks quadratically on long lines with no date.
+_PROBLEM_DATE_RE = guard.compile(r"\s*[-–]\s*(\w+\s+\d{1,2},?\s+\d{4})")
+
+
+def extract_clinic(text: str) -> str | None:
+    if "bondvet.com" in text.lower() or "bond vet" in text.lower():
+        m = guard.search(r"(Bond Vet\s*[-–]\s*\w+)", text, re.IGNORECASE)
+        if m:
+            return m.group(1).strip()
+        # Try from location
+        m = guard.search(r"SOMERVILLE|Somerville|somerville", text)
+        if m:
+            return "Bond Vet - Somerville"
+        return "Bond Vet"
+    return None
+
+
+def extract_parasite_preventives(sections: Sections, provider: str | None = None) -> list[dict]:
+    """"Parasite Preventive Medications" section."""
+    meds = []
+    block = sections.body("PARASITE_PREVENTIVES", _PARASITE_END_RE)
+    if block:
+        block = block.strip()
+        for line in block.split("\n"):
+            line = line.strip()
+            if line and not line.startswith("Medications") and len(line) > 3:
+                # Extract strength in parens
+                strength_m = guard.search(r"\((.+?)\)", line)
+                drug = guard.sub(r"\s*\(.+?\)", "", line).strip()
+                if drug:
+                    meds.append({
+                        "drug_name": drug,
+                        "strength": strength_m.group(1) if strength_m else None,
+                        "directions": "Per label - parasite preventive",
+                        "indication": "Parasite prevention",
+                        "start_date": None,
+                        "stop_date": None,
+                        "prescriber": provider,
+                        "pharmacy": None,
+                        "confidence": 0.9,
+                    })
+    return meds
+
+
+def extract_supplements(sections: Sections) -> list[dict]:
+    """"Medications/Supplements" section."""
+    meds = []
+    body = sections.body("SUPPLEMENTS", _SUPPLEMENTS_END_RE)
+    # the rest of the heading line is a column label, not content
+    block = body.partition("\n")[2].strip() if body else ""
+    if block:
+        # Check for "Medications: No" - skip if no active meds
+        if not guard.match(r"Medications:\s*No\b", block):
+            # Try to find supplement names
+            supp_lines = block.split("\n")
+            current_supp = None
+            details = []
+            for line in supp_lines:
+                line = line.strip()
+                if not line or line.startswith("Medications: No"):
+                    continue
+                # Lines with colons followed by content are detail lines
+                if guard.match(r"^(Hip|Skin|Heart|Immune|Cognitive|Liver|Urinary|Digestive)", line):
+                    details.append(line)
+                elif "Supplement" in line or "in 1" in line or "Multi" in line:
+                    current_supp = line
+                elif len(line) > 10 and ":" in line:
+                    details.append(line)
+
+            if current_supp:
+                indication = "; ".join(details) if details else None
+                meds.append({
+                    "drug_name": current_supp,
+                    "strength": None,
+                    "directions": "Per label",
+                    "indication": indication,
+                    "start_date": None,
+                    "stop_date": None,
+                    "prescriber": None,
+                    "pharmacy": None,
+                    "confidence": 0.85,
+                })
+    return meds
+
+
+def extract_immunizations(sections: Sections, visit_date: str | None, clinic: str | None) -> list[dict]:
+    """IMMUNIZATIONS table."""
+    vaccines = []
+
+    block = sections.body("IMMUNIZATIONS", _IMMUNIZATIONS_END_RE)
+    if block:
+        block = block.strip()
+        # Skip header line that has TYPE DETAILS etc
+        lines = [l for l in block.split("\n") if l.strip() and not guard.match(r"TYPE\s+DETAILS", l.strip())]
+
+        # Parse vaccine entries - they span multiple lines
+        i = 0
+        current_vaccine = None
+        while i < len(lines):
+            line = lines[i].strip()
+            # Skip provider lines
+            if line.startswith("Provider:"):
+                i += 1
+                continue
+
+            # Check if this is a vaccine name line (contains "Vaccine" or known vaccine names)
+            if any(v in line for v in ["Vaccine", "Leptospirosis", "Lyme", "Influenza", "Bordetella",
+                                        "Rabies", "DAPP", "DHPP", "FVRCP", "FeLV"]):
+                # Extract date
+                date_match = guard.search(r"(\w{3}\s+\d{2},?\s+\d{4})", line)
+
+                # Clean the vaccine name
+                name = line
+                # Remove manufacturer info
+                name = guard.sub(r"Manufacturer:.*", "", name).strip()
+                # Remove date info
+                name = guard.sub(r"\w{3}\s+\d{2},?\s+\d{4}", "", name).strip()
+
+                if current_vaccine and name and not name.startswith("Provider"):
+                    # This is a new vaccine, save the previous one
+                    vaccines.append(current_vaccine)
+
+                if name and not name.startswith("Provider"):
+                    vax_date = parse_date_str(date_match.group(1)) if date_match else visit_date
+                    current_vaccine = {
+                        "name": name,
+                        "date_given": vax_date,
+                        "clinic": clinic,
+                        "lot_number": None,
+                        "next_due_date": None,
+                        "confidence": 0.9,
+                    }
+            elif current_vaccine and guard.search(r"(H3N[28]|Bivalent)", line):
+                # Continuation of vaccine name
+                current_vaccine["name"] += " " + line.strip()
+                current_vaccine["name"] = guard.sub(r"Manufacturer:.*", "", current_vaccine["name"]).strip()
+                current_vaccine["name"] = guard.sub(r"\w{3}\s+\d{2},?\s+\d{4}", "", current_vaccine["name"]).strip()
+
+            i += 1
+
+        if current_vaccine:
+            vaccines.append(current_vaccine)
+
+    # Clean up vaccine names
+    for v in vaccines:
+        v["name"] = guard.sub(r"\s+", " ", v["name"]).strip()
+        # Remove trailing dates or extra text
+        v["name"] = guard.sub(r"\s*\d{4}$", "", v["name"]).strip()
+        # Remove "Provider: ..."
+        v["name"] = guard.sub(r"\s*Provider:.*", "", v["name"]).strip()
+
+    return vaccines
+
+
+def extract_problems_list(sections: Sections) -> list[dict]:
+    """"PROBLEMS LIST" section."""
+    problems = []
+    block = sections.body("PROBLEMS_LIST", _PROBLEMS_END_RE)
+    if block:
+        block = block.strip()
+        for line in block.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            # "Lameness - May 24, 2025"
+            date_m = _PROBLEM_DATE_RE.search(line, 1)
+            if date_m:
+                problems.append({
+                    "condition_name": line[:date_m.start()].strip(),
+                    "onset_date": parse_date_str(date_m.group(1)),
+                    "is_active": True,
+                    "notes": None,
+                    "confidence": 0.9,
+                })
+            elif len(line) > 2:
+                problems.append({
+                    "condition_name": line,
+                    "onset_date": None,
+                    "is_active": True,
+                    "notes": None,
+                    "confidence": 0.8,
+                })
+    return problems
+
+
+def parse(text: str, timings: dict[str, float] | None = None) -> dict:
+    visit_date = timed(timings, extract_visit_date, text)
+    clinic = timed(timings, extract_clinic, text)
+    provider = timed(timings, extract_provider, text)
+    sections = timed(timings, split_sections, text)
+    return {
+        "medications": (
+            timed(timings, extract_parasite_preventives, sections, provider)
+            + timed(timings, extract_supplements, sections)
+        ),
+        "vaccines": timed(timings, extract_immunizations, sections, visit_date, clinic),
+        "vitals": timed(timings, extract_vitals, text, visit_date),
+        "problems": timed(timings, extract_problems_list, sections),
+        "allergies": timed(timings, extract_allergies, text),
+        "pet_info": timed(timings, extract_pet_info, text),
+    }
+
+
+FORMAT = ClinicFormat(
+    name="bond_vet",
+    parse=parse,
+    domains=frozenset({"bondvet.com"}),
+    keywords=("bond vet",),
+    headers=frozenset({"PROBLEMS LIST", "IMMUNIZATIONS", "OTHER PRODUCTS"}),
+)
@@ -0,0 +1,239 @@
+"""Field extractors shared by every clinic format (dates, provider, vitals, allergies, pet info)."""
+
+import re
+from datetime import datetime
+
+from app.services.parsers import guard
+from app.services.parsers.sections import read_until
+
+_NO_ALLERGIES_RE = guard.compile(r"(?:No reported allergies|Allergies:\s*None|No known allergies)", re.IGNORECASE)
+# Inline label ("Allergies: ..."), so it is searched for rather than tokenized as a heading
+_ALLERGIES_LABEL_RE = guard.compile(r"(?:Known )?Allergies[:\s]+")
+_ALLERGIES_END_RE = guard.compile(r"\n(?:Current Diet|[A-Z]{2,})")
+_WORD_RUN_RE = guard.compile(r"[\w\s]+")
+_BREED_WORD_RE = guard.compile(r"Mix|Breed|Terrier|Retriever|Shepherd|Poodle|Bulldog")
+# "Provider: Dr. Name (...)". Same results (after strip) as the plain
+# Provider:\s*(Dr\.\s*[\w\s]+?)(?:\s*\(|$|\n), whose overlapping \s runs
+# made a long stretch of whitespace cubic; here every run is taken whole.
+_PROVIDER_LABEL_RE = guard.compile(r"""
+    Provider:\s*+
+    (Dr\.(?:
+        \s*+\w(?:[^\S\n]*+\w)*+(?=\s*\(|[^\S\n]*+(?:\n|$))  # words up to "(", newline or end
+        | (?=\s+(?:\(|\Z)|\s\s*?\n)                       # no name: "Dr." alone
+    ))
+""", re.VERBOSE, name="provider label")
+# "Dr. Name" up to the line end or the clinic location; \s++ keeps the gap
+# after the first word from being re-split on every failed attempt, and the
+# other two branches are the matches that re-splitting used to find.
+_PROVIDER_RE = guard.compile(
+    r"(Dr\.\s*+\w++(?:\s++[\w\s]+?(?=\n|Peabody|Somerville|$)|\s\s++(?=Peabody|Somerville|$)|\s\s+(?=\n)))",
+    name="provider",
+)
+
+
+def parse_date_str(date_str: str) -> str | None:
+    """Parse various date formats to YYYY-MM-DD."""
+    date_str = date_str.strip().replace(",", "")
+    for fmt in ["%B %d %Y", "%b %d %Y", "%m/%d/%Y", "%m/%d/%y"]:
+        try:
+            return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def extract_visit_date(text: str) -> str | None:
+    """Extract visit date from text."""
+    # "Date Generated: Feb 09, 2026"
+    m = guard.search(r"Date Generated:\s*(\w+\s+\d{1,2},?\s+\d{4})", text)
+    if m:
+        return parse_date_str(m.group(1))
+
+    # "Visit Date: December 19, 2025"
+    m = guard.search(r"Visit Date:\s*(\w+\s+\d{1,2},?\s+\d{4})", text)
+    if m:
+        return parse_date_str(m.group(1))
+
+    # "February 9, 2026 at 12:55 pm"
+    # \b and (?<!\d) below only skip starts inside a run, where a leftmost
+    # match never begins, so a long unbroken run is scanned once, not per start
+    m = guard.search(r"\b(\w+\s+\d{1,2},?\s+\d{4})\s+at\s+\d", text)
+    if m:
+        return parse_date_str(m.group(1))
+
+    return None
+
+
+def extract_provider(text: str) -> str | None:
+    """Extract provider/doctor name."""
+    m = _PROVIDER_LABEL_RE.search(text)
+    if m:
+        return m.group(1).strip()
+
+    m = _PROVIDER_RE.search(text)
+    if m:
+        name = m.group(1).strip()
+        # Clean trailing words that aren't part of the name
+        name = guard.sub(r"\s+(Peabody|Somerville|Visit|Discharge).*", "", name)
+        return name
+
+    return None
+
+
+def extract_vitals(text: str, visit_date: str | None) -> list[dict]:
+    """Extract vitals (weight, heart rate, temp, etc.) from text."""
+    vitals_data = {
+        "recorded_date": visit_date,
+        "weight_kg": None,
+        "weight_lbs": None,
+        "temperature_f": None,
+        "heart_rate_bpm": None,
+        "respiratory_rate": None,
+        "notes": [],
+        "confidence": 0.9,
+    }
+
+    found_any = False
+
+    # Weight in kg
+    m = guard.search(r"Weight\s+(\d+\.?\d*)\s*kg", text, re.IGNORECASE)
+    if m:
+        vitals_data["weight_kg"] = float(m.group(1))
+        vitals_data["weight_lbs"] = round(float(m.group(1)) * 2.20462, 1)
+        found_any = True
+
+    # Weight in lbs
+    if not vitals_data["weight_kg"]:
+        m = guard.search(r"Weight\s+(\d+\.?\d*)\s*(?:lbs?|pounds?)", text, re.IGNORECASE)
+        if m:
+            vitals_data["weight_lbs"] = float(m.group(1))
+            vitals_data["weight_kg"] = round(float(m.group(1)) / 2.20462, 1)
+            found_any = True
+
+    # Also check "31.7 kg" pattern in pet info line
+    if not vitals_data["weight_kg"]:
+        m = guard.search(r"(?<!\d)(\d+\.?\d*)\s*kg\b", text)
+        if m:
+            vitals_data["weight_kg"] = float(m.group(1))
+            vitals_data["weight_lbs"] = round(float(m.group(1)) * 2.20462, 1)
+            found_any = True
+
+    # Heart rate
+    m = guard.search(r"Heart Rate\s+(\d+)\s*(?:bpm|BPM)", text, re.IGNORECASE)
+    if m:
+        vitals_data["heart_rate_bpm"] = int(m.group(1))
+        found_any = True
+
+    # Respiratory rate
+    m = guard.search(r"Respiratory Rate\s+(\d+)\s*(?:bpm|BPM)?", text, re.IGNORECASE)
+    if m:
+        val = m.group(1)
+        if val.isdigit() and int(val) < 200:  # Sanity check
+            vitals_data["respiratory_rate"] = int(val)
+            found_any = True
+
+    # Temperature
+    m = guard.search(r"Temperature\s+(\d+\.?\d*)\s*°?F", text, re.IGNORECASE)
+    if m:
+        vitals_data["temperature_f"] = float(m.group(1))
+        found_any = True
+
+    # BCS
+    bcs_m = guard.search(r"BCS\s+(\d+)[/\s]*(?:\(?\d+-?\d*\)?|/\d+)", text)
+    if bcs_m:
+        vitals_data["notes"].append(f"BCS: {bcs_m.group(0).strip()}")
+
+    # Mucous Membranes
+    mm_m = guard.search(r"Mucous Membrane[s]?\s+(\w+)", text, re.IGNORECASE)
+    if mm_m:
+        vitals_data["notes"].append(f"Mucous Membranes: {mm_m.group(1)}")
+
+    # CRT
+    crt_m = guard.search(r"(?:CRT|Capillary Refill Time)\s+([<>]?\d+\s*(?:sec|Seconds?)?)", text, re.IGNORECASE)
+    if crt_m:
+        vitals_data["notes"].append(f"CRT: {crt_m.group(1).strip()}")
+
+    # Mentation/Attitude
+    att_m = guard.search(r"(?:Attitude|Mentation)\s+(\w+)", text, re.IGNORECASE)
+    if att_m:
+        vitals_data["notes"].append(f"Attitude: {att_m.group(1)}")
+
+    if not found_any:
+        return []
+
+    vitals_data["notes"] = ". ".join(vitals_data["notes"]) if vitals_data["notes"] else None
+
+    return [vitals_data]
+
+
+def extract_allergies(text: str) -> list[dict]:
+    """Extract allergies from text."""
+    allergies = []
+
+    # Check for "No reported allergies" or "Allergies: None Recorded"
+    if _NO_ALLERGIES_RE.search(text):
+        return []
+
+    # "Known Allergies:" section
+    label = _ALLERGIES_LABEL_RE.search(text)
+    if label and label.end() < len(text):
+        block = (read_until(text, label.end(), _ALLERGIES_END_RE) or "").strip()
+        if "none" in block.lower() or "no reported" in block.lower():
+            return []
+
+        for line in block.split("\n"):
+            line = line.strip()
+            if line and "none" not in line.lower() and len(line) > 2:
+                allergies.append({
+                    "substance_name": line,
+                    "allergy_type": "Drug",
+                    "reaction_desc": None,
+                    "severity": None,
+                    "confidence": 0.7,
+                })
+
+    return allergies
+
+
+def extract_pet_info(text: str) -> dict:
+    """Extract pet identification info."""
+    info = {
+        "name": None,
+        "species": None,
+        "breed": None,
+        "weight": None,
+        "confidence": 0.9,
+    }
+
+    # "Patient: Hugo"
+    m = guard.search(r"Patient:\s*(\w+)", text)
+    if m:
+        info["name"] = m.group(1)
+
+    # Species from "Canine" or "Dog" or "Cat" or "Feline"
+    if guard.search(r"\bCanine\b|\bDog\b", text, re.IGNORECASE):
+        info["species"] = "Dog"
+    elif guard.search(r"\bFeline\b|\bCat\b", text, re.IGNORECASE):
+        info["species"] = "Cat"
+
+    # Breed
+    m = guard.search(r"Breed:\s*(.+?)(?:\n|$|\|)", text)
+    if m:
+        info["breed"] = m.group(1).strip()
+    else:
+        # "Australian Cattle Dog Mix": the first run of words/whitespace with a
+        # breed word after its first character. Scanned run by run rather than
+        # with one [\w\s]+...[\w\s]* pattern, which backtracks quadratically.
+        for run in _WORD_RUN_RE.finditer(text):
+            if _BREED_WORD_RE.search(run.group(), 1):
+                breed = run.group().strip()
+                if len(breed) < 60:
+                    info["breed"] = breed
+                break
+
+    # Weight
+    m = guard.search(r"(?<!\d)(\d+\.?\d*)\s*kg", text, re.IGNORECASE)
+    if m:
+        info["weight"] = f"{m.group(1)} kg"
+
+    return info
@@ -0,0 +1,44 @@
+"""Fallback for unrecognized formats: runs every known section extractor over one tokenization."""
+
+from app.services.parsers import bond_vet, veg
+from app.services.parsers.base import ClinicFormat, timed
+from app.services.parsers.common import (
+    extract_allergies,
+    extract_pet_info,
+    extract_provider,
+    extract_visit_date,
+    extract_vitals,
+)
+from app.services.parsers.sections import split_sections
+
+
+def extract_clinic(text: str) -> str | None:
+    return bond_vet.extract_clinic(text) or veg.extract_clinic(text)
+
+
+def parse(text: str, timings: dict[str, float] | None = None) -> dict:
+    visit_date = timed(timings, extract_visit_date, text)
+    clinic = timed(timings, extract_clinic, text)
+    provider = timed(timings, extract_provider, text)
+    sections = timed(timings, split_sections, text)
+
+    meds = timed(timings, bond_vet.extract_parasite_preventives, sections, provider)
+    meds += timed(timings, bond_vet.extract_supplements, sections)
+    meds += timed(timings, veg.extract_medications_section, sections, provider)
+    meds += timed(timings, veg.extract_home_care, sections, provider, meds)
+
+    problems = timed(timings, bond_vet.extract_problems_list, sections)
+    problems += timed(timings, veg.extract_differentials, sections, problems)
+    problems += timed(timings, veg.extract_presenting_complaint, sections, problems)
+
+    return {
+        "medications": meds,
+        "vaccines": timed(timings, bond_vet.extract_immunizations, sections, visit_date, clinic),
+        "vitals": timed(timings, extract_vitals, text, visit_date),
+        "problems": problems,
+        "allergies": timed(timings, extract_allergies, text),
+        "pet_info": timed(timings, extract_pet_info, text),
+    }
+
+
+FORMAT = ClinicFormat(name="generic", parse=parse)
@@ -0,0 +1,174 @@
+"""
+Wall-clock budget and per-pattern timing for the parser regexes.
+
+Parsers call guard.compile / guard.search / guard.sub ... where they would
+call the re module. Outside a budget() block these behave exactly like re.
+Inside one, every call first checks the deadline and raises
+ParseBudgetExceeded once it has passed, and its time is added to that
+pattern's PatternStats. A parse therefore stops at the next regex call
+after its budget runs out, instead of grinding through every remaining
+extractor.
+
+A single call that backtracks catastrophically can't be interrupted from
+Python; that case is bounded by the parser pool, which kills the worker
+at parser_timeout_seconds. benchmarks/parser_fuzz looks for such patterns
+ahead of time.
+"""
+
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+# A single call slower than this is worth a log line
+SLOW_CALL_SECONDS = 0.25
+NAME_LENGTH = 60
+
+
+class ParseBudgetExceeded(Exception):
+    """Raised at the first regex call after the parse budget has run out."""
+
+
+@dataclass
+class PatternStats:
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    max_input: int = 0  # length of the string searched by the slowest call
+
+
+@dataclass
+class Budget:
+    seconds: float | None
+    deadline: float | None
+    patterns: dict[str, PatternStats] = field(default_factory=dict)
+    slow_calls: list[tuple[str, float, int]] = field(default_factory=list)
+
+    def check(self) -> None:
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise ParseBudgetExceeded(f"Parsing exceeded its {self.seconds:.1f}s budget")
+
+    def record(self, name: str, elapsed: float, size: int) -> None:
+        stats = self.patterns.get(name)
+        if stats is None:
+            stats = self.patterns[name] = PatternStats()
+        stats.calls += 1
+        stats.seconds += elapsed
+        if elapsed > stats.max_seconds:
+            stats.max_seconds = elapsed
+            stats.max_input = size
+        if elapsed > SLOW_CALL_SECONDS:
+            self.slow_calls.append((name, elapsed, size))
+
+    def merge(self, other: "Budget") -> None:
+        for name, stats in other.patterns.items():
+            mine = self.patterns.setdefault(name, PatternStats())
+            mine.calls += stats.calls
+            mine.seconds += stats.seconds
+            if stats.max_seconds > mine.max_seconds:
+                mine.max_seconds, mine.max_input = stats.max_seconds, stats.max_input
+        self.slow_calls.extend(other.slow_calls)
+
+    def slowest(self, n: int = 10) -> dict[str, dict]:
+        """The n patterns with the most total time, for DocumentText.timings."""
+        top = sorted(self.patterns.items(), key=lambda item: item[1].seconds, reverse=True)[:n]
+        return {
+            name: {"calls": s.calls, "seconds": round(s.seconds, 4), "max_seconds": round(s.max_seconds, 4)}
+            for name, s in top
+        }
+
+
+_current: ContextVar[Budget | None] = ContextVar("parse_budget", default=None)
+
+
+@contextmanager
+def budget(seconds: float | None) -> Iterator[Budget]:
+    """
+    Time every guarded regex call in the block and stop it after `seconds`
+    (None = no limit). A nested budget's timings are added to the enclosing one.
+    """
+    state = Budget(seconds, time.perf_counter() + seconds if seconds else None)
+    token = _current.set(state)
+    try:
+        yield state
+    finally:
+        _current.reset(token)
+        parent = _current.get()
+        if parent is not None:
+            parent.merge(state)
+
+
+class Pattern:
+    """A compiled pattern whose calls are checked against, and timed into, the current budget."""
+
+    def __init__(self, pattern: str, flags: int = 0, name: str | None = None):
+        self.regex = re.compile(pattern, flags)
+        self.name = name or pattern[:NAME_LENGTH]
+
+    def _call(self, method, string: str, *args):
+        state = _current.get()
+        if state is None:
+            return method(string, *args)
+        state.check()
+        start = time.perf_counter()
+        try:
+            return method(string, *args)
+        finally:
+            state.record(self.name, time.perf_counter() - start, len(string))
+
+    def search(self, string: str, *args) -> re.Match | None:
+        return self._call(self.regex.search, string, *args)
+
+    def match(self, string: str, *args) -> re.Match | None:
+        return self._call(self.regex.match, string, *args)
+
+    def findall(self, string: str, *args) -> list:
+        return self._call(self.regex.findall, string, *args)
+
+    def sub(self, repl, string: str, count: int = 0) -> str:
+        return self._call(lambda s: self.regex.sub(repl, s, count), string)
+
+    def finditer(self, string: str, *args) -> Iterator[re.Match]:
+        """Checked before, and timed across, each match."""
+        state = _current.get()
+        matches = self.regex.finditer(string, *args)
+        if state is None:
+            yield from matches
+            return
+        while True:
+            state.check()
+            start = time.perf_counter()
+            m = next(matches, None)
+            state.record(self.name, time.perf_counter() - start, len(string))
+            if m is None:
+                return
+            yield m
+
+
+_cache: dict[tuple[str, int, str | None], Pattern] = {}
+
+
+def compile(pattern: str, flags: int = 0, name: str | None = None) -> Pattern:
+    # name is part of the key: the same source compiled with and without one keeps both labels
+    key = (pattern, flags, name)
+    if key not in _cache:
+        _cache[key] = Pattern(pattern, flags, name)
+    return _cache[key]
+
+
+def search(pattern: str, string: str, flags: int = 0) -> re.Match | None:
+    return compile(pattern, flags).search(string)
+
+
+def match(pattern: str, string: str, flags: int = 0) -> re.Match | None:
+    return compile(pattern, flags).match(string)
+
+
+def findall(pattern: str, string: str, flags: int = 0) -> list:
+    return compile(pattern, flags).findall(string)
+
+
+def sub(pattern: str, repl, string: str, count: int = 0, flags: int = 0) -> str:
+    return compile(pattern, flags).sub(repl, string, count)
@@ -0,0 +1,119 @@
+"""
+Single-pass section tokenizer for visit summaries.
+
+The text is scanned once with a precompiled, line-anchored alternation of
+every known section heading. Extractors then work only on their own
+section instead of re-scanning the whole document with their own
+non-anchored ``.+?`` DOTALL pattern. Section ends are found with a plain
+forward search for the first terminator, so cost stays linear in the
+section length even when a terminator never appears. A section with no
+terminator stops at the next recognized heading or blank line; one that
+would run on to the end of the text is dropped, as the old patterns did.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from app.services.parsers import guard
+
+# name -> heading pattern. Longer headings sharing a prefix come first.
+HEADINGS: dict[str, str] = {
+    "PARASITE_PREVENTIVES": r"Parasite Preventive Medications",
+    "SUPPLEMENTS": r"Medications/Supplements",
+    "KNOWN_ALLERGIES": r"Known Allergies",
+    "CURRENT_DIET": r"Current Diet",
+    "OWNER": r"OWNER",
+    "PROBLEMS_LIST": r"PROBLEMS LIST",
+    "DIFFERENTIALS": r"PROBLEMS\s+(?:AND\s+)?(?:PROBLEMS\s+)?DIFFERENTIALS",
+    "ORDERS": r"ORDERS",
+    "IMMUNIZATIONS": r"IMMUNIZATIONS",
+    "OTHER_PRODUCTS": r"OTHER PRODUCTS",
+    "PLAN": r"PLAN",
+    "PRESENTING_COMPLAINTS": r"PRESENTING\s+COMPLAINTS?",
+    "HISTORY": r"HISTORY",
+    "VITALS": r"VITALS",
+    "MEDICATIONS": r"MEDICATIONS",
+    "HOME_CARE": r"HOME CARE",
+    "MONITORING": r"MONITORING",
+    "TREATMENT": r"TREATMENT",
+    "NOTES": r"NOTES",
+}
+
+_HEADING_RE = guard.compile(
+    r"^[ \t]*(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in HEADINGS.items()) + r")",
+    re.MULTILINE,
+    name="section headings",
+)
+_CONTENT_RE = guard.compile(r"\S", name="section content")
+_PARAGRAPH_BREAK_RE = guard.compile(r"\n[ \t]*\n", name="paragraph break")
+
+
+@dataclass
+class Sections:
+    """
+    Heading name -> body span; only the first occurrence of each heading is
+    kept. heading_positions records where every recognized heading starts.
+    """
+    text: str
+    spans: dict[str, tuple[int, int]] = field(default_factory=dict)
+    heading_positions: list[int] = field(default_factory=list)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.spans
+
+    def block(self, name: str) -> str | None:
+        """Body from the end of the heading up to the next recognized heading."""
+        span = self.spans.get(name)
+        return self.text[span[0]:span[1]] if span else None
+
+    def body(self, name: str, until: guard.Pattern) -> str | None:
+        """
+        Body from the end of the heading up to the first match of `until`.
+        Terminators are allowed to reach past the next recognized heading,
+        as the clinic layouts sometimes require; see read_until for a
+        section without one.
+        """
+        span = self.spans.get(name)
+        if span is None:
+            return None
+        return read_until(self.text, span[0], until, span[1])
+
+
+def read_until(text: str, start: int, until: guard.Pattern, end: int | None = None) -> str | None:
+    """
+    text[start:] cut at the first match of `until`, searched from the second
+    character after any leading whitespace. Without a match it stops at
+    `end` (the next recognized heading) or at the first blank line after its
+    content, whichever comes first. None if that still reaches the end of
+    the text: the lines after an unterminated last section aren't part of it.
+    """
+    content = _CONTENT_RE.search(text, start)
+    if content is None:
+        return None
+    # Like the old "heading\s+(.+?)terminator" patterns, skip the blank lines after the heading
+    m = until.search(text, content.start() + 1)
+    if m:
+        return text[start:m.start()]
+    end = len(text) if end is None else end
+    paragraph_break = _PARAGRAPH_BREAK_RE.search(text, content.start(), end)
+    if paragraph_break:
+        end = paragraph_break.start()
+    if _CONTENT_RE.search(text, end) is None:
+        return None
+    return text[start:end]
+
+
+def split_sections(text: str) -> Sections:
+    sections = Sections(text)
+    last_name: str | None = None
+    for m in _HEADING_RE.finditer(text):
+        sections.heading_positions.append(m.start())
+        if last_name is not None:
+            start, _ = sections.spans[last_name]
+            sections.spans[last_name] = (start, m.start())
+            last_name = None
+        name = m.lastgroup
+        if name not in sections.spans:
+            sections.spans[name] = (m.end(), len(text))
+            last_name = name
+    return sections
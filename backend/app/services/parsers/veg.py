@@ -0,0 +1,188 @@
+"""Veterinary Emergency Group discharge summaries (veg.com)."""
+
+import re
+
+from app.services.parsers import guard
+from app.services.parsers.base import ClinicFormat, timed
+from app.services.parsers.common import (
+    extract_allergies,
+    extract_pet_info,
+    extract_provider,
+    extract_visit_date,
+    extract_vitals,
+)
+from app.services.parsers.sections import Sections, split_sections
+
+# Section terminators, searched forward from the section heading
+_MEDICATIONS_END_RE = guard.compile(r"\n(?:HOME CARE|MONITORING|TREATMENT|[A-Z]{3,}\s+[A-Z])")
+_HOME_CARE_END_RE = guard.compile(r"\n(?:Thank you|Sincerely|VEG\s*\|)")
+_MONITORING_RE = guard.compile(r"MONITORING[:\s]*")
+_DIFFERENTIALS_END_RE = guard.compile(r"\n(?:NOTES|TREATMENT|[A-Z]{3,}\s)")
+_COMPLAINT_END_RE = guard.compile(r"\n(?:HISTORY|VITALS|[A-Z]{3,})")
+
+
+def extract_clinic(text: str) -> str | None:
+    if "veg.com" in text.lower() or "veterinary emergency group" in text.lower() or "VEG" in text:
+        m = guard.search(r"VEG\s*[-–]?\s*(\w+)", text)
+        if m and m.group(1) not in ("Medical", "Tx", "Discharge"):
+            return f"VEG - {m.group(1)}"
+        m = guard.search(r"Veterinary Emergency Group\s*(?:of\s+)?(\w+)", text, re.IGNORECASE)
+        if m:
+            return f"VEG - {m.group(1)}"
+        return "VEG"
+    return None
+
+
+def extract_medications_section(sections: Sections, provider: str | None = None) -> list[dict]:
+    """"MEDICATIONS" section: "Drug Name DOSE ROUTE" lines, each optionally followed by "Give ..."."""
+    meds = []
+    block = sections.body("MEDICATIONS", _MEDICATIONS_END_RE)
+    if block:
+        block = block.strip()
+        # e.g., "Proviable Forte Kit 30 mL TGH"
+        lines = block.split("\n")
+        i = 0
+        while i < len(lines):
+            line = lines[i].strip()
+            if not line:
+                i += 1
+                continue
+            # Skip lines that are just directions
+            if line.startswith("Give ") or line.startswith("Total Qty") or line.startswith("Next Dose"):
+                i += 1
+                continue
+
+            # This might be a medication name line
+            drug_name = line
+            directions = None
+            strength = None
+
+            # Check next lines for directions
+            if i + 1 < len(lines):
+                next_line = lines[i + 1].strip()
+                if next_line.startswith("Give "):
+                    directions = next_line
+                    i += 1
+
+            # Extract strength from drug name if present
+            str_m = guard.search(r"(?<!\d)(\d+\s*(?:mg|mL|mcg|IU|units?)(?:/\w+)?)", drug_name, re.IGNORECASE)
+            if str_m:
+                strength = str_m.group(1)
+
+            if drug_name and not drug_name.startswith("Total") and not drug_name.startswith("Next"):
+                meds.append({
+                    "drug_name": drug_name,
+                    "strength": strength,
+                    "directions": directions,
+                    "indication": None,
+                    "start_date": None,
+                    "stop_date": None,
+                    "prescriber": provider,
+                    "pharmacy": None,
+                    "confidence": 0.85,
+                })
+            i += 1
+    return meds
+
+
+def extract_home_care(sections: Sections, provider: str | None, existing: list[dict]) -> list[dict]:
+    """Numbered OTC recommendations under HOME CARE, skipping drugs already in `existing`."""
+    meds = []
+    # Runs past MONITORING up to the sign-off; the list starts after the
+    # MONITORING label if there is one, else on the line after the heading.
+    block = sections.body("HOME_CARE", _HOME_CARE_END_RE)
+    if block:
+        monitoring = _MONITORING_RE.search(block)
+        block = block[monitoring.end():] if monitoring else block.partition("\n")[2]
+        block = block.strip()
+        # Find numbered medications: "1. Drug Name"
+        numbered = guard.findall(r"\d+\.\s+(.+?)(?:\n|$)", block)
+        for med_line in numbered:
+            med_line = med_line.strip()
+            # Skip if it's a description continuation
+            if med_line.startswith("This is") or med_line.startswith("We recommend") or len(med_line) < 3:
+                continue
+            # Check if we already have this med
+            drug_name = med_line.split("(")[0].strip()
+            if not any(m["drug_name"].lower().startswith(drug_name.lower()[:10]) for m in existing + meds):
+                meds.append({
+                    "drug_name": drug_name,
+                    "strength": None,
+                    "directions": None,
+                    "indication": "Recommended for home care",
+                    "start_date": None,
+                    "stop_date": None,
+                    "prescriber": provider,
+                    "pharmacy": "OTC",
+                    "confidence": 0.8,
+                })
+    return meds
+
+
+def extract_differentials(sections: Sections, existing: list[dict]) -> list[dict]:
+    """"PROBLEMS AND DIFFERENTIALS" section; problems are the short lines, differentials the comma lists."""
+    problems = []
+    block = sections.body("DIFFERENTIALS", _DIFFERENTIALS_END_RE)
+    if block:
+        block = block.strip()
+        for line in block.split("\n"):
+            line = line.strip()
+            if not line or line == "DIFFERENTIALS":
+                continue
+            if "," not in line and len(line) < 50:
+                if not any(p["condition_name"].lower() == line.lower() for p in existing + problems):
+                    problems.append({
+                        "condition_name": line,
+                        "onset_date": None,
+                        "is_active": True,
+                        "notes": None,
+                        "confidence": 0.85,
+                    })
+    return problems
+
+
+def extract_presenting_complaint(sections: Sections, existing: list[dict]) -> list[dict]:
+    """"PRESENTING COMPLAINTS" line, recorded as an active problem."""
+    complaint = sections.body("PRESENTING_COMPLAINTS", _COMPLAINT_END_RE)
+    if complaint:
+        complaint = complaint.strip()
+        if complaint and len(complaint) < 100:
+            if not any(p["condition_name"].lower() == complaint.lower() for p in existing):
+                return [{
+                    "condition_name": complaint,
+                    "onset_date": None,
+                    "is_active": True,
+                    "notes": "Presenting complaint",
+                    "confidence": 0.85,
+                }]
+    return []
+
+
+def parse(text: str, timings: dict[str, float] | None = None) -> dict:
+    visit_date = timed(timings, extract_visit_date, text)
+    provider = timed(timings, extract_provider, text)
+    sections = timed(timings, split_sections, text)
+
+    meds = timed(timings, extract_medications_section, sections, provider)
+    meds += timed(timings, extract_home_care, sections, provider, meds)
+
+    problems = timed(timings, extract_differentials, sections, [])
+    problems += timed(timings, extract_presenting_complaint, sections, problems)
+
+    return {
+        "medications": meds,
+        "vaccines": [],
+        "vitals": timed(timings, extract_vitals, text, visit_date),
+        "problems": problems,
+        "allergies": timed(timings, extract_allergies, text),
+        "pet_info": timed(timings, extract_pet_info, text),
+    }
+
+
+FORMAT = ClinicFormat(
+    name="veg",
+    parse=parse,
+    domains=frozenset({"veg.com"}),
+    keywords=("veterinary emergency group",),
+    headers=frozenset({"PRESENTING COMPLAINTS", "PROBLEMS AND DIFFERENTIALS", "HOME CARE", "MONITORING"}),
+)
@@ -0,0 +1,89 @@
+"""
+In-process cache of authenticated principals.
+
+get_current_user used to load the User row on every authenticated request,
+and nearly every handler only needs its id and the two flags the
+dependencies check. A Principal holds those three fields and is cached per
+access token, keyed by (user id, token iat), for principal_cache_ttl_seconds.
+At most principal_cache_max_entries are kept, evicting the least recently
+used.
+
+Changes to is_admin or consent_accepted, and deleting a user, must call
+invalidate(user_id). That drops the user's entries in this process only.
+Other API workers keep serving theirs until the TTL runs out, so the TTL
+bounds how long a demoted or deleted user keeps access there. Lookups are
+counted as principal_cache.hits / .misses in app.services.metrics.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.config import settings
+from app.models.user import User
+from app.services import metrics
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as the dependencies see it; load the User row for anything else."""
+    id: int
+    is_admin: bool
+    consent_accepted: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, is_admin=bool(user.is_admin), consent_accepted=bool(user.consent_accepted))
+
+
+class PrincipalCache:
+    """LRU of (user id, iat) -> (Principal, expiry on the monotonic clock)."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[int, int | None], tuple[Principal, float]] = OrderedDict()
+
+    def get(self, user_id: int, iat: int | None) -> Principal | None:
+        key = (user_id, iat)
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries.move_to_end(key)
+            metrics.incr("principal_cache.hits")
+            return entry[0]
+        if entry is not None:
+            del self._entries[key]
+        metrics.incr("principal_cache.misses")
+        return None
+
+    def put(self, iat: int | None, principal: Principal) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        key = (principal.id, iat)
+        self._entries[key] = (principal, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Forget every cached token of this user (this process only)."""
+        for key in [key for key in self._entries if key[0] == user_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_cache = PrincipalCache(settings.principal_cache_ttl_seconds, settings.principal_cache_max_entries)
+
+
+def get(user_id: int, iat: int | None) -> Principal | None:
+    return _cache.get(user_id, iat)
+
+
+def put(iat: int | None, principal: Principal) -> None:
+    _cache.put(iat, principal)
+
+
+def invalidate(user_id: int) -> None:
+    _cache.invalidate(user_id)
@@ -0,0 +1,88 @@
+"""
+Single-transaction writes for the CRUD routers.
+
+Each helper does the entity write and its audit row in one transaction and
+commits once:
+
+- create: INSERT (the new id comes back with it), audit row, COMMIT;
+- update: UPDATE ... WHERE ... RETURNING the whole row, audit row, COMMIT,
+  with no SELECT beforehand to find the row and no refresh afterwards;
+- delete: ORM delete of an entity the caller has loaded (so relationship
+  cascades still run), audit row, COMMIT.
+
+Nothing is re-read after the commit: sessions don't expire on commit and
+the models have no server-side defaults, so the objects already hold what
+was written. The audit row's resource_type is the model's class name, and
+because it commits with the change, the row can't be lost or written for a
+change that rolled back.
+"""
+
+from typing import Any, TypeVar
+
+from sqlalchemy import select, update as sa_update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import Base
+from app.services.audit_service import add_audit_log
+
+M = TypeVar("M", bound=Base)
+
+
+async def create(
+    db: AsyncSession, entity: M, *, user_id: int | None, action: str, ip_address: str | None = None
+) -> M:
+    """INSERT `entity` and its audit row, then commit."""
+    db.add(entity)
+    await db.flush()
+    add_audit_log(
+        db, user_id=user_id, action=action,
+        resource_type=type(entity).__name__, resource_id=entity.id, ip_address=ip_address,
+    )
+    await db.commit()
+    return entity
+
+
+async def update(
+    db: AsyncSession,
+    model: type[M],
+    values: dict[str, Any],
+    *where,
+    user_id: int | None,
+    action: str,
+    ip_address: str | None = None,
+) -> M | None:
+    """
+    Set `values` on the `model` row matching `where`, add the audit row and
+    commit. Returns the updated row, or None (nothing written) if no row
+    matched. An empty `values` still records the action, like a save with
+    no changes always has.
+    """
+    if values:
+        stmt = sa_update(model).where(*where).values(**values).returning(model)
+    else:
+        stmt = select(model).where(*where)
+    # populate_existing: a copy already in the session (e.g. the Pet loaded by
+    # get_pet_for_owner) takes the returned values instead of keeping stale ones
+    result = await db.execute(stmt.execution_options(populate_existing=True))
+    entity = result.scalar_one_or_none()
+    if entity is None:
+        return None
+    add_audit_log(
+        db, user_id=user_id, action=action,
+        resource_type=model.__name__, resource_id=entity.id, ip_address=ip_address,
+    )
+    await db.commit()
+    return entity
+
+
+async def delete(
+    db: AsyncSession, entity: Base, *, user_id: int | None, action: str, ip_address: str | None = None
+) -> None:
+    """Delete `entity` (and whatever its relationships cascade to) with its audit row, then commit."""
+    resource_id = entity.id
+    await db.delete(entity)
+    add_audit_log(
+        db, user_id=user_id, action=action,
+        resource_type=type(entity).__name__, resource_id=resource_id, ip_address=ip_address,
+    )
+    await db.commit()
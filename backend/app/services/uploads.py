@@ -0,0 +1,130 @@
+"""
+Stream multipart uploads to disk in fixed-size chunks.
+
+The routers used to `await file.read()` the whole upload and then
+`write_bytes` it on the event loop, so memory scaled with file size and a
+slow disk stalled every request. save_upload copies the spooled upload in
+CHUNK_SIZE pieces through aiofiles, hashing and counting as it goes, and
+stops at the first chunk past the limit. The file is written under a
+temporary name and renamed into place only once it is complete, so a
+rejected or interrupted upload never leaves a partial file behind.
+
+The declared Content-Type is only a client hint; the media type is
+sniffed from the first bytes and checked against the allowed set.
+"""
+
+import hashlib
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+
+from app.services import metrics
+
+CHUNK_SIZE = 256 * 1024
+SNIFF_BYTES = 16
+
+EXTENSIONS = {
+    "application/pdf": ".pdf",
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UnsupportedMediaType(Exception):
+    pass
+
+
+@dataclass
+class SavedUpload:
+    path: Path
+    size: int
+    sha256: str
+    media_type: str
+
+
+def sniff_media_type(head: bytes) -> str | None:
+    """Identify the file from its magic bytes; None if it isn't a type we store."""
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+async def receive_upload(file: UploadFile, directory: Path, max_size: int, allowed_types: set[str]) -> SavedUpload:
+    """
+    Copy `file` chunk by chunk to a temporary file in `directory` and
+    return it with its size, SHA-256 and sniffed media type. The caller
+    moves the file into place or removes it. Raises UploadTooLarge past
+    `max_size` bytes and UnsupportedMediaType if the content isn't one of
+    `allowed_types`; nothing is left on disk in either case.
+    """
+    if file.size is not None and file.size > max_size:
+        metrics.incr("uploads_rejected")
+        raise UploadTooLarge()
+
+    await aiofiles.os.makedirs(directory, exist_ok=True)
+    tmp_path = directory / f".{uuid.uuid4().hex}.part"
+    hasher = hashlib.sha256()
+    size = 0
+    media_type = None
+    try:
+        async with aiofiles.open(tmp_path, "wb") as out:
+            while chunk := await file.read(CHUNK_SIZE):
+                if media_type is None:
+                    media_type = sniff_media_type(chunk[:SNIFF_BYTES])
+                    if media_type not in allowed_types:
+                        raise UnsupportedMediaType()
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge()
+                hasher.update(chunk)
+                await out.write(chunk)
+        if media_type is None:
+            raise UnsupportedMediaType()  # empty upload
+    except BaseException:
+        metrics.incr("uploads_rejected")
+        await discard(tmp_path)
+        raise
+
+    metrics.incr("uploads_saved")
+    metrics.incr("upload_bytes", size)
+    return SavedUpload(tmp_path, size, hasher.hexdigest(), media_type)
+
+
+async def discard(path: Path) -> None:
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_upload(
+    file: UploadFile, directory: Path, stem: str, max_size: int, allowed_types: set[str]
+) -> SavedUpload:
+    """Stream `file` to `directory/<stem><ext>`, where ext follows the sniffed media type."""
+    saved = await receive_upload(file, directory, max_size, allowed_types)
+    dest = directory / f"{stem}{EXTENSIONS[saved.media_type]}"
+    try:
+        await aiofiles.os.replace(saved.path, dest)
+    except BaseException:
+        await discard(saved.path)
+        raise
+    saved.path = dest
+    return saved
@@ -0,0 +1,219 @@
+"""
+Garbage-collect the document blob store.
+
+    python -m app.tools.blob_gc [--dry-run] [--grace-minutes 60] [--recount] [--adopt-legacy]
+
+Steps, in order:
+
+--adopt-legacy  Moves documents uploaded before the blob store (blob_id
+                NULL, file under upload_dir/<pet_id>/) into it. Each file
+                is hard-linked (or copied) to its blob path and committed,
+                and only then is the legacy file removed.
+--recount       Recomputes every ref_count from the documents table. This
+                repairs drift from bulk deletes that bypass the mapper
+                events.
+(always)        Deletes blobs whose ref_count is 0 and that have not been
+                touched for --grace-minutes, then their files.
+(always)        Removes files under blobs/ that no row references, and
+                abandoned .part uploads. Such files come from a crash
+                between the rename and the commit. Only files older than
+                the grace period are removed.
+
+Nothing is changed with --dry-run; the report shows what would be.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal, engine
+from app.models.blob import Blob
+from app.models.document import Document
+from app.services.blob_store import blob_path, blob_root, get_or_create_blob
+from app.services.extraction_cache import hash_file
+from app.services.uploads import SNIFF_BYTES, sniff_media_type
+
+logger = logging.getLogger("uvicorn.error")
+
+BATCH_SIZE = 100
+
+
+@dataclass
+class GCReport:
+    adopted: int = 0
+    adopt_skipped: int = 0
+    recounted: int = 0
+    blobs_deleted: int = 0
+    bytes_freed: int = 0
+    stray_files_deleted: int = 0
+    missing_files: int = 0
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.exists():
+        return
+    tmp = dest.with_name(f".{dest.name}.adopt")
+    try:
+        os.link(src, tmp)
+    except OSError:  # different filesystem, or no hard links
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dest)
+
+
+def _inspect_legacy(path: Path) -> tuple[str, int] | None:
+    """(media_type, size) of a legacy upload, or None if it is missing or not a type we store."""
+    try:
+        with open(path, "rb") as f:
+            media_type = sniff_media_type(f.read(SNIFF_BYTES))
+        return (media_type, path.stat().st_size) if media_type else None
+    except FileNotFoundError:
+        return None
+
+
+async def adopt_legacy(db: AsyncSession, report: GCReport, dry_run: bool) -> None:
+    last_id = 0
+    while True:
+        docs = (await db.execute(
+            select(Document)
+            .where(Document.blob_id.is_(None), Document.id > last_id)
+            .order_by(Document.id)
+            .limit(BATCH_SIZE)
+        )).scalars().all()
+        if not docs:
+            return
+        last_id = docs[-1].id
+
+        legacy_files = []
+        for doc in docs:
+            path = Path(doc.file_path)
+            info = await asyncio.to_thread(_inspect_legacy, path)
+            if info is None:
+                logger.warning("Document %d: %s is missing or unrecognised; left as is", doc.id, path)
+                report.adopt_skipped += 1
+                continue
+            media_type, size = info
+            sha256 = doc.content_hash or await asyncio.to_thread(hash_file, path)
+            dest = blob_path(sha256, media_type)
+            report.adopted += 1
+            if dry_run:
+                continue
+            await asyncio.to_thread(_link_or_copy, path, dest)
+            blob = await get_or_create_blob(db, sha256, size, media_type)
+            doc.blob_id = blob.id
+            doc.content_hash = sha256
+            doc.file_path = str(dest)
+            legacy_files.append(path)
+
+        if not dry_run:
+            await db.commit()
+            for path in legacy_files:
+                path.unlink(missing_ok=True)
+
+
+async def recount(db: AsyncSession, report: GCReport, dry_run: bool) -> None:
+    actual = dict((await db.execute(
+        select(Document.blob_id, func.count()).where(Document.blob_id.is_not(None)).group_by(Document.blob_id)
+    )).all())
+    for blob_id, ref_count in (await db.execute(select(Blob.id, Blob.ref_count))).all():
+        if ref_count != actual.get(blob_id, 0):
+            logger.info("Blob %d: ref_count %d, actually %d", blob_id, ref_count, actual.get(blob_id, 0))
+            report.recounted += 1
+            if not dry_run:
+                await db.execute(update(Blob).where(Blob.id == blob_id).values(ref_count=actual.get(blob_id, 0)))
+    if not dry_run:
+        await db.commit()
+
+
+async def collect_unreferenced(db: AsyncSession, report: GCReport, cutoff: datetime, dry_run: bool) -> None:
+    blobs = (await db.execute(
+        select(Blob).where(Blob.ref_count <= 0, Blob.updated_at < cutoff)
+    )).scalars().all()
+    for blob in blobs:
+        if not dry_run:
+            # Re-checked in the DELETE, in case an upload just took a reference
+            deleted = await db.execute(delete(Blob).where(Blob.id == blob.id, Blob.ref_count <= 0))
+            await db.commit()
+            if not deleted.rowcount:
+                continue
+            # An identical upload racing us recreates the row; leave its file alone
+            if (await db.execute(select(Blob.id).where(Blob.sha256 == blob.sha256))).first():
+                continue
+            blob_path(blob.sha256, blob.media_type).unlink(missing_ok=True)
+        report.blobs_deleted += 1
+        report.bytes_freed += blob.size
+
+
+def _blob_files(root: Path):
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            yield Path(dirpath) / name
+
+
+async def sweep_files(db: AsyncSession, report: GCReport, mtime_cutoff: float, dry_run: bool) -> None:
+    known = {sha256: media_type for sha256, media_type in (await db.execute(select(Blob.sha256, Blob.media_type))).all()}
+    for path in await asyncio.to_thread(lambda: list(_blob_files(blob_root()))):
+        sha256 = path.name.split(".", 1)[0]
+        if sha256 in known and path == blob_path(sha256, known[sha256]):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        if stat.st_mtime >= mtime_cutoff:
+            continue
+        report.stray_files_deleted += 1
+        report.bytes_freed += stat.st_size
+        if not dry_run:
+            path.unlink(missing_ok=True)
+
+    for sha256, media_type in known.items():
+        if not blob_path(sha256, media_type).exists():
+            logger.warning("Blob %s has no file on disk", sha256)
+            report.missing_files += 1
+
+
+async def run_gc(dry_run: bool, grace_minutes: int, do_recount: bool, do_adopt: bool) -> GCReport:
+    report = GCReport()
+    cutoff = datetime.utcnow() - timedelta(minutes=grace_minutes)
+    async with AsyncSessionLocal() as db:
+        if do_adopt:
+            await adopt_legacy(db, report, dry_run)
+        if do_recount:
+            await recount(db, report, dry_run)
+        await collect_unreferenced(db, report, cutoff, dry_run)
+        await sweep_files(db, report, time.time() - grace_minutes * 60, dry_run)
+    return report
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        report = await run_gc(args.dry_run, args.grace_minutes, args.recount, args.adopt_legacy)
+    finally:
+        await engine.dispose()
+    prefix = "[dry run] " if args.dry_run else ""
+    logger.info(
+        "%sadopted %d legacy documents (%d skipped), fixed %d ref counts, deleted %d blobs and %d stray files "
+        "(%.1f MiB), %d blobs missing on disk",
+        prefix, report.adopted, report.adopt_skipped, report.recounted, report.blobs_deleted,
+        report.stray_files_deleted, report.bytes_freed / 1024 / 1024, report.missing_files,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Garbage-collect the MedPetRx document blob store")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without changing it")
+    parser.add_argument("--grace-minutes", type=int, default=60, help="Leave blobs and files younger than this alone")
+    parser.add_argument("--recount", action="store_true", help="Recompute ref counts from the documents table first")
+    parser.add_argument("--adopt-legacy", action="store_true", help="Move pre-blob-store uploads into the store first")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parser.parse_args()))
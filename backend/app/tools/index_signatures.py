@@ -0,0 +1,102 @@
+"""
+Backfill near-duplicate signatures for documents extracted before they existed.
+
+    python -m app.tools.index_signatures [--flag] [--dry-run] [--batch-size 200]
+
+Signs the stored text layer (DocumentText.text) of every document without a
+DocumentSignature, in id order, so each document is compared only with
+earlier ones. With --flag, documents that match an earlier document of the
+same pet get duplicate_of_id set; extracted data is never changed. Documents
+without stored text (images, scans, pre-DocumentText uploads) are skipped;
+run app.tools.reextract first to give older PDFs a text layer.
+"""
+
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal, engine
+from app.models.document import Document
+from app.models.document_signature import DocumentSignature
+from app.models.document_text import DocumentText
+from app.services.near_duplicate import find_near_duplicate, index_signature, minhash, shingles
+from app.services.pdf_parser import TextLayer
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@dataclass
+class IndexReport:
+    indexed: int = 0
+    too_short: int = 0
+    flagged: int = 0
+
+
+async def index_batch(
+    db: AsyncSession, after_id: int, batch_size: int, flag: bool, report: IndexReport, dry_run: bool
+) -> int | None:
+    """Sign the next batch; returns the last document id seen, or None when done."""
+    rows = (await db.execute(
+        select(Document, DocumentText.text, DocumentText.page_count, DocumentText.text_method)
+        .join(DocumentText, DocumentText.document_id == Document.id)
+        .where(
+            Document.id > after_id,
+            DocumentText.text.is_not(None),
+            ~select(DocumentSignature.id).where(DocumentSignature.document_id == Document.id).exists(),
+        )
+        .order_by(Document.id)
+        .limit(batch_size)
+    )).all()
+    if not rows:
+        return None
+
+    for doc, text, page_count, method in rows:
+        layer = TextLayer.from_stored(text, page_count or 0, method or "stored")
+        hashes = await asyncio.to_thread(shingles, layer.full_text)
+        signature = minhash(hashes)
+        if signature is None:
+            report.too_short += 1
+            continue
+        if flag and doc.duplicate_of_id is None:
+            match = await find_near_duplicate(db, doc.pet_id, doc.id, signature)
+            # Only earlier documents: later ones flag themselves when their turn comes
+            if match is not None and match[0].id < doc.id:
+                report.flagged += 1
+                logger.info("Document %d: near-duplicate of %d (%.2f)", doc.id, match[0].id, match[1])
+                if not dry_run:
+                    doc.duplicate_of_id = match[0].id
+        if not dry_run:
+            await index_signature(db, doc.pet_id, doc.id, signature, len(hashes))
+        report.indexed += 1
+    if not dry_run:
+        await db.commit()
+    return rows[-1][0].id
+
+
+async def main(args: argparse.Namespace) -> None:
+    report = IndexReport()
+    try:
+        async with AsyncSessionLocal() as db:
+            last_id = 0
+            while (last_id := await index_batch(db, last_id, args.batch_size, args.flag, report, args.dry_run)) is not None:
+                pass
+    finally:
+        await engine.dispose()
+    prefix = "[dry run] " if args.dry_run else ""
+    logger.info(
+        "%sindexed %d documents, %d with too little text, %d flagged as near-duplicates",
+        prefix, report.indexed, report.too_short, report.flagged,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill MedPetRx near-duplicate document signatures")
+    parser.add_argument("--flag", action="store_true", help="Set duplicate_of_id on documents matching an earlier one")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing")
+    parser.add_argument("--batch-size", type=int, default=200)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parser.parse_args()))
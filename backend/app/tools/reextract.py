@@ -0,0 +1,357 @@
+"""
+Re-run the local parser over existing documents after a parser change.
+
+    python -m app.tools.reextract                           # every document older than PARSER_VERSION
+    python -m app.tools.reextract --parser-version 1.2 --status failed --since 2026-01-01
+    python -m app.tools.reextract --dry-run --diff-out diff.jsonl
+    python -m app.tools.reextract --resume                  # continue after an interruption
+
+Documents are read in id order in batches of --batch-size. Each one is
+parsed in the parser process pool, with --workers processes and the usual
+per-document timeout. The stored text layer (DocumentText) is used when
+there is one; --from-pdf forces a fresh read of the PDF. The results of
+each batch are written back with one bulk UPDATE of documents and one bulk
+upsert of document_texts, then the checkpoint file records the last id.
+--resume picks up from there if the filters (and --dry-run) match.
+
+Only the local parser runs; Claude is never called. The rules are:
+- A document whose new parse finds nothing keeps its current result,
+  but is recorded as parsed by the current version.
+- Documents whose extracted data came from the Claude fallback, directly
+  or through a cache hit or near-duplicate, are skipped unless
+  --include-llm is given; their data can't be reproduced locally.
+- Pending and processing documents are never touched.
+- Confirmed medical records are unaffected; only the extraction
+  proposal (extracted_data) changes.
+
+With --dry-run nothing is written. Each document whose result would
+change gets one JSON line (--diff-out, default stdout) with the records
+added and removed per section.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.models.document import Document, ExtractionStatus
+from app.models.document_text import DocumentText
+from app.services.document_text import used_llm
+from app.services.extraction_cache import store_extraction
+from app.services.page_triage import PageTriage
+from app.services.parser_pool import ParserPool
+from app.services.pdf_parser import PARSER_VERSION, ParseResult, has_useful_data, reparse_document
+
+logger = logging.getLogger("uvicorn.error")
+
+RECORD_SECTIONS = ("medications", "vaccines", "vitals", "problems", "allergies")
+
+
+@dataclass
+class Progress:
+    selected: int = 0
+    processed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    kept: int = 0  # new parse found nothing; old result left in place
+    skipped_llm: int = 0
+    failed: int = 0
+    last_id: int = 0
+
+
+@dataclass
+class Candidate:
+    id: int
+    file_path: str
+    content_hash: str | None
+    status: ExtractionStatus
+    extracted_data: dict | None
+    text_id: int | None
+    text: str | None
+    page_count: int | None
+    text_method: str | None
+    skip_pages: list[int]
+    old_version: str | None
+    used_llm: bool
+
+
+def _filters(args: argparse.Namespace) -> dict:
+    """The selection criteria, compared on --resume so a checkpoint isn't reused for a different run."""
+    return {
+        "parser_version": args.parser_version,
+        "status": args.status,
+        "since": args.since,
+        "until": args.until,
+        "pet_id": args.pet_id,
+        "target_version": PARSER_VERSION,
+        # A dry run writes nothing, so a real run can't resume from its checkpoint
+        "dry_run": args.dry_run,
+    }
+
+
+def _query(args: argparse.Namespace, after_id: int):
+    query = (
+        select(Document, DocumentText)
+        .outerjoin(DocumentText, DocumentText.document_id == Document.id)
+        .where(Document.id > after_id, Document.file_path.ilike("%.pdf"))
+    )
+    statuses = [ExtractionStatus(s) for s in args.status.split(",")]
+    query = query.where(Document.extraction_status.in_(statuses))
+    if args.parser_version:
+        query = query.where(DocumentText.parser_version == args.parser_version)
+    else:
+        # Pre-DocumentText documents have no recorded version and count as stale
+        query = query.where(or_(DocumentText.parser_version.is_(None), DocumentText.parser_version != PARSER_VERSION))
+    if args.since:
+        query = query.where(Document.upload_date >= datetime.fromisoformat(args.since))
+    if args.until:
+        query = query.where(Document.upload_date < datetime.fromisoformat(args.until))
+    if args.pet_id:
+        query = query.where(Document.pet_id == args.pet_id)
+    return query
+
+
+async def _fetch_batch(db: AsyncSession, args: argparse.Namespace, after_id: int) -> list[Candidate]:
+    rows = (await db.execute(_query(args, after_id).order_by(Document.id).limit(args.batch_size))).all()
+    batch = []
+    for doc, text in rows:
+        # Pages triaged out at upload stay out; triage isn't re-run here
+        triage = PageTriage.from_stats(text.page_triage) if text else None
+        batch.append(Candidate(
+            id=doc.id,
+            file_path=doc.file_path,
+            content_hash=doc.content_hash,
+            status=doc.extraction_status,
+            extracted_data=doc.extracted_data,
+            text_id=text.id if text else None,
+            text=None if text is None or args.from_pdf else text.text,
+            page_count=text.page_count if text else None,
+            text_method=text.text_method if text else None,
+            skip_pages=sorted(triage.skipped) if triage else [],
+            old_version=text.parser_version if text else None,
+            used_llm=used_llm(text),
+        ))
+    return batch
+
+
+def _record_key(record) -> str:
+    if isinstance(record, dict):
+        record = {k: v for k, v in record.items() if k != "confidence"}
+    return json.dumps(record, sort_keys=True, default=str)
+
+
+def diff_extractions(old: dict | None, new: dict) -> dict:
+    """Per-section records added and removed (confidence ignored), plus pet_info field changes."""
+    old = old or {}
+    diff = {}
+    for section in RECORD_SECTIONS:
+        before = {_record_key(r): r for r in old.get(section) or []}
+        after = {_record_key(r): r for r in new.get(section) or []}
+        added = [after[k] for k in after.keys() - before.keys()]
+        removed = [before[k] for k in before.keys() - after.keys()]
+        if added or removed:
+            diff[section] = {"added": added, "removed": removed}
+    old_info, new_info = old.get("pet_info") or {}, new.get("pet_info") or {}
+    info = {
+        k: {"old": old_info.get(k), "new": new_info.get(k)}
+        for k in (old_info.keys() | new_info.keys()) - {"confidence"}
+        if old_info.get(k) != new_info.get(k)
+    }
+    if info:
+        diff["pet_info"] = info
+    return diff
+
+
+async def _parse_batch(pool: ParserPool, batch: list[Candidate], workers: int) -> list[ParseResult | Exception]:
+    # Bound in-flight work to the pool size so the per-document timeout doesn't include queueing
+    semaphore = asyncio.Semaphore(workers)
+
+    async def one(c: Candidate) -> ParseResult | Exception:
+        async with semaphore:
+            try:
+                return await pool.run(
+                    reparse_document,
+                    c.file_path,
+                    c.text,
+                    c.page_count,
+                    c.text_method,
+                    settings.parser_budget_seconds,
+                    c.skip_pages,
+                )
+            except Exception as e:
+                return e
+
+    return await asyncio.gather(*(one(c) for c in batch))
+
+
+async def _write_batch(
+    db: AsyncSession, updates: list[tuple[Candidate, ParseResult]], kept: list[tuple[Candidate, ParseResult]]
+) -> None:
+    """
+    One bulk UPDATE of documents, one bulk UPDATE and one bulk INSERT of
+    document_texts. Kept documents only get their text and parser version
+    recorded, so the next run doesn't select them again.
+    """
+    if not updates and not kept:
+        return
+    if updates:
+        await db.execute(update(Document), [
+            {"id": c.id, "extracted_data": r.data, "extraction_status": ExtractionStatus.COMPLETED}
+            for c, r in updates
+        ])
+    # Replaced data now comes from the local parser; kept data keeps its provenance
+    text_rows = []
+    for c, r, llm in [(c, r, False) for c, r in updates] + [(c, r, c.used_llm) for c, r in kept]:
+        layer = r.text_layer
+        text_rows.append({
+            "id": c.text_id,
+            "document_id": c.id,
+            "text": layer.to_stored() if layer else None,
+            "page_count": layer.page_count if layer else None,
+            "text_method": layer.method if layer else None,
+            "parser_version": PARSER_VERSION,
+            "detected_format": r.detected_format,
+            "used_llm": llm,
+        })
+    existing = [row for row in text_rows if row["id"] is not None]
+    new = [{k: v for k, v in row.items() if k != "id"} for row in text_rows if row["id"] is None]
+    if existing:
+        await db.execute(update(DocumentText), existing)
+    if new:
+        await db.execute(insert(DocumentText), new)
+    for c, r in updates:
+        if c.content_hash:
+            await store_extraction(db, c.content_hash, r.data)
+    await db.commit()
+
+
+def _load_checkpoint(path: Path, filters: dict) -> Progress | None:
+    if not path.exists():
+        return None
+    saved = json.loads(path.read_text())
+    if saved.get("filters") != filters:
+        raise SystemExit(f"{path} was written for different filters {saved.get('filters')}; remove it or drop --resume")
+    return Progress(**saved["progress"])
+
+
+def _save_checkpoint(path: Path, filters: dict, progress: Progress) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"filters": filters, "progress": asdict(progress)}, indent=2))
+    tmp.replace(path)
+
+
+def _report(progress: Progress, started: float, processed_at_start: int, prefix: str = "") -> None:
+    elapsed = time.monotonic() - started
+    rate = (progress.processed - processed_at_start) / elapsed if elapsed else 0.0
+    remaining = max(progress.selected - progress.processed, 0)
+    eta = f"{remaining / rate:.0f}s" if rate else "?"
+    print(
+        f"{prefix}{progress.processed}/{progress.selected} ({rate:.1f} docs/s, eta {eta}) "
+        f"changed={progress.changed} unchanged={progress.unchanged} kept={progress.kept} "
+        f"skipped_llm={progress.skipped_llm} failed={progress.failed}",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+async def reextract(args: argparse.Namespace) -> Progress:
+    filters = _filters(args)
+    checkpoint = Path(args.checkpoint)
+    progress = (_load_checkpoint(checkpoint, filters) if args.resume else None) or Progress()
+    diff_out = open(args.diff_out, "a" if args.resume else "w") if args.diff_out else sys.stdout
+    pool = ParserPool(workers=args.workers, timeout=args.timeout)
+    started = time.monotonic()
+    processed_at_start = progress.processed
+
+    try:
+        async with AsyncSessionLocal() as db:
+            remaining = (await db.execute(
+                select(func.count()).select_from(_query(args, progress.last_id).with_only_columns(Document.id).subquery())
+            )).scalar_one()
+            progress.selected = progress.processed + remaining
+            while True:
+                batch = await _fetch_batch(db, args, progress.last_id)
+                if not batch:
+                    break
+                results = await _parse_batch(pool, batch, pool.workers)
+
+                updates, kept = [], []
+                for c, result in zip(batch, results):
+                    progress.processed += 1
+                    if isinstance(result, Exception):
+                        logger.warning("Document %d: re-parse failed: %s", c.id, result)
+                        progress.failed += 1
+                    elif c.used_llm and not args.include_llm:
+                        progress.skipped_llm += 1
+                    elif not has_useful_data(result.data):
+                        progress.kept += 1
+                        kept.append((c, result))
+                    elif result.data == c.extracted_data and c.status == ExtractionStatus.COMPLETED:
+                        progress.unchanged += 1
+                        updates.append((c, result))  # still records the new parser version
+                    else:
+                        progress.changed += 1
+                        updates.append((c, result))
+                        if args.dry_run:
+                            diff_out.write(json.dumps({
+                                "document_id": c.id,
+                                "old_parser_version": c.old_version,
+                                "new_parser_version": PARSER_VERSION,
+                                "old_status": c.status.value,
+                                "diff": diff_extractions(c.extracted_data, result.data),
+                            }, default=str) + "\n")
+
+                if not args.dry_run:
+                    await _write_batch(db, updates, kept)
+                else:
+                    diff_out.flush()
+                progress.last_id = batch[-1].id
+                _save_checkpoint(checkpoint, filters, progress)
+                db.expunge_all()
+                _report(progress, started, processed_at_start, "[dry run] " if args.dry_run else "")
+    finally:
+        pool.shutdown()
+        if diff_out is not sys.stdout:
+            diff_out.close()
+
+    if progress.processed == processed_at_start:
+        print("nothing to re-extract", file=sys.stderr)
+    checkpoint.unlink(missing_ok=True)  # finished: a later run starts over
+    return progress
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        await reextract(args)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-extract MedPetRx documents with the current local parser")
+    parser.add_argument("--parser-version", help="Only documents last parsed by this version (default: any older than current)")
+    parser.add_argument("--status", default="completed,failed", help="Comma-separated extraction statuses to include")
+    parser.add_argument("--since", help="Only documents uploaded on/after this ISO date")
+    parser.add_argument("--until", help="Only documents uploaded before this ISO date")
+    parser.add_argument("--pet-id", type=int, help="Only this pet's documents")
+    parser.add_argument("--from-pdf", action="store_true", help="Re-read PDFs even when stored text exists")
+    parser.add_argument("--include-llm", action="store_true", help="Also re-parse documents Claude helped extract")
+    parser.add_argument("--workers", type=int, default=settings.parser_pool_workers or None, help="Parser processes")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-document parse budget in seconds")
+    parser.add_argument("--batch-size", type=int, default=200, help="Documents per fetch/write batch")
+    parser.add_argument("--checkpoint", default=".reextract-checkpoint.json", help="Progress file for --resume")
+    parser.add_argument("--resume", action="store_true", help="Continue after the last checkpointed document")
+    parser.add_argument("--dry-run", action="store_true", help="Write nothing; emit a JSONL diff of changes")
+    parser.add_argument("--diff-out", help="File for the --dry-run diff (default: stdout)")
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,201 @@
+"""
+Extraction worker pool.
+
+Runs inside the API process (started from the app lifespan) or standalone:
+
+    python -m app.workers.extraction [--concurrency N]
+
+Each worker loop claims one job at a time from the extraction_jobs table,
+so total parallelism is bounded by the configured concurrency no matter
+how many uploads arrive. While a job runs its lease is renewed every
+extraction_job_heartbeat_seconds; if the job was reclaimed meanwhile the
+run is cancelled and its result dropped. A sweeper loop periodically
+recovers jobs whose lease expired.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+from app.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.services.extraction_service import run_extraction
+from app.services.job_queue import (
+    LeaseLost,
+    claim_next_job,
+    complete_job,
+    fail_job,
+    recover_stale_jobs,
+    renew_lease,
+)
+from app.services.llm_client import close_llm_client
+from app.services.parser_pool import shutdown_parser_pool
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class ExtractionWorkerPool:
+    def __init__(self, concurrency: int | None = None, name: str | None = None):
+        self.concurrency = max(1, concurrency or settings.extraction_worker_concurrency)
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._workers: list[asyncio.Task] = []
+        self._sweeper: asyncio.Task | None = None
+
+    def notify(self) -> None:
+        """Wake idle workers right away instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        self._stopping = False
+        self._workers = [
+            asyncio.create_task(self._worker_loop(f"{self.name}/{i}"))
+            for i in range(self.concurrency)
+        ]
+        self._sweeper = asyncio.create_task(self._sweeper_loop())
+        logger.info("Extraction worker pool started (%d workers)", self.concurrency)
+
+    async def stop(self, grace_seconds: float = 30.0) -> None:
+        """Let in-flight jobs finish within the grace period, then cancel."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._sweeper:
+            self._sweeper.cancel()
+        if self._workers:
+            _, pending = await asyncio.wait(self._workers, timeout=grace_seconds)
+            for task in pending:
+                task.cancel()
+            # Jobs cancelled here keep their lease and are recovered by the sweep
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._workers = []
+        logger.info("Extraction worker pool stopped")
+
+    async def _worker_loop(self, worker_id: str) -> None:
+        while not self._stopping:
+            try:
+                async with AsyncSessionLocal() as db:
+                    job = await claim_next_job(db, worker_id)
+            except Exception:
+                logger.exception("Extraction worker %s could not claim a job", worker_id)
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=settings.extraction_job_poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run_job(job.id, job.document_id, worker_id)
+
+    async def _run_job(self, job_id: int, document_id: int, worker_id: str) -> None:
+        run = asyncio.create_task(run_extraction(document_id, job_id, worker_id))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, worker_id, run))
+        try:
+            await run
+        except LeaseLost:
+            logger.warning("Extraction job %d (document %d) was reclaimed; result dropped", job_id, document_id)
+        except asyncio.CancelledError:
+            # The heartbeat returns only after cancelling the run; otherwise the pool is stopping
+            if not heartbeat.done() or heartbeat.cancelled():
+                raise
+            logger.warning("Extraction job %d (document %d) was reclaimed; run cancelled", job_id, document_id)
+        except Exception as e:
+            logger.warning("Extraction job %d (document %d) failed: %s", job_id, document_id, e)
+            async with AsyncSessionLocal() as db:
+                if not await fail_job(db, job_id, worker_id, f"{type(e).__name__}: {e}"):
+                    logger.warning("Extraction job %d was reclaimed; failure not recorded", job_id)
+        else:
+            async with AsyncSessionLocal() as db:
+                if not await complete_job(db, job_id, worker_id):
+                    logger.warning("Extraction job %d was reclaimed before it completed; result dropped", job_id)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: int, worker_id: str, run: asyncio.Task) -> None:
+        """Renew the lease until `run` finishes; cancel it if the job was reclaimed."""
+        while True:
+            await asyncio.sleep(settings.extraction_job_heartbeat_seconds)
+            try:
+                async with AsyncSessionLocal() as db:
+                    held = await renew_lease(db, job_id, worker_id)
+            except Exception:
+                logger.exception("Extraction worker %s could not renew the lease on job %d", worker_id, job_id)
+                continue
+            if not held:
+                run.cancel()
+                return
+
+    async def _sweeper_loop(self) -> None:
+        while not self._stopping:
+            try:
+                async with AsyncSessionLocal() as db:
+                    recovered = await recover_stale_jobs(db)
+                if recovered:
+                    logger.info("Extraction sweep recovered %d job(s)", recovered)
+                    self.notify()
+            except Exception:
+                logger.exception("Extraction recovery sweep failed")
+            await asyncio.sleep(settings.extraction_job_sweep_seconds)
+
+
+_pool: ExtractionWorkerPool | None = None
+
+
+def get_worker_pool() -> ExtractionWorkerPool | None:
+    return _pool
+
+
+async def start_worker_pool(concurrency: int | None = None) -> ExtractionWorkerPool:
+    global _pool
+    _pool = ExtractionWorkerPool(concurrency)
+    _pool.start()
+    return _pool
+
+
+async def stop_worker_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.stop()
+        _pool = None
+
+
+def notify_workers() -> None:
+    """Called after enqueueing; a no-op when workers run in a separate process."""
+    if _pool is not None:
+        _pool.notify()
+
+
+async def main(concurrency: int | None = None) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    await start_worker_pool(concurrency)
+    try:
+        await stop.wait()
+    finally:
+        await stop_worker_pool()
+        shutdown_parser_pool()
+        await close_llm_client()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run MedPetRx extraction workers")
+    parser.add_argument("--concurrency", type=int, default=None, help="Number of concurrent extraction jobs")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(main(args.concurrency))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,162 @@
+"""
+Database round trips for confirming an extraction review.
+
+    cd backend
+    python -m benchmarks.confirm                  # 1, 5, 20 and 50 items per section
+    python -m benchmarks.confirm --sizes 10,100
+
+Posts reviews of growing size to POST /pets/{pet_id}/documents/{doc_id}/confirm
+against an in-memory SQLite database and counts the SQL statements and
+commits each one costs. The per-row pattern the endpoint used to follow
+(flush plus an allergy LIKE query per medication, then a separate commit
+for the audit row) is replayed for comparison. Exits 1 if the endpoint's
+statement count grows with the number of items.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (registers every table)
+from app.database import Base, get_db
+from app.dependencies import get_consented_user
+from app.main import app
+from app.models.allergy import Allergy, AllergyType
+from app.models.document import Document, ExtractionStatus
+from app.models.medication import Medication
+from app.models.pet import Pet
+from app.models.problem import Problem
+from app.models.user import User
+from app.models.vaccine import Vaccine
+from app.models.vital import Vital
+from app.routers.pets import get_pet_for_owner
+from app.services.allergy_service import check_medication_against_allergies
+from app.services.audit_service import create_audit_log
+
+
+@dataclass
+class Counter:
+    statements: int = 0
+    commits: int = 0
+
+
+def review_payload(n: int) -> dict:
+    return {
+        # Every fifth drug name collides with a known allergy
+        "medications": [
+            {"decision": "approved", "drug_name": "Amoxicillin" if i % 5 == 0 else f"Drug {i}", "strength": "50 mg"}
+            for i in range(n)
+        ],
+        "vaccines": [{"decision": "approved", "name": f"Vaccine {i}", "date_given": "2026-01-02"} for i in range(n)],
+        "allergies": [{"decision": "approved", "substance_name": f"Substance {i}"} for i in range(max(1, n // 5))],
+        "problems": [{"decision": "approved", "condition_name": f"Condition {i}"} for i in range(max(1, n // 5))],
+        "vitals": [{"decision": "approved", "weight_kg": 20.5, "recorded_date": "2026-01-02"}],
+    }
+
+
+async def legacy_confirm(db: AsyncSession, pet_id: int, doc_id: int, user_id: int, payload: dict) -> None:
+    """The previous per-row pattern, for comparison: flush and allergy query per medication, ORM adds, two commits."""
+    for item in payload["medications"]:
+        db.add(Medication(pet_id=pet_id, drug_name=item["drug_name"], strength=item["strength"],
+                          is_active=True, document_id=doc_id))
+        await db.flush()
+        await check_medication_against_allergies(db, pet_id, item["drug_name"])
+    db.add_all(Vaccine(pet_id=pet_id, name=item["name"], document_id=doc_id) for item in payload["vaccines"])
+    db.add_all(Allergy(pet_id=pet_id, allergy_type=AllergyType.DRUG, substance_name=item["substance_name"],
+                       document_id=doc_id) for item in payload["allergies"])
+    db.add_all(Problem(pet_id=pet_id, condition_name=item["condition_name"]) for item in payload["problems"])
+    db.add_all(Vital(pet_id=pet_id, weight_kg=item["weight_kg"], recorded_date=datetime.utcnow())
+               for item in payload["vitals"])
+    await db.commit()
+    await create_audit_log(db, user_id=user_id, action="CONFIRM_EXTRACTION", resource_type="Document",
+                           resource_id=doc_id)
+
+
+async def run(sizes: list[int]) -> int:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    counter = Counter()
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count_statement(*_):
+        counter.statements += 1
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def _count_commit(*_):
+        counter.commits += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessions() as db:
+        user = User(email="bench@example.com", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        pet = Pet(owner_id=user.id, name="Bench", species="Dog")
+        db.add(pet)
+        await db.flush()
+        doc = Document(pet_id=pet.id, filename="b.pdf", file_path="/dev/null",
+                       extraction_status=ExtractionStatus.COMPLETED)
+        db.add(doc)
+        db.add_all([
+            Allergy(pet_id=pet.id, allergy_type=AllergyType.DRUG, substance_name=name, severity="Severe")
+            for name in ("Amoxicillin", "Penicillin", "Carprofen")
+        ])
+        await db.commit()
+
+    async def override_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_pet_for_owner] = lambda: pet
+    app.dependency_overrides[get_consented_user] = lambda: user
+
+    print(f"{'items':>6} {'rows':>6} {'statements':>11} {'commits':>8} {'ms':>8} {'warnings':>9} "
+          f"{'legacy stmts':>13} {'legacy commits':>15}")
+    counts = []
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for n in sizes:
+                payload = review_payload(n)
+                rows = sum(len(v) for v in payload.values())
+                counter.statements = counter.commits = 0
+                start = time.perf_counter()
+                resp = await client.post(f"/pets/{pet.id}/documents/{doc.id}/confirm", json=payload)
+                elapsed = (time.perf_counter() - start) * 1000
+                resp.raise_for_status()
+                statements, commits = counter.statements, counter.commits
+                counts.append(statements)
+
+                counter.statements = counter.commits = 0
+                async with sessions() as db:
+                    await legacy_confirm(db, pet.id, doc.id, user.id, payload)
+                print(f"{n:>6} {rows:>6} {statements:>11} {commits:>8} {elapsed:>8.1f} "
+                      f"{len(resp.json()['allergy_warnings']):>9} {counter.statements:>13} {counter.commits:>15}")
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    if len(set(counts)) > 1:
+        print(f"\nstatement count grows with review size: {counts}")
+        return 1
+    print("\nok: constant statement count")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.confirm", description="confirm_extraction round trips")
+    parser.add_argument("--sizes", default="1,5,20,50", help="comma-separated items per section")
+    args = parser.parse_args()
+    return asyncio.run(run([int(s) for s in args.sizes.split(",")]))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
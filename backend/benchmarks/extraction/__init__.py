@@ -0,0 +1 @@
+"""Offline benchmark for the local PDF parser; see __main__.py for usage."""
@@ -0,0 +1,120 @@
+"""
+Extraction benchmark.
+
+    cd backend
+    python -m benchmarks.extraction                  # run, diff against golden, compare to baseline
+    python -m benchmarks.extraction --save-baseline  # record timings on this machine
+    python -m benchmarks.extraction --update-golden  # accept current parser output as correct
+
+Exits 1 on a field diff against golden JSON, a case slower than the
+baseline beyond --tolerance, or an adversarial input that scales worse
+than linearly. Runs fully offline.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.extraction.corpus import HERE, SAMPLES_DIR, sample_cases, synthetic_cases
+from benchmarks.extraction.harness import (
+    baseline_payload,
+    check_golden,
+    check_linearity,
+    check_text_cases,
+    run_case,
+    speed_regressions,
+)
+
+DEFAULT_BASELINE = HERE / "baseline.json"
+# Linear code scales ~4x at 4x input; quadratic would be ~16x
+MAX_LINEARITY_RATIO = 8.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.extraction", description="PDF extraction benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the median is reported")
+    parser.add_argument("--only", help="run only cases whose name contains this substring")
+    parser.add_argument("--samples", type=Path, default=SAMPLES_DIR, help="directory of anonymized real PDFs")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write this run's timings as the baseline")
+    parser.add_argument("--update-golden", action="store_true", help="overwrite golden JSON with this run's output")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--adversarial-size", type=int, default=10_000, help="0 skips the linear-time check")
+    parser.add_argument("--keep-pdfs", type=Path, help="write generated PDFs here instead of a temp dir")
+    parser.add_argument("--json", type=Path, help="write full results as JSON")
+    args = parser.parse_args()
+
+    cases = synthetic_cases() + sample_cases(args.samples)
+    if args.only:
+        cases = [c for c in cases if args.only in c.name]
+
+    failures: list[str] = []
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.keep_pdfs or Path(tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        print(f"{'case':<26} {'pages':>5} {'KiB':>7} {'total ms':>9} {'text ms':>8} {'parse ms':>9} {'alloc MB':>8}  diffs")
+        for case in cases:
+            r = run_case(case, workdir, args.repeat)
+            check_golden(case, r, args.update_golden)
+            results.append(r)
+            text_ms = r.stages_ms.get("extract_text", 0.0)
+            diffs = str(len(r.diffs)) if r.has_golden else "no golden"
+            print(
+                f"{r.name:<26} {r.pages or '':>5} {r.size_bytes / 1024:>7.1f} {r.total_ms:>9.2f} "
+                f"{text_ms:>8.2f} {r.total_ms - text_ms:>9.2f} {r.peak_alloc_mb:>8.1f}  {diffs}"
+            )
+            for d in r.diffs:
+                failures.append(f"accuracy {r.name}: {d}")
+
+    if results:
+        slowest = max(results, key=lambda r: r.total_ms)
+        print(f"\nstages for {slowest.name} (slowest case):")
+        for name, ms in sorted(slowest.stages_ms.items(), key=lambda kv: -kv[1]):
+            print(f"  {name:<32} {ms:>9.3f} ms")
+
+    if not args.only:
+        print("\nsection edge cases (parser only):")
+        for name, diffs in check_text_cases(args.update_golden).items():
+            print(f"  {name:<34} {len(diffs)} diffs")
+            failures += [f"accuracy {name}: {d}" for d in diffs]
+
+    linearity = []
+    if args.adversarial_size:
+        print(f"\nadversarial inputs (n={args.adversarial_size}, x4):")
+        linearity = check_linearity(args.adversarial_size)
+        for lr in linearity:
+            print(f"  {lr.name:<26} {lr.small_s * 1000:>9.1f} ms -> {lr.large_s * 1000:>9.1f} ms  x{lr.ratio:.1f}")
+            if lr.ratio > MAX_LINEARITY_RATIO:
+                failures.append(f"linearity {lr.name}: x{lr.ratio:.1f} for 4x input")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(baseline_payload(results), indent=2) + "\n")
+        print(f"\nbaseline written to {args.baseline}")
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        failures += [f"speed {s}" for s in speed_regressions(results, baseline, args.tolerance, args.min_delta_ms)]
+    else:
+        print(f"\nno baseline at {args.baseline}; run with --save-baseline to record one")
+
+    if args.json:
+        args.json.write_text(json.dumps({
+            "cases": [r.__dict__ for r in results],
+            "linearity": [{**lr.__dict__, "ratio": lr.ratio} for lr in linearity],
+            "failures": failures,
+        }, indent=2, default=str))
+
+    if failures:
+        print(f"\n{len(failures)} regression(s):")
+        for f in failures:
+            print(f"  {f}")
+        return 1
+    print("\nok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Benchmark corpus: synthetic Bond Vet / VEG / generic PDFs, real samples,
+and adversarial texts for the linear-time check.
+
+Synthetic documents are generated deterministically from a seed, so their
+golden JSON stays valid until the parser (or this file) changes.
+"""
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.extraction.pdfwriter import LINES_PER_PAGE, paginate, write_pdf
+
+HERE = Path(__file__).resolve().parent
+GOLDEN_DIR = HERE / "golden"
+SAMPLES_DIR = HERE / "samples"
+
+PET_NAMES = ["Hugo", "Luna", "Max", "Bella", "Milo", "Nala", "Otis", "Pepper"]
+DATES = [("Feb 09, 2026", "February 9, 2026"), ("Nov 14, 2025", "November 14, 2025"),
+         ("Jun 02, 2025", "June 2, 2025"), ("Mar 27, 2026", "March 27, 2026")]
+DOCTORS = ["Jane Smith", "Alex Kim", "Maria Lopez", "Sam Patel"]
+FILLER_WORDS = (
+    "the patient was calm and cooperative during the exam owner reports normal appetite "
+    "and energy at home no vomiting or diarrhea was noted recheck was discussed with the "
+    "owner who agreed with the plan gait was normal on the walk down the hall coat is "
+    "glossy and hydration appears adequate client education was provided regarding diet"
+).split()
+
+
+def _filler(rng: random.Random, n: int) -> list[str]:
+    """Narrative lines with no headings, units or species words, so they only add bulk."""
+    lines = []
+    for _ in range(n):
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(8, 14))]
+        lines.append(" ".join(words).capitalize() + ".")
+    return lines
+
+
+def bond_vet_lines(rng: random.Random) -> list[str]:
+    short, _ = rng.choice(DATES)
+    name, doctor = rng.choice(PET_NAMES), rng.choice(DOCTORS)
+    weight = round(rng.uniform(8, 40), 1)
+    return [
+        "Bond Vet - Somerville",
+        "bondvet.com | (617) 555-0100",
+        "Visit Summary",
+        f"Date Generated: {short}",
+        f"Patient: {name}",
+        "Canine | Australian Cattle Dog Mix | Male Neutered",
+        f"Provider: Dr. {doctor} (DVM)",
+        "VITALS",
+        f"Weight {weight} kg",
+        f"Temperature {round(rng.uniform(100.5, 102.5), 1)} F",
+        f"Heart Rate {rng.randint(70, 140)} bpm",
+        f"Respiratory Rate {rng.randint(16, 40)} bpm",
+        "BCS 5/9",
+        "Mucous Membranes Pink",
+        "CRT <2 sec",
+        "Attitude BAR",
+        "Parasite Preventive Medications",
+        "Simparica Trio (24.1-48 kg)",
+        "Heartgard Plus (51-100 lbs)",
+        "Medications/Supplements",
+        "Medications: Yes",
+        "Cosequin Joint Health Supplement",
+        "Hip and joint: daily chew with breakfast",
+        "Known Allergies",
+        "Penicillin",
+        "Current Diet",
+        "Purina Pro Plan",
+        "PROBLEMS LIST",
+        "Lameness - May 24, 2025",
+        "Otitis externa",
+        "ORDERS",
+        "Physical exam",
+        "IMMUNIZATIONS",
+        "TYPE DETAILS DATE",
+        f"Rabies Vaccine 3 Year Manufacturer: Merck {short}",
+        f"Provider: Dr. {doctor}",
+        f"Leptospirosis Vaccine Manufacturer: Zoetis {short}",
+        f"Influenza Vaccine Manufacturer: Merck {short}",
+        "H3N2/H3N8 Bivalent",
+        "PLAN",
+        "Recheck in 2 weeks",
+    ]
+
+
+def veg_lines(rng: random.Random) -> list[str]:
+    _, long = rng.choice(DATES)
+    name, doctor = rng.choice(PET_NAMES), rng.choice(DOCTORS)
+    return [
+        "VEG - Peabody",
+        "Veterinary Emergency Group | veg.com",
+        "Discharge Instructions",
+        f"Visit Date: {long}",
+        f"Patient: {name}",
+        "Feline | Domestic Shorthair",
+        f"Dr. {doctor} Peabody",
+        "PRESENTING COMPLAINTS",
+        "Vomiting",
+        "HISTORY",
+        "Vomited three times overnight.",
+        "VITALS",
+        f"Weight {round(rng.uniform(3, 7), 1)} kg",
+        f"Temperature {round(rng.uniform(100.5, 103), 1)} F",
+        f"Heart Rate {rng.randint(140, 220)} bpm",
+        f"Respiratory Rate {rng.randint(20, 40)}",
+        "PROBLEMS AND DIFFERENTIALS",
+        "Vomiting",
+        "Dehydration",
+        "Dietary indiscretion, foreign body, pancreatitis",
+        "NOTES",
+        "Patient stable.",
+        "MEDICATIONS",
+        "Proviable Forte Kit 30 mL TGH",
+        "Give 1 capsule by mouth once daily",
+        "Total Qty: 10",
+        "Ondansetron 4 mg tablet",
+        "Give 1/2 tablet by mouth every 12 hours",
+        "HOME CARE AND MONITORING",
+        "1. Bland diet (boiled chicken and rice)",
+        "2. Fortiflora probiotic",
+        "3. Ondansetron as directed",
+        "Thank you for trusting VEG",
+        "No known allergies",
+    ]
+
+
+def generic_lines(rng: random.Random) -> list[str]:
+    _, long = rng.choice(DATES)
+    return [
+        "Happy Paws Animal Hospital",
+        f"Visit Date: {long}",
+        f"Patient: {rng.choice(PET_NAMES)}",
+        "Canine | Golden Retriever",
+        f"Weight {rng.randint(40, 90)} lbs",
+        f"Heart Rate {rng.randint(70, 130)} bpm",
+        "Allergies: None",
+        "MEDICATIONS",
+        "Carprofen 75 mg tablet",
+        "Give 1 tablet by mouth twice daily with food",
+        "TREATMENT",
+        "Rest",
+    ]
+
+
+TEMPLATES: dict[str, Callable[[random.Random], list[str]]] = {
+    "bond_vet": bond_vet_lines,
+    "veg": veg_lines,
+    "generic": generic_lines,
+}
+
+
+@dataclass
+class Case:
+    name: str
+    golden_path: Path
+    build: Callable[[Path], Path]  # workdir -> pdf path
+    pages: int | None = None
+
+
+def synthetic_case(fmt: str, pages: int, collapse: bool = False, seed: int = 0) -> Case:
+    name = f"{fmt}_{pages}p" + ("_collapsed" if collapse else "")
+
+    def build(workdir: Path) -> Path:
+        rng = random.Random(f"{name}:{seed}")
+        body_lines = LINES_PER_PAGE - 1  # last line of each page is the footer
+        content = TEMPLATES[fmt](rng)
+        content += _filler(rng, max(0, pages * body_lines - len(content)))
+        chunks = paginate(content, body_lines)[:pages]
+        doc = [chunk + [f"Page {i} of {len(chunks)}"] for i, chunk in enumerate(chunks, start=1)]
+        path = workdir / f"{name}.pdf"
+        write_pdf(path, doc, collapse=collapse)
+        return path
+
+    return Case(name=name, golden_path=GOLDEN_DIR / f"{name}.json", build=build, pages=pages)
+
+
+def synthetic_cases() -> list[Case]:
+    cases = [synthetic_case(fmt, pages) for pages in (1, 5, 25) for fmt in TEMPLATES]
+    # Collapsed text layer forces the pdfplumber fallback; 60 pages exceeds MAX_PAGES
+    cases.append(synthetic_case("veg", 2, collapse=True))
+    cases.append(synthetic_case("bond_vet", 60))
+    return cases
+
+
+def sample_cases(samples_dir: Path = SAMPLES_DIR) -> list[Case]:
+    """Anonymized real PDFs; golden JSON lives next to each as <name>.golden.json."""
+    if not samples_dir.is_dir():
+        return []
+    return [
+        Case(name=f"sample:{pdf.stem}", golden_path=pdf.with_suffix(".golden.json"), build=lambda _w, p=pdf: p)
+        for pdf in sorted(samples_dir.glob("*.pdf"))
+    ]
+
+
+# Section edge cases parsed as text (golden in golden/text/<name>.json):
+# a last section with no terminator, which the baseline regexes dropped and
+# which must not run on into the unlabeled lines after it, and blank lines
+# between a heading and its body, which those regexes skipped.
+_GENERIC_HEADER = "Happy Paws Animal Hospital\nVisit Date: June 2, 2025\nPatient: Luna\nCanine | Golden Retriever\n"
+TEXT_CASES: dict[str, str] = {
+    "trailing_medications": _GENERIC_HEADER + "MEDICATIONS\nGabapentin 100 mg capsule every 8 hours\n"
+                                              "Client Name: Jo\nWeight 20 kg",
+    "trailing_medications_paragraph": _GENERIC_HEADER + "MEDICATIONS\nGabapentin 100 mg capsule\n"
+                                                        "Give 1 capsule by mouth every 8 hours\n\nRest\n"
+                                                        "Recheck in 2 weeks\n",
+    "trailing_medications_heading": _GENERIC_HEADER + "MEDICATIONS\nCarprofen 75 mg tablet\nVITALS\n"
+                                                      "Weight 20 kg\nRest\nRecheck in 2 weeks",
+    "trailing_supplements": "Bond Vet - Somerville\nbondvet.com\nPatient: Hugo\nMedications/Supplements\n"
+                            "Medications: Yes\nCosequin Joint Health Supplement\nRest\nRecheck in 2 weeks",
+    "trailing_problems": "Bond Vet - Somerville\nbondvet.com\nPatient: Hugo\nPROBLEMS LIST\nOtitis externa\n"
+                         "Lameness\n\nOwner declined radiographs\nRecheck in 2 weeks",
+    "trailing_immunizations": "Bond Vet - Somerville\nbondvet.com\nPatient: Hugo\nIMMUNIZATIONS\n"
+                              "Rabies Vaccine 3 Year Manufacturer: Merck Feb 09, 2026\nRest\nRecheck in 2 weeks",
+    "trailing_home_care": "VEG - Peabody\nveg.com\nPatient: Milo\nHOME CARE AND MONITORING\n"
+                          "1. Bland diet\n2. Fortiflora probiotic\nRest\n3. Recheck in 2 weeks",
+    "trailing_differentials": "VEG - Peabody\nveg.com\nPatient: Milo\nPROBLEMS AND DIFFERENTIALS\nVomiting\n"
+                              "Rest\nRecheck in 2 weeks",
+    "trailing_allergies": _GENERIC_HEADER + "Known Allergies: Penicillin\nRest\nRecheck in 2 weeks",
+    "blank_after_immunizations": "Bond Vet - Somerville\nbondvet.com\nPatient: Hugo\nIMMUNIZATIONS\n\n"
+                                 "TYPE DETAILS DATE\nRabies Vaccine 3 Year Manufacturer: Merck Feb 09, 2026\n"
+                                 "PLAN\nRecheck in 2 weeks",
+    "blank_after_problems": "Bond Vet - Somerville\nbondvet.com\nPatient: Hugo\nPROBLEMS LIST\n\n"
+                            "Otitis externa\nORDERS\nPhysical exam",
+    "blank_after_parasite": "Bond Vet - Somerville\nbondvet.com\nPatient: Hugo\nParasite Preventive Medications\n"
+                            "\nSimparica Trio (24.1-48 kg)\nMedications/Supplements\nMedications: No",
+    "blank_after_medications": "VEG - Peabody\nveg.com\nPatient: Milo\nMEDICATIONS\n\nOndansetron 4 mg tablet\n"
+                               "Give 1/2 tablet by mouth every 12 hours\nHOME CARE\nRest",
+    "blank_after_differentials": "VEG - Peabody\nveg.com\nPatient: Milo\nPROBLEMS AND DIFFERENTIALS\n\n"
+                                "Vomiting\nNOTES\nPatient stable.",
+    "blank_after_complaint": "VEG - Peabody\nveg.com\nPatient: Milo\nPRESENTING COMPLAINTS\n\nVomiting\n"
+                             "HISTORY\nVomited overnight.",
+}
+
+# Adversarial texts for the parser alone: size n -> text. Each targets a
+# shape that made an earlier regex backtrack (unterminated sections,
+# repeated headings or labels, long runs of word characters).
+ADVERSARIAL: dict[str, Callable[[int], str]] = {
+    "unterminated_home_care": lambda n: "HOME CARE\n" + "MONITORING " * n,
+    "unterminated_complaint": lambda n: "PRESENTING COMPLAINTS" + " a" * n,
+    "repeated_headings": lambda n: "IMMUNIZATIONS\nPROBLEMS LIST\n" * (n // 2),
+    "allergy_labels": lambda n: "Allergies " * n,
+    "word_run": lambda n: "word " * n,
+    "provider_run": lambda n: "Dr. Smith " + "a " * n,
+    "date_like": lambda n: "May 1, " * n,
+}
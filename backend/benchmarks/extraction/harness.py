@@ -0,0 +1,172 @@
+"""Run extract_visit_data over the corpus and compare against golden output and a timing baseline."""
+
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.services.parsers import detect_format
+from app.services.pdf_parser import extract_visit_data
+from benchmarks.extraction.corpus import ADVERSARIAL, GOLDEN_DIR, TEXT_CASES, Case
+
+
+@dataclass
+class CaseResult:
+    name: str
+    pages: int | None
+    size_bytes: int
+    total_ms: float
+    stages_ms: dict[str, float]
+    peak_alloc_mb: float
+    output: dict
+    diffs: list[str] = field(default_factory=list)
+    has_golden: bool = False
+
+
+def peak_alloc_mb(pdf: Path) -> float:
+    """
+    Peak memory allocated through Python during one extraction of `pdf`. A
+    separate, untimed run: tracemalloc slows the parse down several times,
+    and the process's peak RSS only ever grows, so it can't be split by case.
+    """
+    tracemalloc.start()
+    try:
+        extract_visit_data(str(pdf))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def _normalize(data: dict) -> dict:
+    """Round-trip through JSON so comparisons see what would be stored."""
+    return json.loads(json.dumps(data))
+
+
+def run_case(case: Case, workdir: Path, repeat: int) -> CaseResult:
+    pdf = case.build(workdir)
+    totals, stage_runs, output = [], [], None
+    for _ in range(repeat):
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+        output = extract_visit_data(str(pdf), timings=timings)
+        totals.append(time.perf_counter() - start)
+        stage_runs.append(timings)
+    stages = {
+        name: statistics.median(run.get(name, 0.0) for run in stage_runs) * 1000
+        for name in stage_runs[0]
+    }
+    return CaseResult(
+        name=case.name,
+        pages=case.pages,
+        size_bytes=pdf.stat().st_size,
+        total_ms=statistics.median(totals) * 1000,
+        stages_ms=stages,
+        peak_alloc_mb=peak_alloc_mb(pdf),
+        output=_normalize(output),
+    )
+
+
+def diff_fields(expected, actual, path: str = "") -> list[str]:
+    """Field-level differences, e.g. "medications[1].strength: '4 mg' != None"."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        diffs = []
+        for key in sorted(expected.keys() | actual.keys()):
+            sub = f"{path}.{key}" if path else key
+            if key not in actual:
+                diffs.append(f"{sub}: missing")
+            elif key not in expected:
+                diffs.append(f"{sub}: unexpected {actual[key]!r}")
+            else:
+                diffs.extend(diff_fields(expected[key], actual[key], sub))
+        return diffs
+    if isinstance(expected, list) and isinstance(actual, list):
+        diffs = []
+        for i in range(max(len(expected), len(actual))):
+            sub = f"{path}[{i}]"
+            if i >= len(actual):
+                diffs.append(f"{sub}: missing {expected[i]!r}")
+            elif i >= len(expected):
+                diffs.append(f"{sub}: unexpected {actual[i]!r}")
+            else:
+                diffs.extend(diff_fields(expected[i], actual[i], sub))
+        return diffs
+    return [] if expected == actual else [f"{path}: {expected!r} != {actual!r}"]
+
+
+def check_golden(case: Case, result: CaseResult, update: bool) -> None:
+    if update:
+        case.golden_path.parent.mkdir(parents=True, exist_ok=True)
+        case.golden_path.write_text(json.dumps(result.output, indent=2, sort_keys=True) + "\n")
+    if case.golden_path.exists():
+        result.has_golden = True
+        result.diffs = diff_fields(json.loads(case.golden_path.read_text()), result.output)
+
+
+def check_text_cases(update: bool) -> dict[str, list[str]]:
+    """Parse each TEXT_CASES text and diff it against golden/text/<name>.json."""
+    out = {}
+    for name, text in TEXT_CASES.items():
+        path = GOLDEN_DIR / "text" / f"{name}.json"
+        output = _normalize(detect_format(text).parse(text))
+        if update:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(output, indent=2, sort_keys=True) + "\n")
+        out[name] = diff_fields(json.loads(path.read_text()), output) if path.exists() else ["no golden"]
+    return out
+
+
+def speed_regressions(
+    results: list[CaseResult], baseline: dict, tolerance: float, min_delta_ms: float
+) -> list[str]:
+    """Cases slower than baseline by more than `tolerance` (fraction) and `min_delta_ms` absolute."""
+    out = []
+    for r in results:
+        base = baseline.get("cases", {}).get(r.name)
+        if not base:
+            continue
+        limit = base["total_ms"] * (1 + tolerance)
+        if r.total_ms > limit and r.total_ms - base["total_ms"] > min_delta_ms:
+            out.append(f"{r.name}: {r.total_ms:.1f} ms vs baseline {base['total_ms']:.1f} ms")
+    return out
+
+
+def baseline_payload(results: list[CaseResult]) -> dict:
+    return {
+        "cases": {
+            r.name: {"total_ms": round(r.total_ms, 3), "stages_ms": {k: round(v, 3) for k, v in r.stages_ms.items()}}
+            for r in results
+        }
+    }
+
+
+@dataclass
+class LinearityResult:
+    name: str
+    small_chars: int
+    large_chars: int
+    small_s: float
+    large_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.large_s / max(self.small_s, 1e-6)
+
+
+def _parse_time(text: str) -> float:
+    start = time.perf_counter()
+    detect_format(text).parse(text)
+    return time.perf_counter() - start
+
+
+def check_linearity(n: int, factor: int = 4) -> list[LinearityResult]:
+    """Parse each adversarial text at size n and factor*n; linear code scales by ~factor."""
+    results = []
+    for name, make in ADVERSARIAL.items():
+        small, large = make(n), make(n * factor)
+        # best of two to damp scheduler noise on the small run
+        small_s = min(_parse_time(small), _parse_time(small))
+        results.append(LinearityResult(name, len(small), len(large), small_s, _parse_time(large)))
+    return results
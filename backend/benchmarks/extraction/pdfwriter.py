@@ -0,0 +1,71 @@
+"""
+Minimal PDF writer for synthetic benchmark documents.
+
+Writes Letter-size pages of Helvetica text, one Tj per line, with no
+dependencies beyond the standard library. This is enough for pypdf and
+pdfplumber to recover the lines in order. With collapse=True, each page
+becomes a single run of text, which fails the fast text-layer quality
+check and forces the pdfplumber fallback.
+"""
+
+from pathlib import Path
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN = 54
+FONT_SIZE = 10
+LEADING = 12
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+
+
+def _escape(line: str) -> bytes:
+    raw = line.encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _content_stream(lines: list[str], collapse: bool) -> bytes:
+    if collapse:
+        lines = [" ".join(line.strip() for line in lines if line.strip())]
+    out = [b"BT", f"/F1 {FONT_SIZE} Tf {LEADING} TL {MARGIN} {PAGE_HEIGHT - MARGIN} Td".encode()]
+    for line in lines:
+        out.append(b"(" + _escape(line) + b") Tj T*")
+    out.append(b"ET")
+    return b"\n".join(out)
+
+
+def paginate(lines: list[str], lines_per_page: int = LINES_PER_PAGE) -> list[list[str]]:
+    return [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+
+def write_pdf(path: Path, pages: list[list[str]], collapse: bool = False) -> None:
+    """Write `pages` (each a list of text lines) to `path`."""
+    objects: list[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # Pages, filled in once the kids are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for lines in pages:
+        stream = _content_stream(lines, collapse)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, content_ref)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    buf = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(buf))
+        buf += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref_at = len(buf)
+    buf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        buf += b"%010d 00000 n \n" % offset
+    buf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+    path.write_bytes(bytes(buf))
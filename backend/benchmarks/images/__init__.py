@@ -0,0 +1 @@
+"""Image preprocessing benchmark; see __main__.py for usage."""
@@ -0,0 +1,152 @@
+"""
+Image preprocessing benchmark: payload size, time and fidelity.
+
+    cd backend
+    python -m benchmarks.images                    # synthetic phone photos
+    python -m benchmarks.images --images ~/scans   # plus real JPEG/PNG samples
+
+For each image it reports:
+- original and processed size, including the base64 payload;
+- preprocessing time;
+- estimated upload time at --uplink-mbps;
+- estimated image tokens.
+
+Fidelity is the PSNR of the processed image against what Claude would
+see from the original anyway: the original auto-rotated, grayscaled and
+downscaled to the same long edge. Anything above ~30 dB is visually
+lossless for printed text. Exits 1 if any image falls below --min-psnr,
+which is the offline stand-in for an accuracy regression. The extraction
+itself is never called, so this runs without network access.
+"""
+
+import argparse
+import base64
+import io
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageDraw, ImageFilter, ImageOps, ImageStat
+
+from app.config import settings
+from app.services.extraction_service import IMAGE_PIXELS_PER_TOKEN
+from app.services.image_preprocess import preprocess_image
+from benchmarks.extraction.corpus import TEMPLATES
+
+EXIF_ORIENTATION = 0x0112
+CLAUDE_MAX_LONG_EDGE = 1568
+
+
+def synthetic_photo(fmt: str, size: tuple[int, int], seed: int, orientation: int) -> bytes:
+    """A visit summary 'photographed' at phone resolution: off-white paper, shading, noise, EXIF rotation."""
+    rng = random.Random(seed)
+    w, h = size
+    page = Image.new("RGB", (w, h), (236, 230, 214))
+    draw = ImageDraw.Draw(page)
+    font_size = max(h // 70, 12)
+    try:
+        from PIL import ImageFont
+        font = ImageFont.load_default(size=font_size)
+    except TypeError:
+        font = None
+    y = h // 12
+    for line in TEMPLATES[fmt](rng):
+        draw.text((w // 10, y), line, fill=(25, 25, 35), font=font)
+        y += int(font_size * 1.5)
+        if y > h - h // 12:
+            break
+    # uneven lighting and sensor noise make it compress like a real photo
+    shade = Image.linear_gradient("L").resize((w, h)).filter(ImageFilter.GaussianBlur(50))
+    page = Image.composite(page, ImageChops.multiply(page, Image.merge("RGB", [shade] * 3)), Image.new("L", (w, h), 190))
+    noise = Image.effect_noise((w, h), 18).convert("RGB")
+    page = ImageChops.add(page, noise, scale=2.0, offset=-64)
+    # the camera stored it sideways and tagged the orientation
+    if orientation == 6:
+        page = page.transpose(Image.Transpose.ROTATE_90)
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = orientation
+    buf = io.BytesIO()
+    page.save(buf, "JPEG", quality=95, exif=exif)
+    return buf.getvalue()
+
+
+def psnr(a: Image.Image, b: Image.Image) -> float:
+    diff = ImageChops.difference(a, b)
+    mse = sum(v ** 2 for v in ImageStat.Stat(diff).rms) / len(diff.getbands())
+    return float("inf") if mse == 0 else 20 * math.log10(255 / math.sqrt(mse))
+
+
+def reference_view(data: bytes, long_edge: int) -> Image.Image:
+    """What the model effectively reads from the unprocessed upload, in grayscale for comparison."""
+    with Image.open(io.BytesIO(data)) as img:
+        ref = ImageOps.exif_transpose(img).convert("L")
+    ref.thumbnail((long_edge, long_edge), Image.Resampling.LANCZOS)
+    return ref
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.images", description="Image preprocessing benchmark")
+    parser.add_argument("--images", type=Path, help="directory of real JPEG/PNG samples to include")
+    parser.add_argument("--max-long-edge", type=int, default=settings.image_max_long_edge)
+    parser.add_argument("--quality", type=int, default=settings.image_jpeg_quality)
+    parser.add_argument("--color", action="store_true", help="keep color instead of grayscale")
+    parser.add_argument("--uplink-mbps", type=float, default=20.0)
+    parser.add_argument("--min-psnr", type=float, default=30.0)
+    args = parser.parse_args()
+
+    samples: list[tuple[str, bytes]] = [
+        ("bond_vet_12mp_rotated", synthetic_photo("bond_vet", (3024, 4032), 1, orientation=6)),
+        ("veg_12mp", synthetic_photo("veg", (3024, 4032), 2, orientation=1)),
+        ("generic_8mp_rotated", synthetic_photo("generic", (2448, 3264), 3, orientation=6)),
+        ("generic_small", synthetic_photo("generic", (900, 1200), 4, orientation=1)),
+    ]
+    if args.images:
+        for path in sorted(args.images.iterdir()):
+            if path.suffix.lower() in (".jpg", ".jpeg", ".png"):
+                samples.append((path.name, path.read_bytes()))
+
+    def upload_s(n: int) -> float:
+        return n * 8 / (args.uplink_mbps * 1_000_000)
+
+    print(f"{'image':<24} {'orig KiB':>9} {'b64 KiB':>8} {'new KiB':>8} {'saved':>6} "
+          f"{'prep ms':>8} {'upload s':>15} {'tokens':>7} {'PSNR dB':>8}")
+    failures = []
+    total_in = total_out = 0
+    for name, data in samples:
+        start = time.perf_counter()
+        prepared = preprocess_image(data, args.max_long_edge, args.quality, grayscale=not args.color)
+        prep_ms = (time.perf_counter() - start) * 1000
+        b64_in = len(base64.b64encode(data))
+        b64_out = len(base64.b64encode(prepared.data))
+        total_in, total_out = total_in + b64_in, total_out + b64_out
+
+        ref = reference_view(data, min(args.max_long_edge, CLAUDE_MAX_LONG_EDGE))
+        with Image.open(io.BytesIO(prepared.data)) as img:
+            got = ImageOps.exif_transpose(img).convert("L")
+        got.thumbnail(ref.size, Image.Resampling.LANCZOS)
+        score = psnr(ref, got.resize(ref.size)) if got.size != ref.size else psnr(ref, got)
+        if score < args.min_psnr:
+            failures.append(f"{name}: PSNR {score:.1f} dB < {args.min_psnr}")
+
+        tokens = min(got.width, CLAUDE_MAX_LONG_EDGE) * min(got.height, CLAUDE_MAX_LONG_EDGE) // IMAGE_PIXELS_PER_TOKEN
+        print(
+            f"{name:<24} {len(data) / 1024:>9.0f} {b64_in / 1024:>8.0f} {b64_out / 1024:>8.0f} "
+            f"{1 - b64_out / b64_in:>6.0%} {prep_ms:>8.0f} {upload_s(b64_in):>7.2f}->{upload_s(b64_out):>6.2f} "
+            f"{tokens:>7} {score:>8.1f}"
+        )
+
+    print(f"\nbase64 payload: {total_in / 1024 / 1024:.1f} MiB -> {total_out / 1024 / 1024:.1f} MiB "
+          f"({1 - total_out / total_in:.0%} saved)")
+    if failures:
+        print("\nfidelity regressions:")
+        for f in failures:
+            print(f"  {f}")
+        return 1
+    print("ok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
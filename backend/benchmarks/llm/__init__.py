@@ -0,0 +1 @@
+"""Claude client benchmark and local mock Anthropic server; see __main__.py for usage."""
@@ -0,0 +1,116 @@
+"""
+Claude fallback throughput benchmark against a local mock server.
+
+    cd backend
+    python -m benchmarks.llm --requests 200 --concurrency 20 --latency 0.1
+    python -m benchmarks.llm --rate-limit-rate 0.1 --overload-rate 0.05
+    python -m benchmarks.llm --rpm 120 --requests 60   # check the limiter holds
+
+Compares the old pattern (a new AsyncAnthropic per request, prompt in the
+user turn) with the shared, rate-limited client used by
+extraction_service. Never talks to the real API: the key and base URL
+are overridden to point at the mock.
+"""
+
+import argparse
+import asyncio
+import base64
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import anthropic
+
+from app.config import settings
+from app.services import metrics
+from app.services.extraction_service import CLAUDE_MODEL, EXTRACTION_PROMPT, MAX_OUTPUT_TOKENS, PDF_PAGE_TOKENS, _claude_extract
+from app.services.llm_client import close_llm_client
+from benchmarks.extraction.pdfwriter import write_pdf
+from benchmarks.llm.mock_server import mock_anthropic
+
+
+def _sample_block() -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sample.pdf"
+        write_pdf(path, [["Happy Paws Animal Hospital", "MEDICATIONS", "Carprofen 75 mg tablet"]])
+        data = base64.standard_b64encode(path.read_bytes()).decode()
+    return {"type": "document", "source": {"type": "base64", "media_type": "application/pdf", "data": data}}
+
+
+async def _per_request_call(block: dict) -> None:
+    # What run_extraction did before: fresh client and connection per document
+    client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key, base_url=settings.anthropic_base_url)
+    try:
+        await client.messages.create(
+            model=CLAUDE_MODEL,
+            max_tokens=MAX_OUTPUT_TOKENS,
+            messages=[{"role": "user", "content": [block, {"type": "text", "text": EXTRACTION_PROMPT}]}],
+        )
+    finally:
+        await client.close()
+
+
+async def _run(mode: str, requests: int, concurrency: int, block: dict) -> tuple[float, list[float], int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def one() -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if mode == "per-request":
+                    await _per_request_call(block)
+                else:
+                    await _claude_extract(block, PDF_PAGE_TOKENS)
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    if mode == "shared":
+        await close_llm_client()
+    return elapsed, latencies, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.llm", description="Claude client throughput vs a mock server")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.1, help="mock server latency per request (s)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--overload-rate", type=float, default=0.0, help="fraction of requests answered 529")
+    parser.add_argument("--rpm", type=int, default=0, help="LLM_REQUESTS_PER_MINUTE for the shared client (0 = off)")
+    parser.add_argument("--tpm", type=int, default=0, help="LLM_TOKENS_PER_MINUTE for the shared client (0 = off)")
+    parser.add_argument("--modes", default="per-request,shared")
+    args = parser.parse_args()
+
+    settings.anthropic_api_key = "sk-ant-mock"
+    settings.llm_requests_per_minute = args.rpm
+    settings.llm_tokens_per_minute = args.tpm
+    settings.llm_retry_base_seconds = 0.05
+    block = _sample_block()
+
+    print(f"{'mode':<12} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'conns':>6} {'429':>5} {'529':>5} {'failed':>6} {'cache hits':>10}")
+    for mode in args.modes.split(","):
+        with mock_anthropic(latency=args.latency, rate_limit_rate=args.rate_limit_rate,
+                            overload_rate=args.overload_rate) as mock:
+            settings.anthropic_base_url = mock.base_url
+            elapsed, latencies, failures = asyncio.run(_run(mode, args.requests, args.concurrency, block))
+            stats = mock.stats
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(
+            f"{mode:<12} {args.requests / elapsed:>8.1f} {statistics.median(latencies) * 1000:>8.1f} "
+            f"{p95 * 1000:>8.1f} {len(stats.connections):>6} {stats.statuses[429]:>5} {stats.statuses[529]:>5} "
+            f"{failures:>6} {stats.cache_reads:>10}"
+        )
+    print("\ncounters:", {k: v for k, v in metrics.snapshot().items() if k.startswith("llm_")})
+
+
+if __name__ == "__main__":
+    main()
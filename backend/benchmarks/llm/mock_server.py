@@ -0,0 +1,163 @@
+"""
+Local stand-in for the Anthropic Messages API, for offline benchmarks.
+
+    with mock_anthropic(latency=0.1, rate_limit_rate=0.05) as mock:
+        settings.anthropic_base_url = mock.base_url
+        ...
+    print(mock.stats)
+
+Serves POST /v1/messages on 127.0.0.1 from a background thread. Each
+request sleeps `latency` seconds, then returns a canned extraction. It
+answers 429 (with retry-after) or 529 at the configured rates. Like the
+real API, a cache_control breakpoint on the system prompt only caches a
+prefix of at least MIN_CACHEABLE_TOKENS; usage reports cache reads once
+the same prefix has been seen before. stats counts requests, statuses and
+distinct client connections, which shows whether keep-alive is working.
+"""
+
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+CANNED_EXTRACTION = {
+    "medications": [{"drug_name": "Carprofen", "strength": "75 mg", "directions": "Give 1 tablet twice daily",
+                     "indication": None, "start_date": None, "stop_date": None, "prescriber": None,
+                     "pharmacy": None, "confidence": 0.9}],
+    "vaccines": [],
+    "allergies": [],
+    "problems": [],
+    "vitals": [],
+    "pet_info": {"name": None, "species": "Dog", "breed": None, "weight": None, "confidence": 0.8},
+}
+
+
+@dataclass
+class MockStats:
+    requests: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    connections: set = field(default_factory=set)
+    cache_reads: int = 0
+
+
+# Sonnet's minimum cacheable prompt length; shorter prefixes are processed uncached
+MIN_CACHEABLE_TOKENS = 1024
+
+
+def _cached_prefix(body: dict) -> tuple[str, int]:
+    """(text, approximate tokens) of the system prompt up to its last cache_control block."""
+    system = body.get("system")
+    if not isinstance(system, list):
+        return "", 0
+    texts, prefix = [], ""
+    for block in system:
+        texts.append(block.get("text", ""))
+        if block.get("cache_control"):
+            prefix = "".join(texts)
+    tokens = len(prefix) // 4
+    if tokens < MIN_CACHEABLE_TOKENS:
+        return "", 0
+    return prefix, tokens
+
+
+def build_app(stats: MockStats, latency: float, rate_limit_rate: float, overload_rate: float, seed: int) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    cached = set()
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        with lock:
+            stats.requests += 1
+            stats.connections.add((request.client.host, request.client.port))
+            roll = rng.random()
+        await asyncio.sleep(latency)
+
+        if roll < rate_limit_rate:
+            stats.statuses[429] += 1
+            return JSONResponse(
+                {"type": "error", "error": {"type": "rate_limit_error", "message": "mock rate limit"}},
+                status_code=429, headers={"retry-after": "0.05"},
+            )
+        if roll < rate_limit_rate + overload_rate:
+            stats.statuses[529] += 1
+            return JSONResponse(
+                {"type": "error", "error": {"type": "overloaded_error", "message": "mock overloaded"}},
+                status_code=529,
+            )
+
+        prefix, prefix_tokens = _cached_prefix(body)
+        with lock:
+            hit = bool(prefix) and prefix in cached
+            if prefix:
+                cached.add(prefix)
+            if hit:
+                stats.cache_reads += 1
+        stats.statuses[200] += 1
+        text = json.dumps(CANNED_EXTRACTION)
+        return {
+            "id": f"msg_mock_{stats.requests}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "mock"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": 1500,
+                "output_tokens": len(text) // 4,
+                "cache_creation_input_tokens": 0 if hit else prefix_tokens,
+                "cache_read_input_tokens": prefix_tokens if hit else 0,
+            },
+        }
+
+    return app
+
+
+class MockAnthropic:
+    def __init__(self, latency: float = 0.1, rate_limit_rate: float = 0.0, overload_rate: float = 0.0, seed: int = 0):
+        self.stats = MockStats()
+        app = build_app(self.stats, latency, rate_limit_rate, overload_rate, seed)
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        self.port = sock.getsockname()[1]
+        sock.close()
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> None:
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("mock Anthropic server did not start")
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+@contextmanager
+def mock_anthropic(**kwargs):
+    mock = MockAnthropic(**kwargs)
+    mock.start()
+    try:
+        yield mock
+    finally:
+        mock.stop()
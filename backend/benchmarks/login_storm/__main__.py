@@ -0,0 +1,149 @@
+"""
+Latency of unrelated requests during a login storm.
+
+    cd backend
+    python -m benchmarks.login_storm                      # 16 concurrent logins, 5 s per phase
+    python -m benchmarks.login_storm --concurrency 64 --seconds 10
+
+Runs the app in-process against an in-memory SQLite database and probes
+GET /health and GET /pets every --interval-ms, in three phases:
+
+- idle: no other traffic;
+- pool: --concurrency clients log in back to back, with bcrypt on the
+  auth_service thread pool (how the API runs);
+- inline: the same storm with bcrypt called directly in the handler, as
+  login used to, for comparison.
+
+Reports probe p50/p99/max latency and logins completed per phase. Exits 1
+if the pool phase's probe p99 exceeds the idle p99 by more than
+--max-p99-increase-ms. The login rate limiter is removed for the run, and
+only correct passwords are used: a failed login writes its audit entry
+through the configured DATABASE_URL.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (registers every table)
+import app.routers.auth as auth_router
+from app.database import Base, get_db
+from app.main import app
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.models.user import User
+from app.services import metrics
+from app.services.auth_service import hash_password, verify_password, verify_password_async
+
+EMAIL, PASSWORD = "storm@example.com", "storm-password-1"
+
+
+async def inline_verify(plain: str, hashed: str) -> bool:
+    """The previous behaviour: bcrypt on the event loop."""
+    return verify_password(plain, hashed)
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+async def phase(client: AsyncClient, headers: dict, storm: int, seconds: float, interval: float) -> dict:
+    deadline = time.perf_counter() + seconds
+    logins = rejected = 0
+
+    async def login_loop():
+        nonlocal logins, rejected
+        while time.perf_counter() < deadline:
+            resp = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            if resp.status_code == 503:
+                rejected += 1
+                await asyncio.sleep(float(resp.headers.get("Retry-After", 1)))
+                continue
+            resp.raise_for_status()
+            logins += 1
+
+    latencies: dict[str, list[float]] = {"/health": [], "/pets": []}
+
+    async def probe_loop():
+        while time.perf_counter() < deadline:
+            for path, samples in latencies.items():
+                start = time.perf_counter()
+                resp = await client.get(path, headers=headers)
+                samples.append((time.perf_counter() - start) * 1000)
+                resp.raise_for_status()
+            await asyncio.sleep(interval)
+
+    await asyncio.gather(probe_loop(), *(login_loop() for _ in range(storm)))
+    every = latencies["/health"] + latencies["/pets"]
+    return {
+        "logins": logins,
+        "rejected": rejected,
+        "probes": len(every),
+        "p50": percentile(every, 0.5),
+        "p99": percentile(every, 0.99),
+        "max": max(every, default=0.0),
+    }
+
+
+async def run(concurrency: int, seconds: float, interval_ms: float, max_increase_ms: float) -> int:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessions() as db:
+        db.add(User(email=EMAIL, hashed_password=hash_password(PASSWORD), consent_accepted=True))
+        await db.commit()
+
+    async def override_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_db
+    # The storm comes from one client; login throttling would turn it into 429s before bcrypt
+    app.user_middleware = [m for m in app.user_middleware if m.cls is not RateLimitMiddleware]
+    results = {}
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=120) as client:
+            resp = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+            for name, storm, verify in (("idle", 0, verify_password_async), ("pool", concurrency, verify_password_async),
+                                        ("inline", concurrency, inline_verify)):
+                auth_router.verify_password_async = verify
+                results[name] = await phase(client, headers, storm, seconds, interval_ms / 1000)
+    finally:
+        auth_router.verify_password_async = verify_password_async
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    print(f"{'phase':<8} {'logins':>7} {'503s':>5} {'probes':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, r in results.items():
+        print(f"{name:<8} {r['logins']:>7} {r['rejected']:>5} {r['probes']:>7} "
+              f"{r['p50']:>8.1f} {r['p99']:>8.1f} {r['max']:>8.1f}")
+    waited = metrics.get("password_hash.queue_wait_ms") / max(metrics.get("password_hash.calls"), 1)
+    print(f"\nbcrypt pool: {metrics.get('password_hash.calls')} calls, {waited:.0f} ms mean queue wait")
+
+    increase = results["pool"]["p99"] - results["idle"]["p99"]
+    if increase > max_increase_ms:
+        print(f"probe p99 rose {increase:.1f} ms during the storm (limit {max_increase_ms:.0f} ms)")
+        return 1
+    print(f"ok: probe p99 rose {increase:.1f} ms during the storm")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.login_storm", description="latency during a login storm")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent login clients")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each phase")
+    parser.add_argument("--interval-ms", type=float, default=20.0, help="pause between probe rounds")
+    parser.add_argument("--max-p99-increase-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    return asyncio.run(run(args.concurrency, args.seconds, args.interval_ms, args.max_p99_increase_ms))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
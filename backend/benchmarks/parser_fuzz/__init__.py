@@ -0,0 +1,18 @@
+"""
+Fuzz the local parser with adversarial visit-summary text.
+
+    cd backend
+    python -m benchmarks.parser_fuzz                       # 300 inputs, seed 0
+    python -m benchmarks.parser_fuzz --cases 2000 --seed 7 --out-dir /tmp/fuzz
+
+Each input is built from the synthetic corpus and the section headings,
+labels and date/provider shapes the regexes look for. It is then mutated
+with long unterminated runs, collapsed lines, stray punctuation, NULs and
+non-ASCII text. Every input is parsed with pdf_parser.parse_text_layer
+under the parse budget, and the per-pattern timings from parsers.guard are
+summed across the run.
+
+Exits 1 if any input raises (other than running out of budget) or takes
+longer than --max-seconds. Failing inputs are written to --out-dir so they
+can be replayed, and the slowest patterns show where to look.
+"""
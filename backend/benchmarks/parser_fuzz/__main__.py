@@ -0,0 +1,128 @@
+import argparse
+import random
+import sys
+import time
+import traceback
+from pathlib import Path
+
+from benchmarks.extraction.corpus import TEMPLATES, _filler
+from app.services.parsers import guard
+from app.services.parsers.sections import HEADINGS
+from app.services.pdf_parser import TextLayer, parse_text_layer
+
+LABELS = [
+    "Allergies: ", "Known Allergies:", "Provider: Dr. ", "Dr. ", "Patient: ", "Breed: ", "Weight ",
+    "Heart Rate ", "Respiratory Rate ", "Temperature ", "BCS ", "CRT ", "Mucous Membranes ", "Attitude ",
+    "Visit Date: ", "Date Generated: ", "Manufacturer: ", "Medications: No", "TYPE DETAILS", "Give ",
+    "Total Qty", "1. ", "MONITORING:", "Thank you", "VEG | ", "Bond Vet - ", "bondvet.com", "veg.com",
+]
+SHAPES = [
+    "May 24, 2025", "Feb 09 2026", "12/19/2025", "31.7 kg", "70 lbs", "120 bpm", "101.5 °F", "5/9",
+    "(10 mg)", "- ", "– ", " at 1", "H3N2", "<2 sec", "Peabody", "Somerville",
+]
+NOISE = [" ", "  ", "\t", "\n", "\n\n", "(", ")", ":", "-", "–", "|", ".", ",", "/", "\x00", "é", "°", "Dr."]
+
+
+def _fragment(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.25:
+        return rng.choice(list(HEADINGS)).replace("_", " ") + rng.choice(["\n", " ", ""])
+    if roll < 0.5:
+        return rng.choice(LABELS)
+    if roll < 0.7:
+        return rng.choice(SHAPES)
+    if roll < 0.85:
+        return " ".join(_filler(rng, 1))
+    return rng.choice(NOISE)
+
+
+def _mutate(text: str, rng: random.Random, size: int) -> str:
+    """Apply one or two stressors that defeat terminators and line structure."""
+    for _ in range(rng.randint(1, 2)):
+        kind = rng.randrange(6)
+        at = rng.randrange(len(text) + 1)
+        if kind == 0:  # long unterminated run of one fragment
+            text = text[:at] + _fragment(rng) * (size // 8) + text[at:]
+        elif kind == 1:  # collapsed layout: no line breaks at all
+            text = text.replace("\n", " ")
+        elif kind == 2:  # long whitespace run
+            text = text[:at] + rng.choice([" ", "\t", " \n"]) * (size // 4) + text[at:]
+        elif kind == 3:  # repeated headings with empty bodies
+            heading = rng.choice(list(HEADINGS)).replace("_", " ")
+            text = text[:at] + (heading + "\n") * (size // (len(heading) + 1)) + text[at:]
+        elif kind == 4:  # a label, then a long word run with no terminator
+            text = text[:at] + rng.choice(LABELS) + "a " * (size // 2) + text[at:]
+        else:  # sprinkle noise
+            chars = list(text)
+            for _ in range(max(len(chars) // 50, 1)):
+                chars.insert(rng.randrange(len(chars) + 1), rng.choice(NOISE))
+            text = "".join(chars)
+    return text
+
+
+def make_input(rng: random.Random, size: int) -> str:
+    if rng.random() < 0.5:
+        base = "\n".join(TEMPLATES[rng.choice(list(TEMPLATES))](rng))
+    else:
+        base = "".join(_fragment(rng) for _ in range(rng.randint(20, 200)))
+    return _mutate(base, rng, size)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.parser_fuzz", description="Parser regex fuzzer")
+    parser.add_argument("--cases", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", type=int, default=20_000, help="approximate characters added by a mutation")
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="fail any input slower than this")
+    parser.add_argument("--budget", type=float, default=None, help="parse budget in seconds (default: none)")
+    parser.add_argument("--top", type=int, default=10, help="slowest patterns to list")
+    parser.add_argument("--out-dir", type=Path, help="write failing inputs here")
+    args = parser.parse_args()
+
+    totals = guard.Budget(None, None)
+    failures: list[str] = []
+    timings: list[tuple[float, int]] = []
+    budget_hits = 0
+    for case in range(args.cases):
+        rng = random.Random(f"{args.seed}:{case}")
+        text = make_input(rng, args.size)
+        layer = TextLayer(pages=[text], page_count=1, method="fuzz")
+        start = time.perf_counter()
+        try:
+            with guard.budget(None) as state:
+                result = parse_text_layer(layer, budget_seconds=args.budget)
+            error = None
+        except Exception:
+            error = traceback.format_exc(limit=3)
+        elapsed = time.perf_counter() - start
+        timings.append((elapsed, case))
+
+        totals.merge(state)
+        if error is None and result.budget_exceeded:
+            budget_hits += 1
+
+        reason = f"raised\n{error}" if error else (f"took {elapsed:.2f}s" if elapsed > args.max_seconds else None)
+        if reason:
+            failures.append(f"case {case} ({len(text)} chars): {reason}")
+            if args.out_dir:
+                args.out_dir.mkdir(parents=True, exist_ok=True)
+                (args.out_dir / f"seed{args.seed}_case{case}.txt").write_text(text, encoding="utf-8")
+
+    timings.sort(reverse=True)
+    total_s = sum(t for t, _ in timings)
+    print(f"{args.cases} inputs in {total_s:.2f}s; slowest {timings[0][0] * 1000:.1f} ms (case {timings[0][1]}), "
+          f"median {timings[len(timings) // 2][0] * 1000:.1f} ms, {budget_hits} out of budget")
+    print(f"\n{'pattern':<62} {'calls':>8} {'total ms':>9} {'max ms':>8} {'at chars':>9}")
+    for name, s in sorted(totals.patterns.items(), key=lambda item: item[1].seconds, reverse=True)[:args.top]:
+        print(f"{name!r:<62.62} {s.calls:>8} {s.seconds * 1000:>9.1f} {s.max_seconds * 1000:>8.2f} {s.max_input:>9}")
+
+    if failures:
+        print(f"\n{len(failures)} failing inputs (seed {args.seed}):")
+        for f in failures:
+            print(f"  {f}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
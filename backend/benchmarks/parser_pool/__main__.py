@@ -0,0 +1,77 @@
+"""
+Concurrent parses while one of them times out.
+
+    cd backend
+    python -m benchmarks.parser_pool
+    python -m benchmarks.parser_pool --workers 2 --parses 8
+
+Starts an app.services.parser_pool.ParserPool and submits one parse that
+hangs past --timeout alongside --parses that each take --parse-seconds.
+The hung parse makes the pool recycle; the others, running or still
+queued, must be resubmitted and complete. Reports each parse's
+outcome and latency and the parser_pool.* counters.
+
+Exits 1 if the hung parse doesn't raise ParseTimeoutError or any other
+parse fails.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from app.services import metrics
+from app.services.parser_pool import ParserPool, ParseTimeoutError
+
+
+async def run(workers: int, parses: int, parse_seconds: float, timeout: float) -> int:
+    pool = ParserPool(workers=workers, max_tasks_per_child=parses + 1, timeout=timeout * 10)
+    # time.sleep stands in for a parse (functions in __main__ can't be unpickled by spawned workers)
+    await pool.run(time.sleep, 0)  # start the workers before timing
+
+    async def one(seconds: float, budget: float) -> tuple[str, float]:
+        start = time.perf_counter()
+        try:
+            await pool.run(time.sleep, seconds, timeout=budget)
+            outcome = "ok"
+        except ParseTimeoutError:
+            outcome = "timeout"
+        except BaseException as e:  # CancelledError included: it must not reach the caller
+            outcome = type(e).__name__
+        return outcome, (time.perf_counter() - start) * 1000
+
+    try:
+        results = await asyncio.gather(
+            one(timeout * 30, timeout),
+            *(one(parse_seconds, timeout * 10) for _ in range(parses)),
+        )
+    finally:
+        pool.shutdown()
+
+    print(f"{'parse':<8} {'outcome':<20} {'ms':>8}")
+    for i, (outcome, ms) in enumerate(results):
+        print(f"{'hung' if i == 0 else i:<8} {outcome:<20} {ms:>8.0f}")
+    counters = {k: v for k, v in metrics.snapshot().items() if k.startswith("parser_pool.")}
+    print("\n" + "  ".join(f"{k}={v}" for k, v in sorted(counters.items())))
+
+    failures = [] if results[0][0] == "timeout" else [f"hung parse: {results[0][0]}"]
+    failures += [f"parse {i}: {outcome}" for i, (outcome, _) in enumerate(results[1:], start=1) if outcome != "ok"]
+    if failures:
+        print("\n" + "\n".join(failures))
+        return 1
+    print(f"\nok: {parses} parses survived the recycle")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.parser_pool", description="parser pool recycling")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--parses", type=int, default=4, help="parses submitted alongside the hung one")
+    parser.add_argument("--parse-seconds", type=float, default=0.3)
+    parser.add_argument("--timeout", type=float, default=1.0, help="budget of the hung parse")
+    args = parser.parse_args()
+    return asyncio.run(run(args.workers, args.parses, args.parse_seconds, args.timeout))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Database round trips of the CRUD write endpoints.
+
+    cd backend
+    python -m benchmarks.write_path
+    python -m benchmarks.write_path --verbose     # print each endpoint's SQL
+
+Creates, updates and deletes one record through every router that writes
+with app.services.unit_of_work (pet records, pets, vet providers and the
+admin CRUD) against an in-memory SQLite database. Authentication is
+overridden; everything else, including the pet ownership check, runs as
+in production. For each request it counts statements, commits, and
+SELECTs issued after the first INSERT/UPDATE/DELETE (the refresh pattern
+the handlers used to follow). The audit writer isn't running here, so an
+audit entry written after the change would show up as a second commit.
+
+Exits 1 if any request commits more than once, SELECTs after its write, or
+creates or updates a record without an audit row.
+"""
+
+import argparse
+import asyncio
+import sys
+from dataclasses import dataclass, field
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (registers every table)
+from app.database import Base, get_db
+from app.dependencies import Principal, get_admin_user, get_consented_user
+from app.main import app
+from app.models.audit_log import AuditLog
+from app.models.pet import Pet
+from app.models.user import User
+
+WRITES = ("INSERT", "UPDATE", "DELETE")
+
+
+@dataclass
+class Counter:
+    statements: list[str] = field(default_factory=list)
+    commits: int = 0
+
+    def reset(self) -> None:
+        self.statements, self.commits = [], 0
+
+    def kinds(self) -> list[str]:
+        return [s.lstrip().split(None, 1)[0].upper() for s in self.statements]
+
+    def selects_after_write(self) -> int:
+        kinds = self.kinds()
+        first = next((i for i, k in enumerate(kinds) if k in WRITES), len(kinds))
+        return kinds[first:].count("SELECT")
+
+
+def endpoints(pet_id: int, owner_id: int) -> list[tuple[str, str, dict | None, dict | None]]:
+    """(name, collection path, create body, update body); update and delete go to <path>/<id>."""
+    pet = f"/pets/{pet_id}"
+    return [
+        ("medication", f"{pet}/medications", {"drug_name": "Carprofen", "strength": "75 mg"}, {"directions": "BID"}),
+        ("vaccine", f"{pet}/vaccines", {"name": "Rabies", "date_given": "2026-01-02"}, {"lot_number": "L1"}),
+        ("problem", f"{pet}/problems", {"condition_name": "Otitis"}, {"is_active": False}),
+        ("allergy", f"{pet}/allergies", {"allergy_type": "Food", "substance_name": "Chicken"}, {"severity": "Mild"}),
+        ("lab", f"{pet}/labs", {"lab_type": "cbc", "results": {"wbc": 7.1}}, {"notes": "Fasted"}),
+        ("vital", f"{pet}/vitals", {"recorded_date": "2026-01-02", "weight_kg": 20.5}, {"weight_lbs": 46.0}),
+        ("appointment", f"{pet}/appointments", {"title": "Recheck", "appointment_date": "2026-02-01"},
+         {"status": "completed"}),
+        ("note", f"{pet}/notes", {"note_date": "2026-01-02", "title": "Walk"}, {"body": "30 min"}),
+        ("vet provider", "/vet-providers", {"clinic_name": "Bench Clinic"}, {"phone": "555-0100"}),
+        ("pet", "/pets", {"name": "Second", "species": "Cat"}, {"breed": "Tabby"}),
+        ("admin user", "/admin/users",
+         {"email": "new@example.com", "password": "bench-pass-1", "first_name": "N", "last_name": "U"},
+         {"city": "Somerville"}),
+        ("admin pet", f"/admin/pets?owner_id={owner_id}", {"name": "Third", "species": "Dog"}, {"sex": "F"}),
+        ("admin medication", f"/admin/medications?pet_id={pet_id}", {"drug_name": "Gabapentin"},
+         {"strength": "100 mg"}),
+    ]
+
+
+async def run(verbose: bool) -> int:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    counter = Counter()
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count_statement(conn, cursor, statement, *_):
+        counter.statements.append(statement)
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def _count_commit(*_):
+        counter.commits += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessions() as db:
+        user = User(email="bench@example.com", hashed_password="x", is_admin=True, consent_accepted=True)
+        db.add(user)
+        await db.flush()
+        pet = Pet(owner_id=user.id, name="Bench", species="Dog", weight_log=[])
+        db.add(pet)
+        await db.commit()
+
+    async def override_db():
+        async with sessions() as db:
+            yield db
+
+    async def audit_rows() -> int:
+        async with sessions() as db:
+            return (await db.execute(select(func.count(AuditLog.id)))).scalar_one()
+
+    app.dependency_overrides[get_db] = override_db
+    principal = Principal.from_user(user)
+    app.dependency_overrides[get_consented_user] = lambda: principal
+    app.dependency_overrides[get_admin_user] = lambda: principal
+
+    print(f"{'endpoint':<26} {'status':>6} {'statements':>11} {'commits':>8} {'selects after write':>20} {'audit':>6}")
+    failures = []
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for name, path, create_body, update_body in endpoints(pet.id, user.id):
+                base, _, query = path.partition("?")
+                record_id = None
+                for method, body in (("POST", create_body), ("PUT", update_body), ("DELETE", None)):
+                    url = path if method == "POST" else f"{base}/{record_id}" + (f"?{query}" if query else "")
+                    audits_before = await audit_rows()
+                    counter.reset()
+                    resp = await client.request(method, url, json=body)
+                    statements, commits = list(counter.statements), counter.commits
+                    selects = counter.selects_after_write()
+                    audited = await audit_rows() - audits_before
+                    if resp.status_code >= 400:
+                        failures.append(f"{method} {name}: HTTP {resp.status_code} {resp.text}")
+                        break
+                    if method == "POST":
+                        created = resp.json()
+                        record_id = (created.get("medication") or created)["id"]  # medications also return warnings
+                    label = f"{method} {name}"
+                    print(f"{label:<26} {resp.status_code:>6} {len(statements):>11} {commits:>8} "
+                          f"{selects:>20} {audited:>6}")
+                    if verbose:
+                        for statement in statements:
+                            print("    " + " ".join(statement.split())[:110])
+                    if commits != 1:
+                        failures.append(f"{label}: {commits} commits")
+                    if selects:
+                        failures.append(f"{label}: {selects} SELECT(s) after the write")
+                    # Deletes of notes, vitals, appointments and vet providers have never been audited
+                    if method != "DELETE" and not audited:
+                        failures.append(f"{label}: no audit row")
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    if failures:
+        print("\n" + "\n".join(failures))
+        return 1
+    print("\nok: one commit per write, no SELECT after it")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.write_path", description="CRUD write round trips")
+    parser.add_argument("--verbose", action="store_true", help="print each request's SQL")
+    args = parser.parse_args()
+    return asyncio.run(run(args.verbose))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
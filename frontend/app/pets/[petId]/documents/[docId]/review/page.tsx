@@ -148,6 +148,16 @@ export default function ReviewPage() {
         </button>
       </div>
 
+      {doc.duplicate_of_id && (
+        <p className="text-sm text-amber-800 bg-amber-50 border border-amber-200 rounded-xl px-4 py-3 mb-3">
+          This looks like another copy of a{" "}
+          <a href={`/pets/${petId}/documents/${doc.duplicate_of_id}/review`} className="underline font-medium">
+            document you uploaded earlier
+          </a>
+          . If you already saved that one, reject the items below to avoid duplicate records.
+        </p>
+      )}
+
       <p className="text-sm text-gray-500 bg-yellow-50 border border-yellow-100 rounded-xl px-4 py-3 mb-5">
         Review each item below. <strong>Green</strong> = approved. Click <Edit3 size={12} className="inline" /> to edit values. Click <XCircle size={12} className="inline" /> to reject items you don&apos;t want saved.
       </p>
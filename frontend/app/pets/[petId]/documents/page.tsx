@@ -6,6 +6,7 @@ import { useQuery, useQueryClient } from "@tanstack/react-query";
 import toast from "react-hot-toast";
 import { Upload, FileText, CheckCircle, XCircle, Loader, Eye } from "lucide-react";
 import api from "@/lib/api";
+import { subscribeDocumentEvents } from "@/lib/documentEvents";
 import type { Document } from "@/lib/types";
 
 const statusIcon = {
@@ -26,10 +27,35 @@ export default function DocumentsPage() {
   const { data: docs, isLoading } = useQuery<Document[]>({
     queryKey: ["documents", petId],
     queryFn: () => api.get(`/pets/${petId}/documents`).then((r) => r.data),
-    refetchInterval: pollingDocId ? 3000 : false,
   });
 
-  // Stop polling when completed/failed
+  // Extraction progress is pushed over SSE instead of polling the list
+  useEffect(() => {
+    if (!petId) return;
+    const key = ["documents", petId];
+    return subscribeDocumentEvents(petId as string, (event) => {
+      if (event.type === "snapshot") {
+        const cached = qc.getQueryData<Document[]>(key);
+        const stale = event.data.some(
+          (s) => cached?.find((d) => d.id === s.document_id)?.extraction_status !== s.status
+        );
+        if (stale) qc.invalidateQueries({ queryKey: key });
+      } else if (event.type === "status") {
+        qc.setQueryData<Document[]>(key, (old) =>
+          old?.map((d) =>
+            d.id === event.data.document_id ? { ...d, extraction_status: event.data.status } : d
+          )
+        );
+      } else if (event.type === "result") {
+        const doc = event.data;
+        qc.setQueryData<Document[]>(key, (old) =>
+          old?.some((d) => d.id === doc.id) ? old.map((d) => (d.id === doc.id ? doc : d)) : [doc, ...(old ?? [])]
+        );
+      }
+    });
+  }, [petId, qc]);
+
+  // Notify once the uploaded document is completed/failed
   useEffect(() => {
     if (!pollingDocId || !docs) return;
     const doc = docs.find((d) => d.id === pollingDocId);
@@ -45,21 +71,33 @@ export default function DocumentsPage() {
   }, [docs, pollingDocId, petId, router]);
 
   const handleFileChange = async (e: React.ChangeEvent<HTMLInputElement>) => {
-    const file = e.target.files?.[0];
-    if (!file) return;
+    const files = Array.from(e.target.files ?? []);
+    if (!files.length) return;
     setUploading(true);
     try {
       const formData = new FormData();
-      formData.append("file", file);
-      const { data } = await api.post(`/pets/${petId}/documents/upload`, formData, {
-        headers: { "Content-Type": "multipart/form-data" },
-      });
+      if (files.length === 1) {
+        formData.append("file", files[0]);
+        const { data } = await api.post(`/pets/${petId}/documents/upload`, formData, {
+          headers: { "Content-Type": "multipart/form-data" },
+        });
+        setPollingDocId(data.id);
+        toast.success("Uploaded! Extracting medical data...");
+      } else {
+        // One request for the whole selection; progress arrives over SSE
+        files.forEach((file) => formData.append("files", file));
+        const { data } = await api.post(`/pets/${petId}/documents/batch`, formData, {
+          headers: { "Content-Type": "multipart/form-data" },
+        });
+        toast.success(`Uploaded ${data.documents.length} documents! Extracting medical data...`);
+        for (const rejected of data.rejected as { filename: string | null; detail: string }[]) {
+          toast.error(`${rejected.filename ?? "File"}: ${rejected.detail}`);
+        }
+      }
       qc.invalidateQueries({ queryKey: ["documents", petId] });
-      setPollingDocId(data.id);
-      toast.success("Uploaded! Extracting medical data...");
     } catch (err: unknown) {
-      const msg = (err as { response?: { data?: { detail?: string } } })?.response?.data?.detail || "Upload failed";
-      toast.error(msg);
+      const detail = (err as { response?: { data?: { detail?: string | { message: string } } } })?.response?.data?.detail;
+      toast.error((typeof detail === "string" ? detail : detail?.message) || "Upload failed");
     } finally {
       setUploading(false);
       if (fileRef.current) fileRef.current.value = "";
@@ -78,7 +116,7 @@ export default function DocumentsPage() {
           {uploading ? <Loader size={15} className="animate-spin" /> : <Upload size={15} />}
           {uploading ? "Uploading..." : "Import Visit Summary"}
         </button>
-        <input ref={fileRef} type="file" accept=".pdf,.jpg,.jpeg,.png" onChange={handleFileChange} className="hidden" />
+        <input ref={fileRef} type="file" accept=".pdf,.jpg,.jpeg,.png" multiple onChange={handleFileChange} className="hidden" />
       </div>
 
       <div className="bg-indigo-50 border border-indigo-100 rounded-xl p-4 mb-4">
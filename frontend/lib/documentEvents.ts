@@ -0,0 +1,71 @@
+import type { Document } from "./types";
+
+export type DocumentStatus = Document["extraction_status"];
+
+export type DocumentEvent =
+  | { type: "snapshot"; data: { document_id: number; status: DocumentStatus }[] }
+  | { type: "status"; data: { document_id: number; status: DocumentStatus; stage: string } }
+  | { type: "result"; data: Document };
+
+const MAX_BACKOFF_MS = 30000;
+
+/**
+ * Subscribe to a pet's document extraction events (Server-Sent Events).
+ *
+ * Uses fetch streaming rather than EventSource because EventSource can't
+ * send the Authorization header. Reconnects with exponential backoff; each
+ * reconnect begins with a fresh snapshot. Returns an unsubscribe function.
+ */
+export function subscribeDocumentEvents(
+  petId: number | string,
+  onEvent: (event: DocumentEvent) => void
+): () => void {
+  const controller = new AbortController();
+  let backoff = 1000;
+
+  const connect = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        const token = localStorage.getItem("access_token");
+        const res = await fetch(`/api/pets/${petId}/documents/events`, {
+          headers: {
+            Accept: "text/event-stream",
+            "ngrok-skip-browser-warning": "true",
+            ...(token ? { Authorization: `Bearer ${token}` } : {}),
+          },
+          signal: controller.signal,
+        });
+        if (res.status === 401 || res.status === 403 || res.status === 404) return;
+        if (!res.ok || !res.body) throw new Error(`SSE ${res.status}`);
+
+        backoff = 1000;
+        const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = "";
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          let end;
+          while ((end = buffer.indexOf("\n\n")) !== -1) {
+            const frame = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            let type = "message";
+            let data = "";
+            for (const line of frame.split("\n")) {
+              if (line.startsWith("event:")) type = line.slice(6).trim();
+              else if (line.startsWith("data:")) data += line.slice(5).trim();
+            }
+            if (data) onEvent({ type, data: JSON.parse(data) } as DocumentEvent);
+          }
+        }
+      } catch {
+        if (controller.signal.aborted) return;
+      }
+      await new Promise((resolve) => setTimeout(resolve, backoff));
+      backoff = Math.min(backoff * 2, MAX_BACKOFF_MS);
+    }
+  };
+
+  connect();
+  return () => controller.abort();
+}
@@ -103,6 +103,8 @@ export interface Document {
   upload_date: string;
   extraction_status: "pending" | "processing" | "completed" | "failed";
   extracted_data: Record<string, unknown> | null;
+  batch_id: string | null;
+  duplicate_of_id: number | null;
 }
 
 export interface EmergencyShare {